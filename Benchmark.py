@@ -0,0 +1,174 @@
+"""
+This Module:
+- Generates synthetic Bridge payloads (3d, 3dplant billboard, surface, scatter packs, multi material assets)
+- Imports every payload with every renderer against the recording command backend, no Maya needed
+- Reports the wall time, the number of Maya commands and the nodes created per asset
+- Saves the results as JSON and compares two result files so regressions show up between versions
+
+Usage:
+    python -m Megascans.Benchmark results.json [--repeat 5] [--compare previous.json]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import sys
+import time
+
+from Megascans import CommandBackend
+from Megascans.ImporterSetup import importerSetup
+
+# Renderer -> value of defaultRenderGlobals.currentRenderer
+RENDERERS = [("Redshift", "redshift"), ("Vray", "vray"), ("Arnold", "arnold"), ("OctaneRender", "octanerender")]
+
+ALL_MAPS = ["albedo", "normal", "roughness", "displacement", "metalness", "opacity", "translucency", "gloss", "bump", "ao", "specular", "cavity"]
+PLANT_MAPS = ["albedo", "normal", "roughness", "displacement", "opacity", "translucency", "gloss"]
+BILLBOARD_MAPS = ["albedo", "normal", "opacity", "translucency"]
+SURFACE_MAPS = ["albedo", "normal", "roughness", "displacement", "ao", "cavity", "specular", "gloss"]
+
+
+# Builds a Bridge export payload, the paths don't have to exist
+def syntheticPayload(assetType="3d", activeLOD="lod0", maps_=ALL_MAPS, meshes=1, scatter=False, materials=None, assetId="bnch01"):
+    meta = [{"key": "height", "value": "1.5 m"}]
+    if materials:
+        meta.append({"key": "materialids", "value": [{"material": material, "ids": [index]} for index, material in enumerate(materials)]})
+    path = "/megascans/assets/" + assetId
+    return {
+        "type": assetType,
+        "id": assetId,
+        "name": "Benchmark " + assetType,
+        "path": path,
+        "activeLOD": activeLOD,
+        "minLOD": "lod5",
+        "categories": ["scatter"] if scatter else [assetType],
+        "tags": [],
+        "meta": meta,
+        "components": [{"format": "exr" if mapType == "displacement" else "jpg", "type": mapType,
+                        "path": path + "/" + assetId + "_4K_" + mapType.capitalize() + ".jpg"} for mapType in maps_],
+        "meshList": [{"format": "fbx", "path": path + "/" + assetId + "_" + activeLOD + "_Var" + str(index + 1) + ".fbx"} for index in range(meshes)],
+        "lodList": [{"lod": lod, "format": "fbx", "path": path + "/" + assetId + "_" + lod + "_Var" + str(index + 1) + ".fbx"}
+                    for lod in ["lod" + str(level) for level in range(6)] for index in range(meshes)],
+    }
+
+
+# Scenario name -> payload
+def defaultScenarios(scatterSizes=(4, 16, 64)):
+    scenarios = [
+        ("3d", syntheticPayload("3d")),
+        ("3d_high", syntheticPayload("3d", activeLOD="high")),
+        ("3dplant", syntheticPayload("3dplant", maps_=PLANT_MAPS, meshes=3)),
+        ("3dplant_billboard", syntheticPayload("3dplant", activeLOD="lod5", maps_=BILLBOARD_MAPS)),
+        ("surface", syntheticPayload("surface", maps_=SURFACE_MAPS, meshes=0)),
+        ("multimaterial", syntheticPayload("3d", meshes=2, materials=["opaque", "glass"])),
+    ]
+    for size in scatterSizes:
+        scenarios.append(("scatter_" + str(size), syntheticPayload("3d", meshes=size, scatter=True)))
+    return scenarios
+
+
+# Imports payload once on a fresh recording backend and returns the measurements
+def measure(renderer, payload):
+    backend = CommandBackend.useRecording(renderer=renderer)
+    instance = importerSetup.getInstance()
+    instance.materialCache.clear()
+    instance.sharedNodeRegistry.clear()
+
+    start = time.time()
+    with contextlib.redirect_stdout(io.StringIO()):
+        instance.set_Asset_Data(payload)
+    elapsed = time.time() - start
+
+    nodes_ = [node_ for node_ in backend.nodes if node_ not in CommandBackend.DEFAULT_NODES]
+    nodeTypes = {}
+    for node_ in nodes_:
+        nodeTypes[backend.nodes[node_]] = nodeTypes.get(backend.nodes[node_], 0) + 1
+    calls = backend.callCounts()
+    return {
+        "time": elapsed,
+        "commands": sum(calls.values()),
+        "commandsByName": dict(calls),
+        "nodes": len(nodes_),
+        "nodesByType": nodeTypes,
+        "connections": len(backend.connections),
+    }
+
+
+# Runs every scenario with every renderer. The time is the best of repeat runs, the counts come from the last run.
+def runBenchmark(scenarios=None, renderers=RENDERERS, repeat=3):
+    scenarios = scenarios if scenarios is not None else defaultScenarios()
+    previous = CommandBackend._backend
+    results = []
+    try:
+        for scenario, payload in scenarios:
+            for renderer, rendererValue in renderers:
+                times_ = []
+                for run in range(repeat):
+                    result = measure(rendererValue, payload)
+                    times_.append(result["time"])
+                result["time"] = min(times_)
+                result["meanTime"] = sum(times_) / len(times_)
+                result["scenario"] = scenario
+                result["renderer"] = renderer
+                results.append(result)
+                print("%-20s %-13s %8.2fms %6d commands %5d nodes" % (scenario, renderer, result["time"] * 1000.0, result["commands"], result["nodes"]))
+    finally:
+        CommandBackend.setBackend(previous)
+    return results
+
+
+def saveResults(results, path):
+    data = {
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    with open(path, "w") as file_:
+        json.dump(data, file_, indent=2, sort_keys=True)
+    return path
+
+
+def loadResults(path):
+    with open(path) as file_:
+        return json.load(file_)["results"]
+
+
+# Prints the changes between two result lists, returns (scenario, renderer, field, old, new) for every change
+def compareResults(old, new, timeTolerance=0.2):
+    old = dict([((item["scenario"], item["renderer"]), item) for item in old])
+    changes = []
+    for item in new:
+        key = (item["scenario"], item["renderer"])
+        if key not in old:
+            continue
+        for field in ["commands", "nodes", "connections"]:
+            if item[field] != old[key][field]:
+                changes.append(key + (field, old[key][field], item[field]))
+        # Times are only reported when they moved by more than the tolerance, they are noisy
+        if old[key]["time"] > 0 and abs(item["time"] - old[key]["time"]) / old[key]["time"] > timeTolerance:
+            changes.append(key + ("time", old[key]["time"], item["time"]))
+
+    for scenario, renderer, field, before, after in changes:
+        print("%-20s %-13s %-12s %s -> %s" % (scenario, renderer, field, before, after))
+    return changes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks the Megascans import against the recording command backend")
+    parser.add_argument("output", help="JSON file the results are written to")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per scenario and renderer, the best time is kept")
+    parser.add_argument("--scatter", type=int, nargs="*", default=[4, 16, 64], help="mesh counts of the scatter scenarios")
+    parser.add_argument("--compare", help="previous results to compare with")
+    args = parser.parse_args(argv)
+
+    results = runBenchmark(defaultScenarios(args.scatter), repeat=args.repeat)
+    saveResults(results, args.output)
+    if args.compare:
+        compareResults(loadResults(args.compare), results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+This Module:
+- Caches what the importer asks Maya about its renderers: the loaded plugins, the available node types
+  and the current renderer of the render globals
+- Keeps the cached answers in sets so the importer can test membership without asking Maya again
+- Drops the cached answers when a plugin is loaded or unloaded, the current renderer changes or a scene is
+  opened, using Maya's message callbacks
+- Tells the other caches of the importer (see addSceneCallback) when a scene is created or opened
+"""
+
+from Megascans import CommandBackend
+from Megascans.CommandBackend import cmds as mc
+from Megascans.CommandBackend import mel as melc
+
+_cache = {}
+_callbackIds = []
+_renderJob = None
+# Functions run after File > New and File > Open
+_sceneCallbacks = []
+
+
+# Lower case names of the loaded plugins
+def plugins():
+    if "plugins" not in _cache or not _watching():
+        _cache["plugins"] = set([item.lower() for item in (mc.pluginInfo( query=True, listPlugins=True ) or [])])
+    return _cache["plugins"]
+
+
+# All the node types Maya can create
+def nodeTypes():
+    if "nodeTypes" not in _cache or not _watching():
+        _cache["nodeTypes"] = set(mc.allNodeTypes() or [])
+    return _cache["nodeTypes"]
+
+
+def hasNodeType(nodeType):
+    return nodeType in nodeTypes()
+
+
+# The current renderer of the render globals
+def currentRenderer():
+    if "renderer" not in _cache or not _watching():
+        _cache["renderer"] = melc.eval("getAttr defaultRenderGlobals.currentRenderer;")
+    return _cache["renderer"]
+
+
+def invalidate(*args):
+    _cache.clear()
+
+
+def invalidateRenderer(*args):
+    _cache.pop("renderer", None)
+
+
+# Runs function after a scene is created or opened, for caches that hold nodes of the previous scene
+def addSceneCallback(function):
+    if function not in _sceneCallbacks:
+        _sceneCallbacks.append(function)
+
+
+# The cache is only used while the callbacks that keep it up to date are installed
+def _watching():
+    if not _callbackIds:
+        installCallbacks()
+    return bool(_callbackIds)
+
+
+def installCallbacks():
+    # Without Maya (recording backend) nothing can tell the cache when to refresh, so it stays off
+    if not CommandBackend.active().isMaya:
+        return
+    try:
+        import maya.api.OpenMaya as om
+    except ImportError:
+        return
+
+    for message in [om.MSceneMessage.kAfterPluginLoad, om.MSceneMessage.kAfterPluginUnload]:
+        _callbackIds.append(om.MSceneMessage.addStringArrayCallback(message, invalidate))
+    # New scenes come with new render globals, the render globals job has to be created again
+    for message in [om.MSceneMessage.kAfterNew, om.MSceneMessage.kAfterOpen]:
+        _callbackIds.append(om.MSceneMessage.addCallback(message, _sceneChanged))
+    _watchRenderGlobals()
+
+
+def removeCallbacks():
+    global _renderJob
+    if _callbackIds:
+        import maya.api.OpenMaya as om
+        for callbackId in _callbackIds:
+            om.MMessage.removeCallback(callbackId)
+    del _callbackIds[:]
+
+    if _renderJob is not None and mc.scriptJob(exists=_renderJob):
+        mc.scriptJob(kill=_renderJob, force=True)
+    _renderJob = None
+    invalidate()
+
+
+def _sceneChanged(*args):
+    invalidateRenderer()
+    _watchRenderGlobals()
+    for function in _sceneCallbacks:
+        function()
+
+
+def _watchRenderGlobals():
+    global _renderJob
+    if _renderJob is not None and mc.scriptJob(exists=_renderJob):
+        return
+    _renderJob = mc.scriptJob(attributeChange=["defaultRenderGlobals.currentRenderer", invalidateRenderer])
@@ -0,0 +1,620 @@
+"""
+This Module:
+- Is the one place the importer gets its Maya commands from: every module uses the cmds and mel proxies
+  of this module instead of importing maya.cmds and maya.mel directly
+- Forwards the commands to the real maya.cmds/maya.mel by default (MayaBackend)
+- Can forward them to RecordingBackend instead, an in-process stand-in that models nodes, attributes,
+  connections and sets and records every command. set_Asset_Data -> initAssetImport -> the renderer setup
+  then runs without Maya, for benchmarks and for regression tests of the shader graphs.
+
+Usage without Maya:
+    from Megascans import CommandBackend
+    backend = CommandBackend.useRecording(renderer="redshift")
+    importerSetup.getInstance().set_Asset_Data(json_data)
+    backend.callCounts(), backend.nodesOfType("RedshiftMaterial")...
+"""
+
+import json
+import os
+import shlex
+import tempfile
+from collections import Counter, OrderedDict, deque
+
+_backend = None
+
+
+# Returns the active backend, the real Maya commands unless another backend was set
+def active():
+    global _backend
+    if _backend is None:
+        _backend = MayaBackend()
+    return _backend
+
+
+def setBackend(backend):
+    global _backend
+    _backend = backend
+    return backend
+
+
+def useMaya():
+    return setBackend(MayaBackend())
+
+
+def useRecording(**kwargs):
+    return setBackend(RecordingBackend(**kwargs))
+
+
+# The module implementing importGeometryData/importTextureData for the active backend
+def importer():
+    return active().importer()
+
+
+# Runs function(*args) on the main thread once it is idle, can be called from any thread
+def executeDeferred(function, *args):
+    active().executeDeferred(function, *args)
+
+
+class _CommandsProxy():
+    def __getattr__(self, name):
+        return getattr(active().cmds, name)
+
+
+class _MelProxy():
+    def __getattr__(self, name):
+        return getattr(active().mel, name)
+
+
+cmds = _CommandsProxy()
+mel = _MelProxy()
+
+
+class MayaBackend():
+    isMaya = True
+
+    def __init__(self):
+        import maya.cmds
+        import maya.mel
+        self.cmds = maya.cmds
+        self.mel = maya.mel
+
+    def importer(self):
+        from Megascans import Importer
+        return Importer
+
+    def executeDeferred(self, function, *args):
+        import maya.utils
+        maya.utils.executeDeferred(function, *args)
+
+
+#########################################################################################
+
+"""RecordingBackend is an in-process stand-in for maya.cmds and maya.mel."""
+
+# Nodes every Maya scene has, the empty scene of the recording backend starts with them
+DEFAULT_NODES = {"defaultRenderGlobals": "renderGlobals"}
+
+
+class RecordingBackend():
+    isMaya = False
+
+    def __init__(self, renderer="redshift", plugins=None, nodeTypes=None):
+        self.renderer = renderer
+        self.plugins = list(plugins) if plugins is not None else ["redshift4maya", "vrayformaya", "mtoa", "OctanePlugin", "fbxmaya"]
+        self.nodeTypes = list(nodeTypes) if nodeTypes is not None else [
+            "aiStandardSurface", "standardSurface", "octaneUniversalMaterial", "RedshiftMaterial", "VRayMtl", "file",
+            "place2dTexture", "shadingEngine", "transform", "mesh"]
+        self.cmds = _RecordingCommands(self)
+        self.mel = _RecordingMel(self)
+        # Functions queued with executeDeferred, runDeferred plays the part of Maya's idle loop
+        self.deferred = deque()
+        self.reset()
+
+    # Empties the scene and the recorded calls
+    def reset(self):
+        self.calls = []
+        self.nodes = OrderedDict()
+        self.attrs = {}
+        self.nodes.update(DEFAULT_NODES)
+        self.connections = OrderedDict()
+        self.members = OrderedDict()
+        self.parents = {}
+        # Instance transform -> the transform whose shapes it shares
+        self.instances = {}
+        self.selection = []
+        self.optionVars = {}
+        self.unit = "cm"
+        self.suppressWarnings = False
+        self.jobs = 0
+        self.undoState = True
+        self.undoChunks = 0
+        self.refreshSuspended = False
+        self.evaluationMode = "parallel"
+
+    def importer(self):
+        return RecordingImporter()
+
+    def executeDeferred(self, function, *args):
+        self.deferred.append((function, args))
+
+    # Runs the deferred functions, including the ones they queue, and returns how many ran
+    def runDeferred(self):
+        count = 0
+        while self.deferred:
+            function, args = self.deferred.popleft()
+            function(*args)
+            count += 1
+        return count
+
+    def record(self, name, args, kwargs):
+        self.calls.append((name, args, kwargs))
+
+    # Number of recorded calls by command name, MEL scripts count as one "mel.eval" call
+    def callCounts(self):
+        return Counter([call[0] for call in self.calls])
+
+    def nodesOfType(self, nodeType):
+        return [node_ for node_, type_ in self.nodes.items() if type_ == nodeType]
+
+    def uniqueName(self, name):
+        name = name.split("|")[-1]
+        if name not in self.nodes:
+            return name
+        base = name.rstrip("0123456789")
+        index = 1
+        while base + str(index) in self.nodes:
+            index += 1
+        return base + str(index)
+
+    def createNode(self, nodeType, name=None, parent=None):
+        node_ = self.uniqueName(name or nodeType + "1")
+        self.nodes[node_] = nodeType
+        if parent is not None:
+            self.parents[node_] = parent
+        if nodeType == "shadingEngine":
+            self.members[node_] = []
+        return node_
+
+    def deleteNode(self, node_):
+        self.nodes.pop(node_, None)
+        self.members.pop(node_, None)
+        for members in self.members.values():
+            if node_ in members:
+                members.remove(node_)
+        self.parents.pop(node_, None)
+        for plug in [plug for plug in self.attrs if plug.split(".")[0] == node_]:
+            del self.attrs[plug]
+        for destination, source in list(self.connections.items()):
+            if destination.split(".")[0] == node_ or source.split(".")[0] == node_:
+                del self.connections[destination]
+        for child in [child for child, parent in self.parents.items() if parent == node_]:
+            self.deleteNode(child)
+
+    def children(self, node_):
+        return [child for child, parent in self.parents.items() if parent == node_]
+
+    def shapes(self, node_):
+        if self.nodes.get(node_) != "transform":
+            return [node_]
+        return [child for child in self.children(node_) if self.nodes.get(child) != "transform"]
+
+    def exists(self, name):
+        if "." in name:
+            node_ = name.split(".")[0]
+            return node_ in self.nodes and (name in self.attrs or name in self.connections)
+        return name in self.nodes
+
+    def setAttr(self, plug, values, keyable=None, type_=None):
+        if plug.split(".")[0] not in self.nodes:
+            raise RuntimeError("No object matches name: " + plug)
+        if keyable is not None and not values:
+            self.attrs.setdefault(plug, None)
+            return
+        if plug in self.connections:
+            raise RuntimeError("setAttr: The attribute '" + plug + "' is locked or connected and cannot be modified.")
+        self.attrs[plug] = values[0] if len(values) == 1 else tuple(values)
+
+    def connectAttr(self, source, destination, force=False):
+        for plug in [source, destination]:
+            if plug.split(".")[0] not in self.nodes:
+                raise RuntimeError("No object matches name: " + plug)
+        if destination in self.connections and not force:
+            raise RuntimeError("connectAttr: '" + destination + "' already has an incoming connection from '" + self.connections[destination] + "'.")
+        self.connections[destination] = source
+
+    def assign(self, sg, objects):
+        for object_ in objects:
+            for shape in self.shapes(object_):
+                for members in self.members.values():
+                    if shape in members:
+                        members.remove(shape)
+                self.members.setdefault(sg, []).append(shape)
+
+    def parent(self, children, parent):
+        for child in children:
+            if child not in self.nodes or parent not in self.nodes:
+                raise RuntimeError("No object matches name: " + (child if child not in self.nodes else parent))
+            self.parents[child] = parent
+
+
+def _asList(value):
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return [value]
+
+
+# Implements the subset of maya.cmds the importer uses. Commands without a model are recorded and return None.
+class _RecordingCommands():
+    def __init__(self, backend):
+        self._backend = backend
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        backend = self._backend
+        handler = getattr(type(self), "_" + name, None)
+
+        def command(*args, **kwargs):
+            backend.record(name, args, kwargs)
+            if handler is not None:
+                return handler(self, *args, **kwargs)
+            return None
+        return command
+
+    def _shadingNode(self, nodeType, name=None, **kwargs):
+        return self._backend.createNode(nodeType, name)
+
+    def _createNode(self, nodeType, name=None, parent=None, **kwargs):
+        return self._backend.createNode(nodeType, name, parent)
+
+    def _sets(self, *objects, **kwargs):
+        backend = self._backend
+        if kwargs.get("e") or kwargs.get("edit"):
+            objects = _asList(objects[0]) if len(objects) == 1 else list(objects)
+            backend.assign(kwargs["forceElement"], objects or list(backend.selection))
+            return None
+        return backend.createNode("shadingEngine", kwargs.get("name", "set1"))
+
+    def _setAttr(self, plug, *values, **kwargs):
+        self._backend.setAttr(plug, values, kwargs.get("keyable", kwargs.get("k")), kwargs.get("type"))
+
+    def _getAttr(self, plug, **kwargs):
+        if plug == "defaultRenderGlobals.currentRenderer":
+            return self._backend.renderer
+        return self._backend.attrs.get(plug)
+
+    def _addAttr(self, node_, longName=None, **kwargs):
+        self._backend.attrs.setdefault(node_ + "." + longName, None)
+
+    def _attributeQuery(self, attr, node=None, exists=False, **kwargs):
+        return (node + "." + attr) in self._backend.attrs
+
+    def _connectAttr(self, source, destination, **kwargs):
+        self._backend.connectAttr(source, destination, kwargs.get("f", kwargs.get("force", False)))
+
+    def _disconnectAttr(self, source, destination, **kwargs):
+        self._backend.connections.pop(destination, None)
+
+    def _listConnections(self, plug, source=True, destination=True, plugs=False, **kwargs):
+        backend = self._backend
+        found_ = []
+        for dst, src in backend.connections.items():
+            if source and (dst == plug or dst.split(".")[0] == plug):
+                found_.append(src if plugs else src.split(".")[0])
+            if destination and (src == plug or src.split(".")[0] == plug):
+                found_.append(dst if plugs else dst.split(".")[0])
+        if "type" in kwargs:
+            found_ = [item for item in found_ if backend.nodes.get(item.split(".")[0]) == kwargs["type"]]
+        return found_
+
+    def _defaultNavigation(self, connectToExisting=True, source=None, destination=None, **kwargs):
+        if "." not in destination:
+            destination = destination + ".surfaceShader"
+        self._backend.connectAttr(source + ".outColor", destination, True)
+
+    def _delete(self, *nodes, **kwargs):
+        for node_ in nodes:
+            for item in _asList(node_):
+                self._backend.deleteNode(item)
+
+    def _objExists(self, name):
+        return self._backend.exists(name)
+
+    def _nodeType(self, node_, **kwargs):
+        return self._backend.nodes.get(node_)
+
+    def _select(self, *objects, **kwargs):
+        backend = self._backend
+        if kwargs.get("clear") or kwargs.get("cl"):
+            backend.selection = []
+            return
+        objects = _asList(objects[0]) if len(objects) == 1 else list(objects)
+        if kwargs.get("add"):
+            backend.selection += objects
+        else:
+            backend.selection = objects
+
+    def _ls(self, *objects, **kwargs):
+        backend = self._backend
+        if kwargs.get("sl") or kwargs.get("selection"):
+            objects = list(backend.selection)
+        else:
+            objects = _asList(objects[0]) if len(objects) == 1 else list(objects)
+
+        found_ = []
+        for object_ in objects:
+            if object_.startswith("*."):
+                found_ += [plug for plug in backend.attrs if plug.endswith(object_[1:]) and plug.split(".")[0] in backend.nodes]
+            elif kwargs.get("dag") and (kwargs.get("lf") or kwargs.get("leaf")):
+                found_ += backend.shapes(object_)
+            elif backend.exists(object_):
+                found_.append(object_)
+        if not objects and not (kwargs.get("sl") or kwargs.get("selection")):
+            found_ = list(backend.nodes.keys())
+        if "type" in kwargs:
+            types_ = _asList(kwargs["type"])
+            found_ = [node_ for node_ in found_ if backend.nodes.get(node_) in types_]
+        return found_
+
+    def _listRelatives(self, node_, children=False, shapes=False, parent=False, **kwargs):
+        backend = self._backend
+        if parent:
+            return [backend.parents[node_]] if node_ in backend.parents else None
+        if shapes:
+            return [child for child in backend.children(node_) if backend.nodes.get(child) != "transform"] or None
+        return backend.children(node_) or None
+
+    def _group(self, *objects, **kwargs):
+        group_ = self._backend.createNode("transform", kwargs.get("name", "group1"))
+        if objects and not kwargs.get("em"):
+            self._backend.parent(_asList(objects[0]) if len(objects) == 1 else list(objects), group_)
+        return group_
+
+    def _parent(self, *objects, **kwargs):
+        objects = list(objects)
+        parent = objects.pop()
+        children = _asList(objects[0]) if len(objects) == 1 else objects
+        self._backend.parent(children, parent)
+        return children
+
+    def _instance(self, node_, name=None, **kwargs):
+        instance_ = self._backend.createNode("transform", name or node_)
+        self._backend.instances[instance_] = node_
+        return [instance_]
+
+    # Exported files hold the selected nodes and their children as JSON, imported files create them again
+    def _file(self, path=None, exportSelected=False, i=False, **kwargs):
+        backend = self._backend
+        if exportSelected:
+            nodes_ = []
+            pending_ = list(backend.selection)
+            while pending_:
+                node_ = pending_.pop(0)
+                nodes_.append((node_, backend.nodes[node_], backend.parents.get(node_)))
+                pending_ += backend.children(node_)
+            with open(path, "w") as file_:
+                json.dump(nodes_, file_)
+        elif i:
+            with open(path) as file_:
+                nodes_ = json.load(file_)
+            # Like Maya, the names that clash with the scene get the renaming prefix
+            names_ = {}
+            for node_, nodeType, parent in nodes_:
+                name = node_
+                if name in backend.nodes and kwargs.get("renamingPrefix"):
+                    name = kwargs["renamingPrefix"] + "_" + name
+                names_[node_] = backend.createNode(nodeType, name, names_.get(parent))
+            return list(names_.values())
+
+    def _rename(self, node_, name):
+        backend = self._backend
+        name = backend.uniqueName(name)
+        backend.nodes = OrderedDict([(name if key == node_ else key, value) for key, value in backend.nodes.items()])
+        backend.parents = dict([(name if key == node_ else key, name if value == node_ else value) for key, value in backend.parents.items()])
+        return name
+
+    def _internalVar(self, userAppDir=False, **kwargs):
+        return os.path.join(tempfile.gettempdir(), "maya") + "/"
+
+    def _vrayCreateProxy(self, node=None, createProxyNode=False, **kwargs):
+        if createProxyNode:
+            transform_ = self._backend.createNode("transform", node)
+            self._backend.createNode("VRayMesh", transform_ + "_vraymesh")
+            self._backend.createNode("mesh", transform_ + "Shape", parent=transform_)
+
+    def _vray(self, command, node_=None, group=None, *args, **kwargs):
+        if command == "addAttributesFromGroup":
+            self._backend.attrs.setdefault(node_ + "." + group, 1)
+
+    def _pluginInfo(self, *args, **kwargs):
+        return list(self._backend.plugins)
+
+    def _allNodeTypes(self, **kwargs):
+        return list(self._backend.nodeTypes)
+
+    def _currentUnit(self, **kwargs):
+        if kwargs.get("q") or kwargs.get("query"):
+            return self._backend.unit
+        self._backend.unit = {"centimeter": "cm"}.get(kwargs.get("l"), kwargs.get("l"))
+
+    def _scriptEditorInfo(self, **kwargs):
+        if kwargs.get("q") or kwargs.get("query"):
+            return self._backend.suppressWarnings
+        self._backend.suppressWarnings = bool(kwargs.get("suppressWarnings"))
+
+    def _optionVar(self, **kwargs):
+        optionVars = self._backend.optionVars
+        if "exists" in kwargs:
+            return int(kwargs["exists"] in optionVars)
+        if "q" in kwargs:
+            return optionVars.get(kwargs["q"], 0)
+        for flag in ["iv", "sv", "fv"]:
+            if flag in kwargs:
+                name, value = kwargs[flag]
+                optionVars[name] = value
+        if "remove" in kwargs:
+            optionVars.pop(kwargs["remove"], None)
+
+    def _undoInfo(self, **kwargs):
+        backend = self._backend
+        if kwargs.get("q") or kwargs.get("query"):
+            return backend.undoState
+        if kwargs.get("openChunk"):
+            backend.undoChunks += 1
+        elif kwargs.get("closeChunk"):
+            if backend.undoChunks == 0:
+                raise RuntimeError("undoInfo: there is no open undo chunk to close")
+            backend.undoChunks -= 1
+        for flag in ["state", "stateWithoutFlush", "swf"]:
+            if flag in kwargs:
+                backend.undoState = bool(kwargs[flag])
+
+    def _refresh(self, **kwargs):
+        if "suspend" in kwargs:
+            self._backend.refreshSuspended = bool(kwargs["suspend"])
+
+    def _evaluationManager(self, **kwargs):
+        if kwargs.get("q") or kwargs.get("query"):
+            return [self._backend.evaluationMode]
+        if "mode" in kwargs:
+            self._backend.evaluationMode = kwargs["mode"]
+
+    def _scriptJob(self, **kwargs):
+        if "exists" in kwargs:
+            return True
+        if "kill" in kwargs:
+            return None
+        self._backend.jobs += 1
+        return self._backend.jobs
+
+
+# Runs the MEL statements the importer generates (setAttr, connectAttr, sets, parent, vray) against the model
+class _RecordingMel():
+    def __init__(self, backend):
+        self._backend = backend
+
+    def eval(self, script):
+        backend = self._backend
+        backend.record("mel.eval", (script,), {})
+        result = None
+        for statement in _splitStatements(script):
+            result = self.evalStatement(shlex.split(statement))
+        return result
+
+    def evalStatement(self, tokens):
+        backend = self._backend
+        command, args = tokens[0], tokens[1:]
+        flags, args = _parseFlags(args)
+
+        if command == "setAttr":
+            if "type" in flags and flags["type"] == "string":
+                values = [args[1]]
+            else:
+                values = [_parseNumber(item) for item in args[1:]]
+            backend.setAttr(args[0], values, True if flags.get("k") == "on" else None)
+        elif command == "getAttr":
+            return backend.cmds.getAttr(args[0])
+        elif command == "connectAttr":
+            backend.connectAttr(args[0], args[1], "f" in flags)
+        elif command == "sets":
+            objects = args or list(backend.selection)
+            backend.assign(flags["forceElement"], objects)
+        elif command == "parent":
+            backend.parent(args[:-1], args[-1])
+        elif command == "vray":
+            node_, group = args[1], args[2]
+            backend.attrs.setdefault(node_ + "." + group, 1)
+        else:
+            raise RuntimeError("Unsupported MEL statement: " + " ".join(tokens))
+
+
+_VALUE_FLAGS = ["type", "k", "forceElement"]
+
+
+def _parseFlags(tokens):
+    flags = {}
+    args = []
+    index = 0
+    while index < len(tokens):
+        token = tokens[index]
+        if token.startswith("-") and not _isNumber(token):
+            name = token[1:]
+            if name in _VALUE_FLAGS:
+                flags[name] = tokens[index + 1]
+                index += 1
+            else:
+                flags[name] = True
+        else:
+            args.append(token)
+        index += 1
+    return flags, args
+
+
+def _splitStatements(script):
+    statements = []
+    current = []
+    quoted = False
+    escaped = False
+    for char in script:
+        if escaped:
+            escaped = False
+        elif char == "\\" and quoted:
+            escaped = True
+        elif char == '"':
+            quoted = not quoted
+        if char == ";" and not quoted:
+            statements.append("".join(current).strip())
+            current = []
+        else:
+            current.append(char)
+    statements.append("".join(current).strip())
+    return [statement for statement in statements if statement]
+
+
+def _isNumber(token):
+    try:
+        float(token)
+        return True
+    except ValueError:
+        return False
+
+
+def _parseNumber(token):
+    value = float(token)
+    return int(value) if value.is_integer() and "." not in token else value
+
+
+#########################################################################################
+
+"""RecordingImporter stands in for the Importer module when the recording backend is active:
+   it creates a transform/mesh pair per geometry file and a file node per texture."""
+
+class RecordingImporter():
+    def importGeometryData(self):
+        from Megascans.ImporterSetup import importerSetup
+        instance = importerSetup.getInstance()
+
+        for format_, path in instance.GeometryList:
+            meshName = instance.createName(os.path.splitext(os.path.basename(path))[0])
+            transform = cmds.createNode("transform", name=meshName)
+            cmds.createNode("mesh", name=transform + "Shape", parent=transform)
+            instance.imported_geo.append(transform)
+            instance.mesh_transforms.append(transform)
+
+        if instance.isMultiMat:
+            instance.defaultShaderList = [cmds.sets(renderable=True, noSurfaceShader=True, empty=True, name=instance.Name + "_" + material + "_SG")
+                                          for material in instance.MultiMaterial]
+
+    def importTextureData(self):
+        from Megascans.ImporterSetup import importerSetup
+        instance = importerSetup.getInstance()
+
+        instance.coord_2d = cmds.shadingNode("place2dTexture", asUtility=True, name=instance.ID + "_place2dTexture")
+        instance.tex_nodes = []
+        for format_, mapType, path in instance.TexturesList:
+            file_ = cmds.shadingNode("file", asTexture=True, name=instance.ID + "_" + mapType)
+            cmds.setAttr(file_ + ".fileTextureName", path, type="string")
+            cmds.connectAttr(instance.coord_2d + ".outUV", file_ + ".uvCoord")
+            instance.tex_nodes.append((file_, mapType))
@@ -0,0 +1,138 @@
+"""
+This Module:
+- Keeps the meshes imported from the FBX/OBJ files of Bridge as Maya binary files, so later imports (in this or
+  any later session) load them instead of parsing the source files again
+- Keys every cached file on the source path, its size and modification time and the import settings
+- Keeps the cache folder under a size limit by deleting the least recently used files
+
+Every cached mesh file is a <key>.mb with a <key>.json next to it that holds the source path and the names of the
+imported transforms. The modification time of the .mb is updated on every hit, the eviction goes by it.
+"""
+
+import hashlib
+import json
+import os
+
+from Megascans.CommandBackend import cmds as mc
+from Megascans import MaterialCache
+
+# Bumped when the way the meshes are imported changes, the files cached before aren't used anymore
+CACHE_VERSION = 1
+# Prefix the file import puts in front of the names that clash with nodes of the scene
+RENAMING_PREFIX = "msGeometryCache"
+
+
+class GeometryCache():
+    def __init__(self, directory, maxSize=0):
+        self.directory = directory
+        # Size limit of the cache folder in bytes, 0 keeps all the files
+        self.maxSize = maxSize
+        self.hits = 0
+        self.misses = 0
+
+    # Cache key of a source mesh file, None if the file doesn't exist
+    def key(self, path, settings):
+        try:
+            stat_ = os.stat(path)
+        except OSError:
+            return None
+        settings_ = dict(settings, version=CACHE_VERSION)
+        data_ = "\n".join([MaterialCache.normalizePath(path), str(stat_.st_size), repr(stat_.st_mtime), json.dumps(settings_, sort_keys=True)])
+        return hashlib.md5(data_.encode("utf-8")).hexdigest()
+
+    def cachePath(self, key):
+        return os.path.join(self.directory, key + ".mb").replace("\\", "/")
+
+    # Imports the cached meshes of the source file and returns their transforms, None on a cache miss
+    def load(self, path, settings):
+        key = self.key(path, settings)
+        record = self.loadRecord(key) if key is not None else None
+        if record is None:
+            self.misses += 1
+            return None
+
+        cachePath = self.cachePath(key)
+        newNodes_ = mc.file(cachePath, i=True, type="mayaBinary", returnNewNodes=True, ignoreVersion=True, mergeNamespacesOnClash=False,
+                            renamingPrefix=RENAMING_PREFIX) or []
+        roots_ = [node_ for node_ in (mc.ls(newNodes_, type="transform") or []) if not mc.listRelatives(node_, parent=True)]
+
+        # The transforms come back in scene order, they are matched to the names they were cached with by their name
+        # without the clash prefix and renamed back to them. The ones that don't match keep their names.
+        byName_ = dict([(cachedName(node_), node_) for node_ in roots_])
+        transforms_ = []
+        for name in record["nodes"]:
+            node_ = byName_.pop(name, None)
+            if node_ is not None:
+                transforms_.append(mc.rename(node_, name) if node_.split("|")[-1] != name else node_)
+        transforms_ += [node_ for node_ in roots_ if node_ in byName_.values()]
+        os.utime(cachePath, None)
+        self.hits += 1
+        return transforms_
+
+    # Writes the transforms imported from the source file to the cache
+    def store(self, path, settings, transforms):
+        key = self.key(path, settings)
+        if key is None or not transforms:
+            return None
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+
+        cachePath = self.cachePath(key)
+        selection_ = mc.ls(sl=True)
+        try:
+            mc.select(transforms, replace=True)
+            mc.file(cachePath, force=True, exportSelected=True, type="mayaBinary", constructionHistory=False, shader=False,
+                    channels=False, constraints=False, expressions=False, preserveReferences=False)
+        finally:
+            if selection_:
+                mc.select(selection_, replace=True)
+            else:
+                mc.select(clear=True)
+        with open(os.path.join(self.directory, key + ".json"), "w") as file_:
+            json.dump({"source": path, "nodes": list(transforms)}, file_)
+
+        self.evict()
+        return cachePath
+
+    def loadRecord(self, key):
+        if not os.path.isfile(self.cachePath(key)):
+            return None
+        try:
+            with open(os.path.join(self.directory, key + ".json")) as file_:
+                return json.load(file_)
+        except (IOError, OSError, ValueError):
+            return None
+
+    # Deletes the least recently used files until the cache folder fits in maxSize, returns the deleted keys
+    def evict(self):
+        if not self.maxSize or not os.path.isdir(self.directory):
+            return []
+        entries_ = []
+        for fileName in os.listdir(self.directory):
+            if fileName.endswith(".mb"):
+                path = os.path.join(self.directory, fileName)
+                entries_.append((os.path.getmtime(path), os.path.getsize(path), fileName[:-3]))
+
+        total_ = sum([size for used, size, key in entries_])
+        deleted_ = []
+        for used, size, key in sorted(entries_):
+            if total_ <= self.maxSize:
+                break
+            for path in [self.cachePath(key), os.path.join(self.directory, key + ".json")]:
+                if os.path.isfile(path):
+                    os.remove(path)
+            total_ -= size
+            deleted_.append(key)
+        return deleted_
+
+    # Hits and misses since the cache was created
+    def report(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+
+# Name a transform of a cached file was stored with: its short name without the clash prefix of the file import
+def cachedName(node_):
+    name = node_.split("|")[-1]
+    if name.startswith(RENAMING_PREFIX + "_"):
+        return name[len(RENAMING_PREFIX) + 1:]
+    return name
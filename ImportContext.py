@@ -0,0 +1,197 @@
+"""
+This Module:
+- Holds the state of one asset import: the parsed Bridge data, the imported nodes and the material setup results
+- Is created by importerSetup for every asset, handed to the material setups and released when the import is done,
+  so the payload and its node lists don't outlive the import
+- Resolves the Bridge payload (texture and geometry lists, names, flags, missing files) without calling Maya,
+  so it can be prepared on a worker thread (see ImportPipeline)
+
+importerSetup forwards the attributes below to the context of the running import, so the code written against
+importerSetup.getInstance() (e.g. the Importer module) keeps working.
+"""
+
+import os
+
+
+class ImportContext():
+    __slots__ = (
+        # Bridge data
+        "json_data", "Type", "Path", "ID", "Name", "materialName", "activeLOD", "minLOD", "isHighPoly", "height",
+        "isScatterAsset", "isBillboard", "isMultiMat", "MultiMaterial", "All_textures_", "TexturesList",
+        "availableMaps", "GeometryList", "LodList", "dictSetup", "missingFiles",
+        # Import results
+        "imported_geo", "mesh_transforms", "tex_nodes", "tex_index", "coord_2d", "defaultShaderList",
+        "scatterParentName", "scatterKey", "scatterPrototypes", "proxyPath", "proxyNode",
+        "lodLevels", "lodGroup", "geometryCacheReport",
+        "textureInfo", "textureMemory", "floatMaps", "packedMaps", "texturePreviews",
+        "previewNodes", "skippedMaps",
+        # Material setup results
+        "shadingGroups", "materialNodes", "cachedMaterial", "materialKey", "attrBatchReport",
+        "createdSharedNodes", "reusedNodes",
+        # Options of the import
+        "bulkAssign", "profile", "attrBatchSize", "sharedNodes",
+    )
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, None)
+        self.imported_geo = []
+        self.mesh_transforms = []
+        self.tex_nodes = []
+        self.tex_index = {}
+        self.defaultShaderList = []
+        self.skippedMaps = []
+        self.previewNodes = []
+        self.shadingGroups = []
+        self.createdSharedNodes = []
+        self.reusedNodes = []
+        self.bulkAssign = True
+
+    # Builds the context of the given payload. checkFiles looks up which of its texture and geometry files are missing.
+    @classmethod
+    def fromPayload(cls, json_data, checkFiles=False):
+        context = cls()
+        context.parse(json_data)
+        if checkFiles:
+            context.checkFiles()
+        return context
+
+    # Converts the json to the structure used by the importer and the material setup functions
+    def parse(self, json_data):
+        self.json_data = json_data
+        self.TexturesList = []
+        self.Type = self.json_data["type"]
+        self.mesh_transforms = []
+        self.imported_geo = []
+        self.Path = self.json_data["path"]
+        # The extra isHighPoly variable 
+        self.isHighPoly = bool(self.json_data["activeLOD"] == "high")
+        self.activeLOD = self.json_data["activeLOD"]
+        self.minLOD = self.json_data["minLOD"]
+        self.ID = self.json_data["id"]
+        self.height = float(1.0)
+        self.isScatterAsset = self.CheckScatterAsset()
+        self.isBillboard = self.CheckIsBillboard()
+        self.isMultiMat = False
+        self.MultiMaterial = self.getMultiMat()
+        self.dictSetup = None
+        self.defaultShaderList = []
+
+        #self.materialList = []
+        
+        self.All_textures_ = ["albedo", "displacement", "cavity", "normal", "roughness", "specular", "normalbump", 
+                               "ao", "opacity", "translucency", "gloss", "metalness", "bump", "fuzz", "transmission"]
+
+        texturesListName = "components"
+        if self.isBillboard:
+            texturesListName = "components"
+
+        self.TexturesList = [(obj["format"], obj["type"], obj["path"]) for obj in self.json_data[texturesListName] if obj["type"] in self.All_textures_]
+        # The material rules are selected with all the maps the asset comes with, even the ones that aren't loaded
+        self.availableMaps = [mapType for format_, mapType, path in self.TexturesList]
+
+        self.GeometryList = [(obj["format"], obj["path"]) for obj in self.json_data["meshList"]]
+        # All the LODs Bridge exported, not only the active one
+        self.LodList = [(obj["lod"].lower(), obj["format"], obj["path"]) for obj in self.json_data.get("lodList", []) if "lod" in obj]
+
+        if "name" in self.json_data.keys():
+            self.Name = self.json_data["name"].replace(" ", "_")
+
+        else:
+            self.Name = os.path.basename(self.json_data["path"]).replace(" ", "_")
+
+            if len(self.Name.split("_")) >= 2:
+                self.Name = "_".join(self.Name.split("_")[:-1])
+
+        self.materialName = self.Name + '_' + self.ID
+
+        try:
+            if 'meta' in self.json_data.keys():
+
+                meta = self.json_data['meta']
+                height_ = [item for item in meta if item["key"].lower() == "height"]
+                if len(height_) >= 1:
+                    self.height = float( height_[0]["value"].replace('m','') )
+        except:
+            pass
+
+    # The LODs below the active one in (lod, [(format, path), ...]) tuples, from the most to the least detailed.
+    # The billboard LOD of plants is the last one.
+    def lowerLods(self):
+        lods_ = {}
+        for lod, format_, path in self.LodList:
+            if lodIndex(lod) > lodIndex(self.activeLOD):
+                lods_.setdefault(lod, []).append((format_, path))
+        return [(lod, lods_[lod]) for lod in sorted(lods_, key=lodIndex)]
+
+    # Paths of the textures and geometry files of the asset that don't exist on disk
+    def checkFiles(self):
+        paths_ = [path for format_, mapType, path in self.TexturesList] + [path for format_, path in self.GeometryList]
+        self.missingFiles = [path for path in paths_ if not os.path.isfile(path)]
+        return self.missingFiles
+
+    # Materials of a multi material asset (materialids meta), None for the other assets
+    def getMultiMat(self):
+        matId_ = [item for item in self.json_data['meta'] if item["key"].lower() == "materialids"]
+        if len(matId_) >=1:
+            self.isMultiMat = True
+            matList = []
+            for data in matId_[0]['value']:
+                matList.append(data['material'])
+            return matList
+        else:
+            return None
+
+    # Return bool after checking if the asset is type scatter
+    def CheckScatterAsset(self):
+        if(self.Type == "3d"):
+            if('scatter' in self.json_data['categories'] or 'scatter' in self.json_data['tags'] or 'cmb_asset' in self.json_data['categories'] or 'cmb_asset' in self.json_data['tags']):
+                # print("It is 3D scatter asset.")
+                return True
+        return False
+
+    # Return bool after checking if the asset is type bill board
+    def CheckIsBillboard(self):
+        # Use billboard textures if importing the Billboard LOD.
+        if(self.Type == "3dplant"):
+            if (self.activeLOD == self.minLOD):
+                # print("It is billboard LOD.")
+                return True
+        return False
+
+    # Creates name for the imported mesh
+    def createName(self, meshName):
+        shortName = meshName
+
+        try:
+            if len(meshName.split("_") ) > 2:
+                shortName = [meshName.split("_")[-2], meshName.split("_")[-1]]
+                if shortName[0].lower() == self.ID.lower():
+                    shortName.remove(shortName[0] )
+                shortName = self.Name + '_' + self.ID + "_" + "_".join( shortName )
+        except:
+            shortName = meshName
+
+        return shortName
+
+    # Builds the map type -> file nodes lookup used by the material setup functions. Map types that were
+    # imported more than once (UDIMs, per material variants) keep all their file nodes in import order.
+    def buildTextureIndex(self):
+        self.tex_index = {}
+        for node_, mapType in self.tex_nodes:
+            self.tex_index.setdefault(mapType, []).append(node_)
+        return self.tex_index
+
+    # Returns the file node imported for the given map type, the first one by default
+    def getTexNode(self, mapType, index=0):
+        return self.tex_index[mapType][index]
+
+
+# Detail rank of a LOD name, "high" comes before lod0, lod1...
+def lodIndex(lod):
+    if lod == "high":
+        return -1
+    try:
+        return int(lod.replace("lod", ""))
+    except ValueError:
+        return -1
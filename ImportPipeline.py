@@ -0,0 +1,109 @@
+"""
+This Module:
+- Prepares the payloads sent by Bridge on a worker thread: the JSON is resolved into an import plan
+  (ImportContext with the texture and geometry lists, names, flags and missing files) without touching Maya
+- Hands every plan to Maya's main thread with executeDeferred, where only the node creation is left to do
+
+The Bridge listener calls submit() from its own thread. The plans are imported in the order they were
+submitted, a payload that can't be parsed is reported and skipped.
+"""
+
+import threading
+import traceback
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+from Megascans import CommandBackend
+from Megascans.ImportContext import ImportContext
+
+
+class ImportPipeline():
+    def __init__(self, checkFiles=True):
+        self.checkFiles = checkFiles
+        self.requests = queue.Queue()
+        self.worker = None
+        self.lock = threading.Lock()
+        self.submitted = 0
+        self.prepared = 0
+        self.imported = 0
+        self.errors = []
+
+    # Queues a payload for import, can be called from any thread
+    def submit(self, json_data):
+        self.start()
+        with self.lock:
+            self.submitted += 1
+        self.requests.put(json_data)
+
+    def start(self):
+        with self.lock:
+            if self.worker is not None and self.worker.is_alive():
+                return
+            self.worker = threading.Thread(target=self.work, name="MegascansImportPlanner")
+            self.worker.daemon = True
+            self.worker.start()
+
+    # Lets the worker finish the queued payloads and stops it
+    def stop(self, timeout=None):
+        worker = self.worker
+        if worker is None:
+            return
+        self.requests.put(None)
+        worker.join(timeout)
+        self.worker = None
+
+    # Worker thread: turns the payloads into import plans and defers their import to the main thread
+    def work(self):
+        while True:
+            json_data = self.requests.get()
+            if json_data is None:
+                break
+            try:
+                context = ImportContext.fromPayload(json_data, checkFiles=self.checkFiles)
+            except Exception:
+                self.reportError(json_data, traceback.format_exc())
+                continue
+            with self.lock:
+                self.prepared += 1
+            CommandBackend.executeDeferred(self.importPlan, context)
+
+    # Main thread: creates the nodes of a prepared asset
+    def importPlan(self, context):
+        from Megascans.ImporterSetup import importerSetup
+        try:
+            importerSetup.getInstance().importPlan(context)
+        except Exception:
+            self.reportError(context.json_data, traceback.format_exc())
+            return
+        with self.lock:
+            self.imported += 1
+
+    def reportError(self, json_data, error):
+        assetId = json_data.get("id") if isinstance(json_data, dict) else None
+        with self.lock:
+            self.errors.append({"id": assetId, "error": error})
+        print("Failed to import the asset " + str(assetId) + ":")
+        print(error)
+
+    # Number of submitted payloads that haven't been imported or reported as failed yet
+    def pending(self):
+        with self.lock:
+            return self.submitted - self.imported - len(self.errors)
+
+
+_pipeline = None
+
+
+# The pipeline shared by the Bridge listener
+def getPipeline():
+    global _pipeline
+    if _pipeline is None:
+        _pipeline = ImportPipeline()
+    return _pipeline
+
+
+def submit(json_data):
+    getPipeline().submit(json_data)
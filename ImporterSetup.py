@@ -13,12 +13,31 @@ This Module:
 """
 
 
-import os, json
-import maya.cmds as mc
-import maya.mel as melc
+import os, json, time, traceback
+from Megascans.CommandBackend import cmds as mc
+from Megascans.CommandBackend import mel as melc
+
+from Megascans import Capabilities
+from Megascans import CommandBackend
+from Megascans.ImportContext import ImportContext
+from Megascans import IncrementalImport
+from Megascans import MaterialCache
+from Megascans import Profiler
+from Megascans import RenderProxy
+from Megascans import GeometryCache
+from Megascans import TextureInfo
+from Megascans import TextureConverter
+from Megascans import TexturePreview
+from Megascans import TextureBake
+from Megascans.ShaderGraph import MelBatch, SharedNodes
+from Megascans import ScatterInstancing
 
 #import Megascans.Hypershade
 
+# Context attributes that are reached through importerSetup, bulkAssign is also an importerSetup option
+_FORWARDED = frozenset([name for name in ImportContext.__slots__ if name != "bulkAssign"])
+
+
 class importerSetup():
     Instance = None
     """set_Asset_Data takes the json data we received from the thread and converts it into
@@ -32,150 +51,799 @@ class importerSetup():
 
     def __init__(self):
         importerSetup.Instance = self
+        # State of the running import, None between imports
+        self.context = None
+        self.batchReport = []
+        # Assign the materials with one sets call per shading group, False assigns them mesh by mesh
+        self.bulkAssign = True
+        self.materialCache = MaterialCache.MaterialCache()
+        Capabilities.addSceneCallback(self.materialCache.clear)
+        # Read from the QxlReuseMaterials optionVar on the first import
+        self.reuseMaterials = None
+        # The materials connect to one UV transform, invert... node per asset (and per attribute values across assets)
+        self.sharedNodeRegistry = SharedNodes()
+        Capabilities.addSceneCallback(self.sharedNodeRegistry.clear)
+        # Read from the QxlShareNodes optionVar on the first import
+        self.shareNodes = None
+        # Profiling preferences, read from the optionVars on the first import
+        self.profileImport = None
+        self.profileReportDir = ""
+        self.lastProfile = None
+        self.profiles = []
+        # Channel preferences, every map of the asset is loaded and unconnected file nodes are kept by default
+        self.loadUsedChannels = None
+        self.pruneFileNodes = False
+        # Bulk import preferences, one undo chunk per asset and refresh/evaluation suspended by default
+        self.disableUndo = None
+        self.suspendRefresh = True
+        # Incremental import preferences, the imports block Maya until they are done by default
+        self.incrementalImport = None
+        self.sliceBudget = 50
+        self.incrementalImports = []
+        # Scatter preferences, the meshes of scatter assets are imported as they are by default
+        self.instanceScatter = None
+        # Render proxy preferences, high poly LODs are imported as meshes by default.
+        # The proxies are written to the proxies folder of the asset if no proxy folder is set.
+        self.renderProxy = None
+        self.proxyDir = ""
+        # LOD preferences, only the active LOD is imported by default. The thresholds are the camera distances
+        # (in cm) the LOD group switches to the next level at, they are derived from the asset height if not set.
+        self.importLods = None
+        self.lodThresholds = []
+        # Geometry cache preferences, the mesh files are imported as they are by default.
+        # The cache folder is in the Maya app folder if no folder is set, its size limit is in MB.
+        self.cacheGeometry = None
+        self.geometryCacheDir = ""
+        self.geometryCacheSize = 2048
+        self.geometryCache = None
+        # Texture budget preferences, the texture memory of the scene (MB) isn't limited by default.
+        # An asset over the budget is reported ("warn") or imported with lower resolution textures ("downgrade").
+        self.textureBudget = None
+        self.textureBudgetMode = "warn"
+        # Texture conversion preferences, the file nodes read the textures exported by Bridge by default.
+        # An empty converter command uses the converter of the renderer, an empty folder writes next to the sources.
+        self.convertTextures = None
+        self.textureConverter = ""
+        self.convertedExtension = ""
+        self.convertedTexturesDir = ""
+        # Viewport preview preferences, the viewport shows the full resolution textures by default.
+        # The previews are written to the Maya app folder if no folder is set, the cache size limit is in MB.
+        self.viewportPreviews = None
+        self.previewResolution = 1024
+        self.previewCacheDir = ""
+        self.previewCacheSize = 1024
+        self.previewCache = None
+        # Texture bake preferences, the gloss inversion and the single channel maps are left to the material by default.
+        # The baked textures are written to the Maya app folder if no folder is set.
+        self.bakeTextures = None
+        self.bakeDir = ""
+
+# The per asset attributes (ID, tex_nodes, mesh_transforms...) live on the context of the running import
+    def __getattr__(self, name):
+        context = self.__dict__.get("context")
+        if context is not None and name in _FORWARDED:
+            return getattr(context, name)
+        if name in _FORWARDED:
+            raise AttributeError("importerSetup." + name + " is only available while an asset is imported")
+        raise AttributeError("importerSetup has no attribute " + name)
+
+    def __setattr__(self, name, value):
+        if name in _FORWARDED:
+            if self.__dict__.get("context") is None:
+                raise AttributeError("Can't set " + name + ", no import is running")
+            setattr(self.context, name, value)
+        else:
+            self.__dict__[name] = value
 
 # set the exported asset data by using Json provided with the asset
     def set_Asset_Data(self, json_data):
+        if not self.checkRenderEngine():
+            return
+
+        self.parseAssetData(json_data)
+        if self.useIncrementalImport():
+            self.startIncrementalImport()
+        else:
+            self.initAssetImport()
+
+# Imports an asset that was prepared with ImportContext.fromPayload, e.g. on the worker thread of ImportPipeline.
+# Only the Maya side of the import is left to do.
+    def importPlan(self, context):
+        if not self.checkRenderEngine():
+            return
+
+        context.bulkAssign = self.bulkAssign
+        self.context = context
+        if context.missingFiles:
+            mc.warning("Files of " + context.Name + " are missing: " + ", ".join(context.missingFiles))
+        if self.useIncrementalImport():
+            self.startIncrementalImport()
+        else:
+            self.initAssetImport()
+
+# Checks the current renderer, an unsupported renderer is reported and the import has to stop
+    def checkRenderEngine(self):
         self.setRenderEngine()
         
         if(self.Renderer == "Not-Supported"):
             msg = 'Your current render engine (' + self.Renderer + ') is not supported by the Bridge Plugin so we are terminating the import process but the Plugin is still running!'
             mc.confirmDialog( title='MS Plugin Error', message=msg, button=['Ok'], defaultButton='Ok', cancelButton='Ok', dismissString='Ok')
             print (msg)
-            return
+            return False
         else:
             print("Your current render engine is " + self.Renderer)
-        
-        #print("Your current render engine is " + self.Renderer)
-
-        self.json_data = json_data
-        self.TexturesList = []
-        self.Type = self.json_data["type"]
-        self.mesh_transforms = []
-        self.imported_geo = []
-        self.Path = self.json_data["path"]
-        # The extra isHighPoly variable 
-        self.isHighPoly = bool(self.json_data["activeLOD"] == "high")
-        self.activeLOD = self.json_data["activeLOD"]
-        self.minLOD = self.json_data["minLOD"]
-        self.ID = self.json_data["id"]
-        self.height = float(1.0)
-        self.isScatterAsset = self.CheckScatterAsset()
-        self.isBillboard = self.CheckIsBillboard()
-        self.isMultiMat = False
-        self.MultiMaterial = self.getMultiMat()
-        self.dictSetup = None
-        self.defaultShaderList = []
-
-        #self.materialList = []
-        
-        self.All_textures_ = ["albedo", "displacement", "cavity", "normal", "roughness", "specular", "normalbump", 
-                               "ao", "opacity", "translucency", "gloss", "metalness", "bump", "fuzz", "transmission"]
-
-        texturesListName = "components"
-        if self.isBillboard:
-            texturesListName = "components"
+        return True
 
-        self.TexturesList = [(obj["format"], obj["type"], obj["path"]) for obj in self.json_data[texturesListName] if obj["type"] in self.All_textures_]
+# Imports a list of exported assets in one pass. The unit, warning and plugin setup is done once for the
+# whole batch and every asset is timed separately. A failing asset is reported and the batch carries on.
+    def importBatch(self, json_list):
+        self.batchReport = []
+        if not self.checkRenderEngine():
+            return self.batchReport
 
-        self.GeometryList = [(obj["format"], obj["path"]) for obj in self.json_data["meshList"]]
-
-        if "name" in self.json_data.keys():
-            self.Name = self.json_data["name"].replace(" ", "_")
+        batchStart = time.time()
+        try:
+            self.beginImport()
+            for json_data in json_list:
+                result = {"id": json_data.get("id"), "name": json_data.get("name"), "time": 0.0, "error": None}
+                assetStart = time.time()
+                try:
+                    self.parseAssetData(json_data)
+                    result["name"] = self.Name
+                    self.importAsset()
+                    result["attrBatch"] = self.attrBatchReport
+                    result["geometryCache"] = self.geometryCacheReport
+                    result["textureMemory"] = self.textureMemory
+                    result["reusedNodes"] = len(self.reusedNodes)
+                    result["shadingGroups"] = list(self.shadingGroups)
+                except Exception:
+                    result["error"] = traceback.format_exc()
+                    print("Failed to import " + str(result["name"]) + " (" + str(result["id"]) + "):")
+                    print(result["error"])
+                result["time"] = time.time() - assetStart
+                self.batchReport.append(result)
+        finally:
+            self.endImport()
+            self.releaseContext()
 
-        else:
-            self.Name = os.path.basename(self.json_data["path"]).replace(" ", "_")
+        failed = [item for item in self.batchReport if item["error"] is not None]
+        print("Imported " + str(len(self.batchReport) - len(failed)) + "/" + str(len(self.batchReport)) + " assets in %.2fs" % (time.time() - batchStart))
+        return self.batchReport
 
-            if len(self.Name.split("_")) >= 2:
-                self.Name = "_".join(self.Name.split("_")[:-1])
+# Returns the per asset results (id, name, time, error) of the last batch import
+    def getBatchReport(self):
+        return self.batchReport
 
-        self.materialName = self.Name + '_' + self.ID
+# Converts the json to the structure used by the importer and the material setup functions
+    def parseAssetData(self, json_data):
+        self.context = ImportContext.fromPayload(json_data)
+        self.context.bulkAssign = self.bulkAssign
 
+# Sets up the structure and workflow for import. It import the actual geometry ( for scatter as well) and textures and setup material according the render type
+    def initAssetImport(self):
         try:
-            if 'meta' in self.json_data.keys():
+            self.beginImport()
+            self.importAsset()
+        finally:
+            self.endImport()
+            self.releaseContext()
 
-                meta = self.json_data['meta']
-                height_ = [item for item in meta if item["key"].lower() == "height"]
-                if len(height_) >= 1:
-                    self.height = float( height_[0]["value"].replace('m','') )
-        except:
-            pass
+# Imports the current asset in steps (per mesh, per material, per chunk of attribute writes) that run in idle time
+# slices of sliceBudget milliseconds, so Maya stays usable meanwhile. Returns the IncrementalImport, it reports the
+# progress and can be cancelled between the slices.
+    def startIncrementalImport(self, onProgress=None, onFinished=None):
+        context = self.context
+        self.releaseContext()
+        self.incrementalImports = [item for item in self.incrementalImports if not item.finished]
+        incremental_ = IncrementalImport.IncrementalImport(self, context, self.sliceBudget / 1000.0, onProgress, onFinished)
+        self.incrementalImports.append(incremental_)
+        incremental_.start()
+        return incremental_
 
-        self.initAssetImport()
+# Returns the incremental imports that are still running
+    def getIncrementalImports(self):
+        return [item for item in self.incrementalImports if not item.finished]
 
-# Sets up the structure and workflow for import. It import the actual geometry ( for scatter as well) and textures and setup material according the render type
-    def initAssetImport(self):
-        from Megascans import Renderers
-        from Megascans import Importer
+# Cancels the running incremental imports, discard deletes the nodes they created so far
+    def cancelIncrementalImports(self, discard=True):
+        for item in self.getIncrementalImports():
+            item.cancel(discard)
+
+# Drops the state of the finished import, the payload and the node lists aren't kept around
+    def releaseContext(self):
+        self.context = None
 
-        plugins_ = [item.lower() for item in mc.pluginInfo( query=True, listPlugins=True )]
+# Stores the scene state that is changed for the import and queries the loaded plugins.
+# Every change registers the call that undoes it, endImport runs them even if beginImport didn't get to the end.
+# Without holdRefresh the viewport refresh isn't suspended, the caller does it with suspendUpdates.
+    def beginImport(self, holdRefresh=True):
+        self.restore_ = []
+        if self.profileImport is None:
+            self.loadProfileImport()
+        if self.reuseMaterials is None:
+            self.loadReuseMaterials()
+        if self.shareNodes is None:
+            self.loadShareNodes()
+        if self.loadUsedChannels is None:
+            self.loadChannelOptions()
+        if self.disableUndo is None:
+            self.loadBulkImportOptions()
+        if self.instanceScatter is None:
+            self.loadScatterOptions()
+        if self.renderProxy is None:
+            self.loadProxyOptions()
+        if self.importLods is None:
+            self.loadLodOptions()
+        if self.cacheGeometry is None:
+            self.loadGeometryCacheOptions()
+        if self.textureBudget is None:
+            self.loadTextureBudgetOptions()
+        if self.convertTextures is None:
+            self.loadTextureConverterOptions()
+        if self.viewportPreviews is None:
+            self.loadPreviewOptions()
+        if self.bakeTextures is None:
+            self.loadBakeOptions()
+        self.plugins_ = Capabilities.plugins()
 
         unit_ = mc.currentUnit(q=True)
         mc.currentUnit(l="centimeter")
-        warnings = mc.scriptEditorInfo(q=True, suppressWarnings=True)
+        self.restore_.append(lambda: mc.currentUnit(l=unit_))
+        warnings_ = mc.scriptEditorInfo(q=True, suppressWarnings=True)
         mc.scriptEditorInfo(suppressWarnings=True)
+        self.restore_.append(lambda: mc.scriptEditorInfo(suppressWarnings=warnings_))
+
+        # Without undo the import doesn't fill the undo queue, the queue is kept as it is (no flush)
+        if self.disableUndo and mc.undoInfo(q=True, state=True):
+            mc.undoInfo(stateWithoutFlush=False)
+            self.restore_.append(lambda: mc.undoInfo(stateWithoutFlush=True))
+
+        if self.suspendRefresh and holdRefresh:
+            self.suspendUpdates(self.restore_)
+
+# No viewport refresh and no evaluation graph rebuilds while the nodes are created, the calls that undo it go to restore_
+    def suspendUpdates(self, restore_):
+        mc.refresh(suspend=True)
+        restore_.append(lambda: mc.refresh(suspend=False))
+        evaluationMode_ = mc.evaluationManager(q=True, mode=True)
+        if evaluationMode_ and evaluationMode_[0] != "off":
+            mc.evaluationManager(mode="off")
+            restore_.append(lambda: mc.evaluationManager(mode=evaluationMode_[0]))
+
+# Restores the scene state stored by beginImport, see restoreState
+    def endImport(self):
+        restore_ = getattr(self, "restore_", [])
+        self.restore_ = []
+        self.restoreState(restore_)
+
+# Runs the calls that undo scene state changes, in reverse order. A failing call doesn't keep the others from running.
+    def restoreState(self, restore_):
+        for step in reversed(restore_):
+            try:
+                step()
+            except Exception:
+                print("Failed to restore the scene state after the import:")
+                print(traceback.format_exc())
+
+# Imports the geometry and textures of the current asset and creates its material. Expects beginImport to be called first.
+# The asset is one undo chunk, unless undo is off for the import.
+    def importAsset(self):
+        undoChunk_ = not self.disableUndo
+        if undoChunk_:
+            mc.undoInfo(openChunk=True, chunkName="MegascansImport_" + self.ID)
+        try:
+            if self.profileImport:
+                self.profileAsset()
+            else:
+                self.lastProfile = None
+                self.buildAsset()
+        finally:
+            if undoChunk_:
+                mc.undoInfo(closeChunk=True)
+
+# Builds the asset with its phases timed and the Maya commands counted, see getImportProfile
+    def profileAsset(self):
+        self.profile = Profiler.ImportProfile(self.ID, self.Name, self.Renderer)
+        backend_ = CommandBackend.active()
+        CommandBackend.setBackend(Profiler.TracingBackend(backend_, self.profile))
+        try:
+            with self.profile.span("importAsset"):
+                self.buildAsset()
+        finally:
+            CommandBackend.setBackend(backend_)
+            self.profile.finish()
+            self.lastProfile = self.profile
+            self.profiles.append(self.profile)
+            if self.profileReportDir:
+                print("Wrote the import profile " + self.profile.write(self.profileReportDir))
+
+    def buildAsset(self):
+        for step in self.buildSteps():
+            pass
+
+# Steps of buildAsset, every step yields its label once it is done. buildAsset runs them in one go,
+# IncrementalImport runs them in idle time slices. perMesh imports the geometry one mesh per step.
+    def buildSteps(self, perMesh=False):
+        from Megascans import Renderers
+        Importer = CommandBackend.importer()
+
+        plugins_ = self.plugins_
+        profile = self.profile
+        # Set once beginImport has read the preferences
+        self.sharedNodes = self.sharedNodeRegistry if self.shareNodes else None
+
+        # A scatter asset that is already in the scene as prototypes only gets a new group of instances
+        if self.instanceScatter and self.isScatterAsset:
+            self.findScatterPrototypes()
+            if self.scatterPrototypes is not None:
+                with Profiler.span(profile, "ScatterAssetSetup"):
+                    self.ScatterAssetSetup()
+                yield "done"
+                return
 
-        Importer.importGeometryData()
-        Importer.importTextureData()
+        # High poly LODs are placed as a proxy of the renderer. A cached proxy that holds its shaders is all it takes,
+        # otherwise only the geometry import is skipped.
+        proxyCached_ = False
+        if self.renderProxy and self.isHighPoly and self.proxySupported():
+            self.proxyPath = RenderProxy.proxyPath(self.proxyDir or os.path.join(self.Path, "proxies"), self.ID, self.activeLOD, self.Renderer)
+            proxyCached_ = os.path.isfile(self.proxyPath)
+            if proxyCached_ and RenderProxy.getProxy(self.Renderer).embedsMaterials:
+                with Profiler.span(profile, "createRenderProxy"):
+                    self.createRenderProxy(proxyCached_)
+                yield "done"
+                return
+
+        if not proxyCached_:
+            with Profiler.span(profile, "importGeometryData"):
+                for step in self.geometrySteps(Importer, perMesh):
+                    yield step
+
+        # The lower LODs are imported next to the active one and share its material
+        if self.importLods and self.lodsSupported():
+            with Profiler.span(profile, "importLods"):
+                for step in self.lodSteps(Importer):
+                    yield step
+
+        if self.loadUsedChannels and Renderers.isAvailable(self.Renderer, plugins_):
+            self.filterChannels(Renderers.usedChannels(self.Renderer, self.shaderVariants(), self.availableMaps, self.Type, self.isHighPoly))
+
+        # Repeated imports of the same asset reuse the material network that is already in the scene.
+        # Multi material assets get their shading groups from the geometry so they are always built.
+        if self.reuseMaterials and not self.isMultiMat:
+            with Profiler.span(profile, "findCachedMaterial"):
+                self.findCachedMaterial()
+
+        if self.cachedMaterial is None:
+            with Profiler.span(profile, "probeTextures"):
+                self.probeTextures()
+            if self.bakeTextures:
+                with Profiler.span(profile, "bakeTextureFiles"):
+                    self.bakeTextureFiles()
+                yield "texture bake"
+            if self.viewportPreviews:
+                with Profiler.span(profile, "createPreviews"):
+                    self.createPreviews()
+                yield "previews"
+            if self.convertTextures:
+                with Profiler.span(profile, "convertTextureFiles"):
+                    self.convertTextureFiles()
+                yield "texture conversion"
+            with Profiler.span(profile, "importTextureData"):
+                Importer.importTextureData()
+            yield "textures"
+        self.buildTextureIndex()
         
         
-        if self.Renderer == "Redshift" and "redshift4maya" in plugins_:
-            Renderers.Redshift()
-            #Hypershade.RearrangeHyperShade()
-            #Hypershade.CloseHyperShader()
-        elif self.Renderer == "Vray" and "vrayformaya" in plugins_:
-            Renderers.Vray()
-            #Hypershade.RearrangeHyperShade()
-            #Hypershade.CloseHyperShader()
-        elif self.Renderer == "Arnold" and "mtoa" in plugins_:
-            Renderers.Arnold()
+        if Renderers.isAvailable(self.Renderer, plugins_):
+            with Profiler.span(profile, self.Renderer + " setup"):
+                setup_ = Renderers.getRenderer(self.Renderer)(self.context, deferred=True)
+                for step in setup_.steps:
+                    yield step
             #Hypershade.RearrangeHyperShade()
             #Hypershade.CloseHyperShader()
-        elif self.Renderer == "OctaneRender" and "octaneplugin" in plugins_:
-            Renderers.OctaneRender()
-            #Hypershade.RearrangeHyperShade()
-            #Hypershade.CloseHyperShader()
-        elif self.Renderer == "MayaSoftware":
-            Renderers.Arnold()
         else:
             mc.warning(self.Renderer + " was not found, please make sure it's installed.")
 
-        self.ScatterAssetSetup()
+        if self.reusedNodes:
+            print("Connected the materials of " + self.Name + " to " + str(len(self.reusedNodes)) + " shared node(s) instead of creating them")
 
-        mc.currentUnit(l=unit_)
-        mc.scriptEditorInfo(suppressWarnings=warnings)
-        
-    def getMultiMat(self):
-        matId_ = [item for item in self.json_data['meta'] if item["key"].lower() == "materialids"]
-        if len(matId_) >=1:
-            self.isMultiMat = True
-            matList = []
-            for data in matId_[0]['value']:
-                matList.append(data['material'])
-            print(matList)
-            return matList
-        else:
+        if self.pruneFileNodes and self.cachedMaterial is None:
+            self.pruneUnusedFileNodes()
+
+        if self.texturePreviews:
+            with Profiler.span(profile, "applyPreviews"):
+                self.applyPreviews()
+
+        if self.materialKey is not None and self.cachedMaterial is None and len(self.shadingGroups) == 1:
+            self.materialCache.register(self.materialKey, self.materialNodes, self.tex_nodes)
+
+        if self.lodLevels is not None:
+            with Profiler.span(profile, "createLodGroup"):
+                self.createLodGroup()
+            yield "lod group"
+
+        if self.proxyPath is not None:
+            with Profiler.span(profile, "createRenderProxy"):
+                self.createRenderProxy(proxyCached_)
+            yield "proxy"
+
+        with Profiler.span(profile, "ScatterAssetSetup"):
+            self.ScatterAssetSetup()
+        yield "done"
+
+# Imports the geometry of the asset, one mesh per step with perMesh. Multi material assets are always imported
+# in one step, the importer creates their shading groups from the whole geometry list.
+# With the geometry cache every mesh file is loaded from the cache or imported on its own and cached.
+    def geometrySteps(self, Importer, perMesh=False):
+        context = self.context
+        cache_ = self.getGeometryCache() if self.cacheGeometry and not context.isMultiMat else None
+        if cache_ is None and (not perMesh or context.isMultiMat):
+            Importer.importGeometryData()
+            yield "geometry"
+            return
+
+        geometry_ = context.GeometryList
+        if cache_ is not None:
+            context.geometryCacheReport = {"hits": 0, "misses": 0}
+        try:
+            for item in geometry_:
+                if cache_ is not None:
+                    # The unit forced by beginImport is part of the key
+                    settings_ = {"format": item[0], "unit": mc.currentUnit(q=True)}
+                    cached_ = cache_.load(item[1], settings_)
+                    result_ = "hits" if cached_ is not None else "misses"
+                    context.geometryCacheReport[result_] += 1
+                    Profiler.increment(self.profile, "geometryCache." + result_)
+                    if cached_ is not None:
+                        context.imported_geo += cached_
+                        context.mesh_transforms += cached_
+                        yield "geometry " + os.path.basename(item[1])
+                        continue
+
+                count_ = len(context.imported_geo)
+                context.GeometryList = [item]
+                Importer.importGeometryData()
+                if cache_ is not None:
+                    cache_.store(item[1], settings_, context.imported_geo[count_:])
+                yield "geometry " + os.path.basename(item[1])
+        finally:
+            context.GeometryList = geometry_
+        if cache_ is not None:
+            print("Geometry cache: " + str(context.geometryCacheReport["hits"]) + " hit(s), " + str(context.geometryCacheReport["misses"]) + " miss(es)")
+
+# The geometry cache of the current preferences, see GeometryCache
+    def getGeometryCache(self):
+        directory = self.geometryCacheDir or os.path.join(mc.internalVar(userAppDir=True), "MegascansGeometryCache")
+        maxSize = int(self.geometryCacheSize * 1024 * 1024)
+        if self.geometryCache is None or self.geometryCache.directory != directory:
+            self.geometryCache = GeometryCache.GeometryCache(directory, maxSize)
+        self.geometryCache.maxSize = maxSize
+        return self.geometryCache
+
+# Checks that the renderer has a proxy format. Multi material assets need the shaders in the proxy file,
+# their shading groups are created from the imported geometry.
+    def proxySupported(self):
+        if not RenderProxy.isSupported(self.Renderer):
+            return False
+        if self.isMultiMat and not RenderProxy.getProxy(self.Renderer).embedsMaterials:
+            mc.warning("The " + self.Renderer + " proxy can't hold the materials of the multi material asset " + self.Name + ", the meshes are imported instead")
+            return False
+        return True
+
+# Replaces the imported meshes by a proxy node of the renderer. The meshes are written to proxyPath first
+# unless the proxy is cached. If the proxy can't be written the meshes are kept.
+# A proxy that holds its shaders doesn't need the material network, the network built for the export is deleted.
+    def createRenderProxy(self, cached):
+        proxy_ = RenderProxy.getProxy(self.Renderer)
+        if not cached:
+            if not self.mesh_transforms:
+                return
+            try:
+                folder_ = os.path.dirname(self.proxyPath)
+                if not os.path.isdir(folder_):
+                    os.makedirs(folder_)
+                proxy_.export(self.proxyPath, self.mesh_transforms)
+            except Exception:
+                mc.warning("Couldn't write the render proxy " + self.proxyPath + ", the meshes are kept: " + traceback.format_exc())
+                return
+            mc.delete(self.imported_geo)
+            print("Wrote the render proxy " + self.proxyPath)
+            if proxy_.embedsMaterials:
+                self.deleteMaterialNetwork()
+
+        self.proxyNode = proxy_.create(self.Name + "_" + self.ID + "_proxy", self.proxyPath)
+        sg_ = (self.cachedMaterial or self.materialNodes or {}).get("sg")
+        if not proxy_.embedsMaterials and sg_ is not None and not self.isMultiMat:
+            mc.sets(self.proxyNode, e=True, forceElement=sg_)
+        self.imported_geo = [self.proxyNode]
+        self.mesh_transforms = [self.proxyNode]
+
+# Deletes the material network built by this import: the file nodes, the placement, the shading groups and the
+# material nodes. A reused network and the shared nodes of earlier imports are kept.
+    def deleteMaterialNetwork(self):
+        if self.cachedMaterial is not None:
+            return []
+        nodes_ = [node_ for node_, mapType in self.tex_nodes] + list(self.previewNodes)
+        nodes_ += [self.coord_2d] if self.coord_2d else []
+        nodes_ += list(self.shadingGroups) + list(self.defaultShaderList)
+        nodes_ += list((self.materialNodes or {}).values())
+        earlier_ = [node_ for node_ in self.reusedNodes if node_ not in self.createdSharedNodes]
+        unique_ = []
+        for node_ in nodes_:
+            if node_ and node_ not in unique_ and node_ not in earlier_ and mc.objExists(node_):
+                unique_.append(node_)
+        if unique_:
+            mc.delete(unique_)
+        if self.materialKey is not None:
+            self.materialCache.entries.pop(self.materialKey, None)
+        self.tex_nodes = []
+        self.shadingGroups = []
+        self.materialNodes = None
+        return unique_
+
+# Checks that the asset can be imported with its lower LODs. Multi material assets get their shading groups from the
+# geometry, scatter assets and proxies are placed in their own way, so they are imported with the active LOD only.
+    def lodsSupported(self):
+        if self.isMultiMat or self.isScatterAsset or self.proxyPath is not None:
+            return False
+        return bool(self.mesh_transforms) and bool(self.context.lowerLods())
+
+# Imports the LODs below the active one, one LOD per step. The meshes of every LOD are kept in lodLevels.
+    def lodSteps(self, Importer):
+        context = self.context
+        geometry_ = context.GeometryList
+        context.lodLevels = [(self.activeLOD, list(context.imported_geo))]
+        try:
+            for lod, items in context.lowerLods():
+                count_ = len(context.imported_geo)
+                context.GeometryList = items
+                Importer.importGeometryData()
+                context.lodLevels.append((lod, context.imported_geo[count_:]))
+                yield "geometry " + lod
+        finally:
+            context.GeometryList = geometry_
+
+# Puts the LODs under a Maya LOD group. Every LOD is a level with a group of its meshes, the active LOD is the
+# first level and the lowest LOD (the billboard of plants) the last one.
+# The renders always use the active LOD: its level isn't switched by the LOD group and is drawn as a bounding box
+# in the viewport. The lower LODs are only for the viewport and their render stats are turned off. The display level
+# of the LOD group pins the viewport to the lowest LOD and hides the ones in between, the thresholds to the
+# perspective camera are still set so setting the display levels to Use LOD switches them by distance.
+    def createLodGroup(self):
+        levels_ = [(lod, meshes_) for lod, meshes_ in self.lodLevels if meshes_]
+        self.lodGroup = mc.createNode("lodGroup", name=self.Name + "_" + self.ID + "_LOD")
+        thresholds_ = self.getLodThresholds(len(levels_) - 2)
+
+        batch = MelBatch()
+        for index, (lod, meshes_) in enumerate(levels_):
+            level_ = mc.group( em=True, name=self.Name + "_" + self.ID + "_" + lod)
+            ScatterInstancing.parentNodes(meshes_, level_)
+            ScatterInstancing.parentNodes([level_], self.lodGroup)
+            if index == 0:
+                if len(levels_) > 1:
+                    batch.setAttr(level_ + ".overrideEnabled", 1)
+                    batch.setAttr(level_ + ".overrideLevelOfDetail", 1)
+                continue
+            batch.connectAttr(self.lodGroup + ".output[" + str(index - 1) + "]", level_ + ".lodVisibility")
+            batch.setAttr(self.lodGroup + ".displayLevel[" + str(index - 1) + "]", 1 if index == len(levels_) - 1 else 2)
+            for mesh_ in meshes_:
+                for shape_ in mc.listRelatives(mesh_, shapes=True) or []:
+                    for attr in ["primaryVisibility", "castsShadows", "visibleInReflections", "visibleInRefractions"]:
+                        batch.setAttr(shape_ + "." + attr, 0)
+        for index, distance in enumerate(thresholds_):
+            batch.setAttr(self.lodGroup + ".threshold[" + str(index) + "]", distance)
+        if mc.objExists("perspShape"):
+            batch.connectAttr("perspShape.worldMatrix[0]", self.lodGroup + ".cameraMatrix")
+        batch.flush()
+
+# Camera distances the LOD group switches levels at, the preference if it has enough of them.
+# Otherwise the first switch is at 5 times the asset height and the distance doubles with every level.
+    def getLodThresholds(self, count):
+        if count <= 0:
+            return []
+        if len(self.lodThresholds) >= count:
+            return list(self.lodThresholds[:count])
+        base = self.height * 100.0 * 5
+        return [base * (2 ** index) for index in range(count)]
+
+# Looks up the prototypes of an earlier import of the same scatter asset, see ScatterInstancing
+    def findScatterPrototypes(self):
+        materialKey_ = MaterialCache.materialKey(self.ID, self.Renderer, self.activeLOD, self.TexturesList)
+        self.scatterKey = ScatterInstancing.scatterKey(materialKey_, self.GeometryList)
+        self.scatterPrototypes = ScatterInstancing.findPrototypes(self.scatterKey)
+        if self.scatterPrototypes is not None:
+            print("Placing instances of the existing prototypes of " + self.Name)
+
+# Shader variants the materials of the asset are built with, one per material of multi material assets
+    def shaderVariants(self):
+        if self.isMultiMat:
+            return ["glass" if material.lower() == "glass" else "opaque" for material in self.MultiMaterial]
+        return ["opaque"]
+
+# Drops the textures the renderer doesn't consume from the list of textures to import
+    def filterChannels(self, channels_):
+        self.skippedMaps = [mapType for mapType in self.availableMaps if mapType not in channels_]
+        if self.skippedMaps:
+            self.TexturesList = [item for item in self.TexturesList if item[1] in channels_]
+            print("Skipping the " + ", ".join(self.skippedMaps) + " map(s), " + self.Renderer + " doesn't use them")
+
+# Reads the headers of the textures to import on a thread pool (see TextureInfo). The maps with floating point images are
+# handed to the material setups and the texture memory of the asset is checked against the scene budget.
+    def probeTextures(self):
+        self.readTextureInfo()
+        print("Estimated texture memory of " + self.Name + ": %.1f MB" % (self.textureMemory / 1048576.0))
+        if self.textureBudget:
+            self.checkTextureBudget()
+
+    def readTextureInfo(self):
+        self.textureInfo = TextureInfo.probe([path for format_, mapType, path in self.TexturesList])
+        self.floatMaps = [mapType for format_, mapType, path in self.TexturesList if (self.textureInfo.get(path) or {}).get("isFloat")]
+        self.textureMemory = sum([TextureInfo.estimateMemory(header) for header in self.textureInfo.values()])
+
+# Checks that the textures of the asset fit in the texture budget next to the file nodes of the scene. In the downgrade
+# mode the lower resolution exports of the textures are used until they fit. Returns False if the asset is over the budget.
+    def checkTextureBudget(self):
+        budget_ = self.textureBudget * 1048576
+        used_ = self.sceneTextureMemory()
+        if self.textureBudgetMode == "downgrade":
+            while used_ + self.textureMemory > budget_ and self.downgradeTextures():
+                pass
+        if used_ + self.textureMemory > budget_:
+            mc.warning("The textures of " + self.Name + " (%.1f MB) exceed the scene texture budget, %.1f of %.1f MB are used"
+                       % (self.textureMemory / 1048576.0, used_ / 1048576.0, self.textureBudget))
+            return False
+        return True
+
+# Converts the textures to import into tiled, mip mapped files (see TextureConverter), the file nodes are created
+# with the converted files. The textures that can't be converted keep their source file.
+    def convertTextureFiles(self):
+        converter_ = TextureConverter.getConverter(self.Renderer, self.textureConverter, self.convertedExtension, self.convertedTexturesDir)
+        if converter_ is None:
+            print("There is no texture converter for " + self.Renderer + ", set one in the preferences")
             return None
+        converted_ = converter_.convert([path for format_, mapType, path in self.TexturesList])
+        self.TexturesList = [(format_, mapType, converted_.get(path, path)) for format_, mapType, path in self.TexturesList]
+        report_ = converter_.report()
+        print("Converted " + str(report_["converted"]) + " texture(s) of " + self.Name + ", " + str(report_["upToDate"]) + " up to date, "
+              + str(len(report_["failed"])) + " failed")
+        return report_
+
+# Bakes the gloss map into a roughness map and packs the roughness, metalness and AO maps the material setup can read
+# from one texture into it (see TextureBake). The baked textures take the place of their sources in the import.
+    def bakeTextureFiles(self):
+        from Megascans import Renderers
+        if not TextureBake.isAvailable():
+            print("NumPy and Pillow are needed for the texture bake, the textures are imported as they are")
+            return None
+        bake_ = TextureBake.TextureBake(self.bakeDir or os.path.join(mc.internalVar(userAppDir=True), "MegascansBakes"))
+        paths_ = dict([(mapType, path) for format_, mapType, path in self.TexturesList])
+
+        if "gloss" in paths_ and "roughness" not in paths_:
+            roughness_ = bake_.invertGloss(paths_["gloss"])
+            if roughness_ is not None:
+                self.TexturesList = [("png", "roughness", roughness_) if mapType == "gloss" else (format_, mapType, path) for format_, mapType, path in self.TexturesList]
+                self.availableMaps = ["roughness" if mapType == "gloss" else mapType for mapType in self.availableMaps]
+                paths_["roughness"] = roughness_
+                del paths_["gloss"]
+
+        packable_ = Renderers.packableChannels(self.Renderer, self.shaderVariants()) if Renderers.isAvailable(self.Renderer, self.plugins_) else []
+        packed_ = [mapType for mapType in TextureBake.PACKED_CHANNELS if mapType in paths_ and mapType in packable_]
+        # A single map is read as it is
+        if len(packed_) >= 2:
+            orm_ = bake_.pack(dict([(mapType, paths_[mapType]) for mapType in packed_]))
+            if orm_ is not None:
+                self.TexturesList = [item for item in self.TexturesList if item[1] not in packed_] + [("png", "orm", orm_)]
+                self.availableMaps = self.availableMaps + ["orm"]
+                self.packedMaps = packed_
+                print("Packed the " + ", ".join(packed_) + " maps of " + self.Name + " into one texture")
+        return bake_.report()
+
+# Creates the viewport previews of the colour, normal and opacity maps (see TexturePreview) from the source textures,
+# before they are converted. The viewport material reading them is created once the material is built.
+    def createPreviews(self):
+        if not TexturePreview.isAvailable():
+            print("NumPy and Pillow are needed for the viewport previews, the viewport shows the full resolution textures")
+            return None
+        if self.Renderer not in TexturePreview.RENDER_SHADER_ATTRS:
+            print(self.Renderer + " renders the material the viewport shows, the viewport shows the full resolution textures")
+            return None
+        sources_ = [(mapType, path) for format_, mapType, path in self.TexturesList if mapType in TexturePreview.MAP_TYPES]
+        previews_ = self.getPreviewCache().create([path for mapType, path in sources_])
+        self.texturePreviews = dict([(mapType, previews_[path]) for mapType, path in sources_ if path in previews_])
+        return self.texturePreviews
+
+    def applyPreviews(self):
+        batch = MelBatch()
+        renderAttr = TexturePreview.RENDER_SHADER_ATTRS[self.Renderer]
+        self.previewNodes = TexturePreview.applyPreviews(self.tex_nodes, self.texturePreviews, self.shadingGroups, self.coord_2d, renderAttr, batch)
+        batch.flush()
+        return self.previewNodes
+
+# The viewport preview cache of the current preferences, see TexturePreview
+    def getPreviewCache(self):
+        directory = self.previewCacheDir or os.path.join(mc.internalVar(userAppDir=True), "MegascansPreviews")
+        maxSize = int(self.previewCacheSize * 1024 * 1024)
+        if self.previewCache is None or self.previewCache.directory != directory:
+            self.previewCache = TexturePreview.PreviewCache(directory, self.previewResolution, maxSize)
+        self.previewCache.resolution = int(self.previewResolution)
+        self.previewCache.maxSize = maxSize
+        return self.previewCache
+
+# Estimated memory of the textures read by the file nodes of the scene
+    def sceneTextureMemory(self):
+        nodes_ = [node_ for node_ in (mc.ls(type="file") or []) if not TexturePreview.isPreviewNode(node_)]
+        paths_ = [mc.getAttr(node_ + ".fileTextureName") for node_ in nodes_]
+        headers_ = TextureInfo.probe([path for path in paths_ if path])
+        return sum([TextureInfo.estimateMemory(header) for header in headers_.values()])
+
+# Switches the textures to their next lower resolution export, returns False if none of them has one
+    def downgradeTextures(self):
+        texturesList_ = []
+        downgraded_ = []
+        for format_, mapType, path in self.TexturesList:
+            lower_ = TextureInfo.lowerResolution(path)
+            if lower_ is not None:
+                path = lower_
+                downgraded_.append(mapType)
+            texturesList_.append((format_, mapType, path))
+        if not downgraded_:
+            return False
+        self.TexturesList = texturesList_
+        self.readTextureInfo()
+        print("Using lower resolution " + ", ".join(downgraded_) + " map(s) for " + self.Name + ", %.1f MB" % (self.textureMemory / 1048576.0))
+        return True
+
+# Deletes the imported file nodes that ended up without outgoing connections and drops them from the texture index
+    def pruneUnusedFileNodes(self):
+        unused_ = []
+        for node_, mapType in self.tex_nodes:
+            destinations_ = mc.listConnections(node_, source=False, destination=True) or []
+            if not [item for item in destinations_ if mc.nodeType(item) != "textureList"]:
+                unused_.append(node_)
+
+        if unused_:
+            mc.delete(unused_)
+            print("Deleted the unconnected file node(s) " + ", ".join(unused_))
+            self.tex_nodes = [item for item in self.tex_nodes if item[0] not in unused_]
+            self.buildTextureIndex()
+            if self.materialNodes is not None:
+                self.materialNodes = dict([(key, node_) for key, node_ in self.materialNodes.items() if node_ not in unused_])
+        return unused_
+
+# Looks up the material network of an earlier import of the same asset, its file nodes are used instead of importing the textures again
+    def findCachedMaterial(self):
+        self.materialKey = MaterialCache.materialKey(self.ID, self.Renderer, self.activeLOD, self.TexturesList, self.textureSettings())
+        cached_ = self.materialCache.find(self.materialKey)
+        if cached_ is not None:
+            print("Reusing the existing material " + cached_["nodes"]["sg"])
+            self.cachedMaterial = cached_["nodes"]
+            self.tex_nodes = [(node_, mapType) for node_, mapType, path in cached_["files"]]
+            self.coord_2d = cached_["nodes"].get("uv")
         
+# Preferences that change the files the material network reads, part of the material cache key. The network
+# is looked up before the textures are baked, previewed, converted or downgraded.
+    def textureSettings(self):
+        return {
+            "bake": bool(self.bakeTextures),
+            "previews": self.previewResolution if self.viewportPreviews else 0,
+            "convert": [self.textureConverter, self.convertedExtension, self.convertedTexturesDir] if self.convertTextures else None,
+            "budget": [self.textureBudget, self.textureBudgetMode] if self.textureBudget else None,
+        }
+
+    def getMultiMat(self):
+        return self.context.getMultiMat()
+
 # Return bool after checking if the asset is type scatter
     def CheckScatterAsset(self):
-        if(self.Type == "3d"):
-            if('scatter' in self.json_data['categories'] or 'scatter' in self.json_data['tags'] or 'cmb_asset' in self.json_data['categories'] or 'cmb_asset' in self.json_data['tags']):
-                # print("It is 3D scatter asset.")
-                return True
-        return False
-    
+        return self.context.CheckScatterAsset()
+
 # Return bool after checking if the asset is type bill board
     def CheckIsBillboard(self):
-        # Use billboard textures if importing the Billboard LOD.
-        if(self.Type == "3dplant"):
-            if (self.activeLOD == self.minLOD):
-                # print("It is billboard LOD.")
-                return True
-        return False
-    
+        return self.context.CheckIsBillboard()
+
 # Check the current renderer in maya 
     def setRenderEngine(self):
-        selectedRenderer = melc.eval("getAttr defaultRenderGlobals.currentRenderer;")
+        selectedRenderer = Capabilities.currentRenderer()
         selectedRenderer = selectedRenderer.lower()
         self.Renderer = "Not-Supported"
         
@@ -190,38 +858,43 @@ class importerSetup():
         elif("mayasoftware" in selectedRenderer):
             self.Renderer = "MayaSoftware"
             
-# Change the import process to scatter type - multiple geometries
+# Builds the map type -> file nodes lookup of the running import, see ImportContext.buildTextureIndex
+    def buildTextureIndex(self):
+        return self.context.buildTextureIndex()
+
+# Returns the file node imported for the given map type, the first one by default
+    def getTexNode(self, mapType, index=0):
+        return self.context.getTexNode(mapType, index)
+
+# Change the import process to scatter type - multiple geometries. With instanced scatter the imported meshes
+# become the prototypes and the group gets instances of them.
     def ScatterAssetSetup(self):
-        if self.isScatterAsset and len(self.imported_geo) > 1:
-            try:
-                self.scatterParentName = self.ID + '_' + self.Name
-                self.scatterParentName = mc.group( em=True, name=self.scatterParentName)
-
-                for meshName in self.imported_geo:
-                    try:
-                        melc.eval('parent '+ meshName +' '+ self.scatterParentName +';')
-                    except:
-                        pass
-            except:
-                pass
+        if self.scatterPrototypes is None and not (self.isScatterAsset and len(self.imported_geo) > 1):
+            return
+        try:
+            self.scatterParentName = self.ID + '_' + self.Name
+            self.scatterParentName = mc.group( em=True, name=self.scatterParentName)
+
+            if self.scatterPrototypes is None and self.instanceScatter:
+                ScatterInstancing.createPrototypes(self.scatterKey, self.scatterParentName, self.imported_geo)
+                self.scatterPrototypes = list(self.imported_geo)
+
+            if self.scatterPrototypes is not None:
+                self.imported_geo = ScatterInstancing.placeInstances(self.scatterPrototypes, self.scatterParentName)
+                self.mesh_transforms = list(self.imported_geo)
+            else:
+                ScatterInstancing.parentNodes(self.imported_geo, self.scatterParentName)
+        except:
+            pass
             
 # Creates name for the imported mesh
     def createName(self, meshName):
-        shortName = meshName
-
-        try:
-            if len(meshName.split("_") ) > 2:
-                shortName = [meshName.split("_")[-2], meshName.split("_")[-1]]
-                if shortName[0].lower() == self.ID.lower():
-                    shortName.remove(shortName[0] )
-                shortName = self.Name + '_' + self.ID + "_" + "_".join( shortName )
-        except:
-            shortName = meshName
-
-        return shortName
+        return self.context.createName(meshName)
 
 # Returns the json structure sent by Bridge
     def getExportStructure(self):       
+        if self.context is None:
+            return None
         return self.json_data
 
 # Save preferences
@@ -252,4 +925,314 @@ class importerSetup():
 
 # Apply the material to the asset
     def setApplyToSelection(self, value):
-        mc.optionVar( iv=('QxlApplyToSelection', value))
\ No newline at end of file
+        mc.optionVar( iv=('QxlApplyToSelection', value))
+
+# Load the material reuse preference, repeated imports reuse their material unless it was turned off
+    def loadReuseMaterials(self):
+        if mc.optionVar( exists='QxlReuseMaterials') == 1:
+            self.reuseMaterials = bool(mc.optionVar( q='QxlReuseMaterials') != 2)
+        else:
+            self.reuseMaterials = True
+        return self.reuseMaterials
+
+# Turn the material reuse on or off
+    def updateReuseMaterials(self, flag = True):
+        self.reuseMaterials = bool(flag)
+        mc.optionVar( iv=('QxlReuseMaterials', 1 if flag else 2))
+
+# Load the shared node preference, the materials share their UV and utility nodes unless it was turned off
+    def loadShareNodes(self):
+        if mc.optionVar( exists='QxlShareNodes') == 1:
+            self.shareNodes = bool(mc.optionVar( q='QxlShareNodes') != 2)
+        else:
+            self.shareNodes = True
+        return self.shareNodes
+
+# Turn the shared UV and utility nodes on or off
+    def updateShareNodes(self, flag = True):
+        self.shareNodes = bool(flag)
+        mc.optionVar( iv=('QxlShareNodes', 1 if flag else 2))
+
+# Load the profiling preferences. QxlProfileImport turns the profiling on (1) or off (2),
+# QxlProfileReportDir is the folder the per asset JSON reports are written to (no reports if empty).
+    def loadProfileImport(self):
+        if mc.optionVar( exists='QxlProfileImport') == 1:
+            self.profileImport = bool(mc.optionVar( q='QxlProfileImport') == 1)
+        else:
+            self.profileImport = False
+        if mc.optionVar( exists='QxlProfileReportDir') == 1:
+            self.profileReportDir = mc.optionVar( q='QxlProfileReportDir')
+        else:
+            self.profileReportDir = ""
+        return self.profileImport
+
+# Turn the profiling on or off, reportDir None keeps the current report folder
+    def updateProfileImport(self, flag = False, reportDir = None):
+        self.profileImport = bool(flag)
+        mc.optionVar( iv=('QxlProfileImport', 1 if flag else 2))
+        if reportDir is not None:
+            self.profileReportDir = reportDir
+            mc.optionVar( sv=('QxlProfileReportDir', reportDir))
+
+# Returns the profile report (spans, command counts by name and caller) of the last import, None if it wasn't profiled
+    def getImportProfile(self):
+        if self.lastProfile is None:
+            return None
+        return self.lastProfile.report()
+
+# Returns the profile reports of all the imports profiled in this session
+    def getImportProfiles(self):
+        return [profile.report() for profile in self.profiles]
+
+# Load the channel preferences. QxlLoadUsedChannels (1 on, 2 off) only imports the maps the renderer consumes,
+# QxlPruneFileNodes (1 on, 2 off) deletes the file nodes left unconnected after the material setup.
+    def loadChannelOptions(self):
+        if mc.optionVar( exists='QxlLoadUsedChannels') == 1:
+            self.loadUsedChannels = bool(mc.optionVar( q='QxlLoadUsedChannels') == 1)
+        else:
+            self.loadUsedChannels = False
+        if mc.optionVar( exists='QxlPruneFileNodes') == 1:
+            self.pruneFileNodes = bool(mc.optionVar( q='QxlPruneFileNodes') == 1)
+        else:
+            self.pruneFileNodes = False
+        return self.loadUsedChannels
+
+# Turn the channel filtering and the file node pruning on or off
+    def updateChannelOptions(self, loadUsed = False, prune = False):
+        self.loadUsedChannels = bool(loadUsed)
+        self.pruneFileNodes = bool(prune)
+        mc.optionVar( iv=('QxlLoadUsedChannels', 1 if loadUsed else 2))
+        mc.optionVar( iv=('QxlPruneFileNodes', 1 if prune else 2))
+
+# Load the bulk import preferences. QxlDisableUndo (1 on, 2 off) imports without undo instead of one undo chunk
+# per asset, QxlSuspendRefresh (1 on, 2 off) suspends the viewport refresh and the evaluation manager during the import.
+    def loadBulkImportOptions(self):
+        if mc.optionVar( exists='QxlDisableUndo') == 1:
+            self.disableUndo = bool(mc.optionVar( q='QxlDisableUndo') == 1)
+        else:
+            self.disableUndo = False
+        if mc.optionVar( exists='QxlSuspendRefresh') == 1:
+            self.suspendRefresh = bool(mc.optionVar( q='QxlSuspendRefresh') != 2)
+        else:
+            self.suspendRefresh = True
+        return self.disableUndo
+
+# Load the incremental import preferences. QxlIncrementalImport (1 on, 2 off) imports the assets in idle time slices,
+# QxlSliceBudget is the time a slice may take in milliseconds.
+    def loadIncrementalOptions(self):
+        if mc.optionVar( exists='QxlIncrementalImport') == 1:
+            self.incrementalImport = bool(mc.optionVar( q='QxlIncrementalImport') == 1)
+        else:
+            self.incrementalImport = False
+        if mc.optionVar( exists='QxlSliceBudget') == 1:
+            self.sliceBudget = float(mc.optionVar( q='QxlSliceBudget'))
+        else:
+            self.sliceBudget = 50
+        return self.incrementalImport
+
+# Turn the incremental import on or off, budget None keeps the current slice budget
+    def updateIncrementalOptions(self, flag = False, budget = None):
+        self.incrementalImport = bool(flag)
+        mc.optionVar( iv=('QxlIncrementalImport', 1 if flag else 2))
+        if budget is not None:
+            self.sliceBudget = float(budget)
+            mc.optionVar( fv=('QxlSliceBudget', self.sliceBudget))
+
+# Returns True if the assets are imported incrementally, the preference is read on the first call
+    def useIncrementalImport(self):
+        if self.incrementalImport is None:
+            self.loadIncrementalOptions()
+        return self.incrementalImport
+
+# Load the scatter preference. QxlInstanceScatter (1 on, 2 off) keeps the meshes of scatter assets as hidden prototypes
+# and places instances of them, repeated imports of the asset only add instances.
+    def loadScatterOptions(self):
+        if mc.optionVar( exists='QxlInstanceScatter') == 1:
+            self.instanceScatter = bool(mc.optionVar( q='QxlInstanceScatter') == 1)
+        else:
+            self.instanceScatter = False
+        return self.instanceScatter
+
+# Turn the instanced scatter import on or off
+    def updateScatterOptions(self, flag = False):
+        self.instanceScatter = bool(flag)
+        mc.optionVar( iv=('QxlInstanceScatter', 1 if flag else 2))
+
+# Load the render proxy preferences. QxlRenderProxy (1 on, 2 off) places the high poly LODs as proxies of the renderer,
+# QxlProxyDir is the folder the proxy files are cached in (the proxies folder of the asset if empty).
+    def loadProxyOptions(self):
+        if mc.optionVar( exists='QxlRenderProxy') == 1:
+            self.renderProxy = bool(mc.optionVar( q='QxlRenderProxy') == 1)
+        else:
+            self.renderProxy = False
+        if mc.optionVar( exists='QxlProxyDir') == 1:
+            self.proxyDir = mc.optionVar( q='QxlProxyDir')
+        else:
+            self.proxyDir = ""
+        return self.renderProxy
+
+# Turn the render proxies on or off, proxyDir None keeps the current proxy folder
+    def updateProxyOptions(self, flag = False, proxyDir = None):
+        self.renderProxy = bool(flag)
+        mc.optionVar( iv=('QxlRenderProxy', 1 if flag else 2))
+        if proxyDir is not None:
+            self.proxyDir = proxyDir
+            mc.optionVar( sv=('QxlProxyDir', proxyDir))
+
+# Load the LOD preferences. QxlImportLods (1 on, 2 off) imports the lower LODs under a LOD group,
+# QxlLodThresholds holds the viewport switch distances in cm between the lower LODs, separated by spaces (derived
+# from the asset height if empty).
+    def loadLodOptions(self):
+        if mc.optionVar( exists='QxlImportLods') == 1:
+            self.importLods = bool(mc.optionVar( q='QxlImportLods') == 1)
+        else:
+            self.importLods = False
+        if mc.optionVar( exists='QxlLodThresholds') == 1:
+            self.lodThresholds = [float(item) for item in mc.optionVar( q='QxlLodThresholds').split()]
+        else:
+            self.lodThresholds = []
+        return self.importLods
+
+# Turn the LOD import on or off, thresholds None keeps the current switch distances
+    def updateLodOptions(self, flag = False, thresholds = None):
+        self.importLods = bool(flag)
+        mc.optionVar( iv=('QxlImportLods', 1 if flag else 2))
+        if thresholds is not None:
+            self.lodThresholds = [float(item) for item in thresholds]
+            mc.optionVar( sv=('QxlLodThresholds', " ".join([str(item) for item in self.lodThresholds])))
+
+# Load the geometry cache preferences. QxlGeometryCache (1 on, 2 off) loads the meshes from the cache,
+# QxlGeometryCacheDir is the cache folder and QxlGeometryCacheSize its size limit in MB.
+    def loadGeometryCacheOptions(self):
+        if mc.optionVar( exists='QxlGeometryCache') == 1:
+            self.cacheGeometry = bool(mc.optionVar( q='QxlGeometryCache') == 1)
+        else:
+            self.cacheGeometry = False
+        if mc.optionVar( exists='QxlGeometryCacheDir') == 1:
+            self.geometryCacheDir = mc.optionVar( q='QxlGeometryCacheDir')
+        else:
+            self.geometryCacheDir = ""
+        if mc.optionVar( exists='QxlGeometryCacheSize') == 1:
+            self.geometryCacheSize = float(mc.optionVar( q='QxlGeometryCacheSize'))
+        else:
+            self.geometryCacheSize = 2048
+        return self.cacheGeometry
+
+# Turn the geometry cache on or off, cacheDir and maxSize (MB) None keep the current values
+    def updateGeometryCacheOptions(self, flag = False, cacheDir = None, maxSize = None):
+        self.cacheGeometry = bool(flag)
+        mc.optionVar( iv=('QxlGeometryCache', 1 if flag else 2))
+        if cacheDir is not None:
+            self.geometryCacheDir = cacheDir
+            mc.optionVar( sv=('QxlGeometryCacheDir', cacheDir))
+        if maxSize is not None:
+            self.geometryCacheSize = float(maxSize)
+            mc.optionVar( fv=('QxlGeometryCacheSize', self.geometryCacheSize))
+
+# Returns the geometry cache hits and misses of this session
+    def getGeometryCacheReport(self):
+        if self.geometryCache is None:
+            return {"hits": 0, "misses": 0}
+        return self.geometryCache.report()
+
+# Load the texture budget preferences. QxlTextureBudget is the texture memory of the scene in MB (0 for no budget),
+# QxlTextureBudgetMode warns about the assets over the budget (1) or downgrades their textures (2).
+    def loadTextureBudgetOptions(self):
+        if mc.optionVar( exists='QxlTextureBudget') == 1:
+            self.textureBudget = float(mc.optionVar( q='QxlTextureBudget'))
+        else:
+            self.textureBudget = 0
+        if mc.optionVar( exists='QxlTextureBudgetMode') == 1:
+            self.textureBudgetMode = "downgrade" if mc.optionVar( q='QxlTextureBudgetMode') == 2 else "warn"
+        else:
+            self.textureBudgetMode = "warn"
+        return self.textureBudget
+
+# Set the texture budget (MB, 0 for no budget) and what happens to the assets over it ("warn" or "downgrade")
+    def updateTextureBudgetOptions(self, budget = 0, mode = "warn"):
+        self.textureBudget = float(budget)
+        self.textureBudgetMode = "downgrade" if mode == "downgrade" else "warn"
+        mc.optionVar( fv=('QxlTextureBudget', self.textureBudget))
+        mc.optionVar( iv=('QxlTextureBudgetMode', 2 if self.textureBudgetMode == "downgrade" else 1))
+
+# Load the texture conversion preferences. QxlConvertTextures (1 on, 2 off) converts the textures before the file nodes
+# are created, QxlTextureConverter is the converter command with {source} and {output} in it (the renderer's if empty),
+# QxlConvertedExtension the extension of its output and QxlConvertedTexturesDir the shared output folder.
+    def loadTextureConverterOptions(self):
+        if mc.optionVar( exists='QxlConvertTextures') == 1:
+            self.convertTextures = bool(mc.optionVar( q='QxlConvertTextures') == 1)
+        else:
+            self.convertTextures = False
+        for attr, optionVar in [("textureConverter", "QxlTextureConverter"), ("convertedExtension", "QxlConvertedExtension"),
+                                ("convertedTexturesDir", "QxlConvertedTexturesDir")]:
+            if mc.optionVar( exists=optionVar) == 1:
+                setattr(self, attr, mc.optionVar( q=optionVar))
+            else:
+                setattr(self, attr, "")
+        return self.convertTextures
+
+# Turn the texture conversion on or off, the arguments left at None keep their current values
+    def updateTextureConverterOptions(self, flag = False, command = None, extension = None, outputDir = None):
+        self.convertTextures = bool(flag)
+        mc.optionVar( iv=('QxlConvertTextures', 1 if flag else 2))
+        for attr, optionVar, value in [("textureConverter", "QxlTextureConverter", command), ("convertedExtension", "QxlConvertedExtension", extension),
+                                       ("convertedTexturesDir", "QxlConvertedTexturesDir", outputDir)]:
+            if value is not None:
+                setattr(self, attr, value)
+                mc.optionVar( sv=(optionVar, value))
+
+# Load the viewport preview preferences. QxlViewportPreviews (1 on, 2 off) shows low resolution copies of the colour,
+# normal and opacity maps in the viewport, QxlPreviewResolution is their longest side in pixels,
+# QxlPreviewCacheDir the folder they are kept in and QxlPreviewCacheSize its size limit in MB.
+    def loadPreviewOptions(self):
+        if mc.optionVar( exists='QxlViewportPreviews') == 1:
+            self.viewportPreviews = bool(mc.optionVar( q='QxlViewportPreviews') == 1)
+        else:
+            self.viewportPreviews = False
+        if mc.optionVar( exists='QxlPreviewResolution') == 1:
+            self.previewResolution = int(mc.optionVar( q='QxlPreviewResolution'))
+        if mc.optionVar( exists='QxlPreviewCacheDir') == 1:
+            self.previewCacheDir = mc.optionVar( q='QxlPreviewCacheDir')
+        if mc.optionVar( exists='QxlPreviewCacheSize') == 1:
+            self.previewCacheSize = float(mc.optionVar( q='QxlPreviewCacheSize'))
+        return self.viewportPreviews
+
+# Turn the viewport previews on or off, resolution, cacheDir and maxSize (MB) None keep the current values
+    def updatePreviewOptions(self, flag = False, resolution = None, cacheDir = None, maxSize = None):
+        self.viewportPreviews = bool(flag)
+        mc.optionVar( iv=('QxlViewportPreviews', 1 if flag else 2))
+        if resolution is not None:
+            self.previewResolution = int(resolution)
+            mc.optionVar( iv=('QxlPreviewResolution', self.previewResolution))
+        if cacheDir is not None:
+            self.previewCacheDir = cacheDir
+            mc.optionVar( sv=('QxlPreviewCacheDir', cacheDir))
+        if maxSize is not None:
+            self.previewCacheSize = float(maxSize)
+            mc.optionVar( fv=('QxlPreviewCacheSize', self.previewCacheSize))
+
+# Load the texture bake preferences. QxlBakeTextures (1 on, 2 off) bakes the gloss inversion and packs the single channel
+# maps into one texture before the file nodes are created, QxlBakeDir is the folder of the baked textures.
+    def loadBakeOptions(self):
+        if mc.optionVar( exists='QxlBakeTextures') == 1:
+            self.bakeTextures = bool(mc.optionVar( q='QxlBakeTextures') == 1)
+        else:
+            self.bakeTextures = False
+        if mc.optionVar( exists='QxlBakeDir') == 1:
+            self.bakeDir = mc.optionVar( q='QxlBakeDir')
+        return self.bakeTextures
+
+# Turn the texture bake on or off, bakeDir None keeps the current folder
+    def updateBakeOptions(self, flag = False, bakeDir = None):
+        self.bakeTextures = bool(flag)
+        mc.optionVar( iv=('QxlBakeTextures', 1 if flag else 2))
+        if bakeDir is not None:
+            self.bakeDir = bakeDir
+            mc.optionVar( sv=('QxlBakeDir', bakeDir))
+
+# Turn the undo-free import and the refresh suspension on or off
+    def updateBulkImportOptions(self, disableUndo = False, suspendRefresh = True):
+        self.disableUndo = bool(disableUndo)
+        self.suspendRefresh = bool(suspendRefresh)
+        mc.optionVar( iv=('QxlDisableUndo', 1 if disableUndo else 2))
+        mc.optionVar( iv=('QxlSuspendRefresh', 1 if suspendRefresh else 2))
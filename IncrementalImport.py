@@ -0,0 +1,172 @@
+"""
+This Module:
+- Imports an asset in small steps (per mesh, per material, per chunk of attribute writes, see importerSetup.buildSteps)
+  that run in idle time slices, so Maya stays usable while large scatter or multi material assets are built
+- Reports the progress after every slice and can be cancelled between the slices
+
+The scene state of the import (unit, warnings, undo) is set up before the first slice and restored when the asset is
+finished or cancelled, the asset is one undo chunk. Only the viewport refresh is suspended per slice, so the viewport
+keeps updating in between. The steps are the ones of a blocking import run in the same order, so the result is the same.
+"""
+
+import time
+import traceback
+
+from Megascans.CommandBackend import cmds as mc
+from Megascans import CommandBackend
+
+# Attribute writes and connections that are run per MEL call
+ATTR_BATCH_SIZE = 200
+
+
+class IncrementalImport():
+    def __init__(self, setup, context, budget=0.05, onProgress=None, onFinished=None):
+        self.setup = setup
+        self.context = context
+        # Seconds a slice may take, a slice runs at least one step
+        self.budget = budget
+        self.onProgress = onProgress
+        self.onFinished = onFinished
+        self.steps = None
+        self.stepsDone = 0
+        self.slices = 0
+        self.label = ""
+        self.started = None
+        self.elapsed = 0.0
+        self.cancelled = False
+        self.discard = True
+        self.finished = False
+        self.error = None
+        # Calls that restore the scene state of the import, None until the first slice set it up
+        self.restore_ = None
+        self.undoChunk = False
+
+    def start(self):
+        self.context.attrBatchSize = ATTR_BATCH_SIZE
+        self.started = time.time()
+        self.steps = self.setup.buildSteps(perMesh=True)
+        CommandBackend.executeDeferred(self.runSlice)
+
+    # Stops the import before its next slice, discard deletes the nodes it created so far
+    def cancel(self, discard=True):
+        self.cancelled = True
+        self.discard = discard
+
+    # Runs steps until the slice budget is used up and queues the next slice
+    def runSlice(self):
+        if self.finished:
+            return
+        if self.cancelled:
+            self.abort()
+            return
+
+        setup = self.setup
+        previous_ = setup.context
+        setup.context = self.context
+        sliceStart = time.time()
+        done_ = False
+        sliceRestore_ = []
+        try:
+            if self.restore_ is None:
+                self.beginAsset()
+            if setup.suspendRefresh:
+                setup.suspendUpdates(sliceRestore_)
+            while not self.cancelled:
+                try:
+                    self.label = next(self.steps)
+                except StopIteration:
+                    done_ = True
+                    break
+                self.stepsDone += 1
+                if time.time() - sliceStart >= self.budget:
+                    break
+        except Exception:
+            self.error = traceback.format_exc()
+            print("Failed to import " + str(self.context.Name) + " (" + str(self.context.ID) + "):")
+            print(self.error)
+            done_ = True
+        finally:
+            setup.restoreState(sliceRestore_)
+            setup.context = previous_
+
+        self.slices += 1
+        self.elapsed = time.time() - self.started
+        self.reportProgress()
+        if done_:
+            self.finish()
+        elif self.cancelled:
+            self.abort()
+        else:
+            CommandBackend.executeDeferred(self.runSlice)
+
+    # Sets up the scene state of the import with importerSetup.beginImport and opens the undo chunk of the asset,
+    # both are kept until endAsset
+    def beginAsset(self):
+        setup = self.setup
+        try:
+            setup.beginImport(holdRefresh=False)
+        finally:
+            self.restore_ = setup.restore_
+            setup.restore_ = []
+        self.undoChunk = not setup.disableUndo
+        if self.undoChunk:
+            mc.undoInfo(openChunk=True, chunkName="MegascansImport_" + self.context.ID)
+
+    def endAsset(self):
+        if self.undoChunk:
+            self.undoChunk = False
+            mc.undoInfo(closeChunk=True)
+        restore_ = self.restore_ or []
+        self.restore_ = []
+        self.setup.restoreState(restore_)
+
+    # Ends a cancelled import, its nodes are deleted unless cancel was called with discard=False
+    def abort(self):
+        self.steps.close()
+        if self.discard:
+            nodes_ = [node_ for node_ in self.createdNodes() if mc.objExists(node_)]
+            if nodes_:
+                mc.delete(nodes_)
+        print("Cancelled the import of " + str(self.context.Name) + " after " + str(self.stepsDone) + " steps")
+        self.finish()
+
+    def finish(self):
+        self.endAsset()
+        self.finished = True
+        self.elapsed = time.time() - self.started
+        self.steps = None
+        if self.error is None and not self.cancelled:
+            print("Imported " + str(self.context.Name) + " in " + str(self.stepsDone) + " steps, " + str(self.slices) + " slices, %.2fs" % self.elapsed)
+        if self.onFinished is not None:
+            self.onFinished(self)
+
+    # Nodes created by the import so far. The file nodes and the network of a reused material belong to the earlier import,
+    # so do the shared nodes of earlier imports it connected to.
+    def createdNodes(self):
+        context = self.context
+        nodes_ = list(context.imported_geo)
+        nodes_ += [context.lodGroup] if context.lodGroup else []
+        if context.cachedMaterial is None:
+            nodes_ += [node_ for node_, mapType in context.tex_nodes]
+            nodes_ += [context.coord_2d] if context.coord_2d else []
+            nodes_ += list(context.previewNodes)
+            nodes_ += list(context.shadingGroups) + list(context.defaultShaderList)
+            if context.materialNodes is not None:
+                nodes_ += list(context.materialNodes.values())
+        nodes_ += list(context.createdSharedNodes)
+        earlier_ = [node_ for node_ in context.reusedNodes if node_ not in context.createdSharedNodes]
+        unique_ = []
+        for node_ in nodes_:
+            if node_ and node_ not in unique_ and node_ not in earlier_:
+                unique_.append(node_)
+        return unique_
+
+    # Progress of the import: the steps done so far, the label of the last one and the time it took until now
+    def status(self):
+        return {"id": self.context.ID, "name": self.context.Name, "steps": self.stepsDone, "slices": self.slices,
+                "step": self.label, "time": self.elapsed, "cancelled": self.cancelled, "finished": self.finished,
+                "error": self.error}
+
+    def reportProgress(self):
+        if self.onProgress is not None:
+            self.onProgress(self)
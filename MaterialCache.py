@@ -0,0 +1,103 @@
+"""
+This Module:
+- Remembers the material networks created for the imported assets
+- Finds the network of a repeated import (same asset ID, renderer, LOD, textures and texture preferences) so it
+  can be reused
+- Checks that the nodes of a cached network still exist and still read the same files
+
+The cache lives in the scene: the key and the nodes of a network are stored as string attributes on its
+shading group, so reopened scenes are found again. The in-memory lookup only saves the scene scan.
+"""
+
+import hashlib
+import json
+import os
+
+from Megascans.CommandBackend import cmds as mc
+
+KEY_ATTR = "msMaterialKey"
+NODES_ATTR = "msMaterialNodes"
+
+
+# Builds the cache key of an asset from its ID, the renderer, the LOD and the set of texture files it uses.
+# settings are the preferences that change the files the network reads (bake, conversion, budget...).
+def materialKey(assetId, renderer, lod, texturesList, settings=None):
+    paths_ = sorted([mapType + "=" + normalizePath(path) for format_, mapType, path in texturesList])
+    paths_.append(json.dumps(settings, sort_keys=True))
+    digest = hashlib.md5("\n".join(paths_).encode("utf-8")).hexdigest()
+    return "|".join([assetId, renderer, lod, digest])
+
+
+def normalizePath(path):
+    return os.path.normcase(os.path.normpath(path)).replace("\\", "/")
+
+
+class MaterialCache():
+    def __init__(self):
+        self.entries = {}
+
+    # Returns {"nodes": key -> node name, "files": [(file node, map type), ...]} for a valid cached network
+    def find(self, key):
+        candidates_ = []
+        # The remembered shading group may have been replaced by a same-named one of another scene
+        if key in self.entries and self.keyOf(self.entries[key]) == key:
+            candidates_.append(self.entries[key])
+        candidates_ += [sg for sg in self.scanScene(key) if sg not in candidates_]
+
+        for sg in candidates_:
+            record = self.load(sg)
+            if record is not None and self.isValid(record):
+                self.entries[key] = sg
+                return record
+
+        self.entries.pop(key, None)
+        return None
+
+    # Stores the network built for key on its shading group
+    def register(self, key, nodes, tex_nodes):
+        sg = nodes["sg"]
+        files_ = [(node_, mapType, mc.getAttr(node_ + ".fileTextureName")) for node_, mapType in tex_nodes]
+        record = {"nodes": nodes, "files": files_}
+
+        for attr in [KEY_ATTR, NODES_ATTR]:
+            if not mc.attributeQuery(attr, node=sg, exists=True):
+                mc.addAttr(sg, longName=attr, dataType="string")
+        mc.setAttr(sg + "." + KEY_ATTR, key, type="string")
+        mc.setAttr(sg + "." + NODES_ATTR, json.dumps(record), type="string")
+
+        self.entries[key] = sg
+
+    def clear(self):
+        self.entries = {}
+
+    # The key a shading group was registered with, None if it wasn't
+    def keyOf(self, sg):
+        if not mc.objExists(sg + "." + KEY_ATTR):
+            return None
+        return mc.getAttr(sg + "." + KEY_ATTR)
+
+    # Shading groups of the scene that were registered with key
+    def scanScene(self, key):
+        plugs_ = mc.ls("*." + KEY_ATTR, recursive=True) or []
+        return [plug.split(".")[0] for plug in plugs_ if mc.getAttr(plug) == key]
+
+    def load(self, sg):
+        if not mc.objExists(sg + "." + NODES_ATTR):
+            return None
+        try:
+            record = json.loads(mc.getAttr(sg + "." + NODES_ATTR))
+        except ValueError:
+            return None
+        record["files"] = [tuple(item) for item in record["files"]]
+        return record
+
+    def isValid(self, record):
+        for node_ in record["nodes"].values():
+            if not mc.objExists(node_):
+                return False
+        for node_, mapType, path in record["files"]:
+            if not mc.objExists(node_):
+                return False
+            if normalizePath(mc.getAttr(node_ + ".fileTextureName")) != normalizePath(path):
+                return False
+        return True
@@ -0,0 +1,145 @@
+"""
+This Module:
+- Times the phases of an asset import (geometry, textures, material setup, scatter setup...) as spans
+- Counts the maya.cmds/maya.mel calls made during the import by command name and by caller
+- Turns the measurements into a report that can be written as a JSON file per asset
+
+The commands are counted by putting TracingBackend in front of the active command backend for the
+duration of the import. Nothing is wrapped while profiling is off, span() then returns a shared no-op.
+Only the commands that go through the CommandBackend proxies are counted.
+"""
+
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+
+class _NullSpan():
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *args):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+# Returns a span of profile, or a no-op when profile is None (profiling off)
+def span(profile, name):
+    if profile is None:
+        return _NULL_SPAN
+    return profile.span(name)
+
+
+# Adds value to the counter name of profile, nothing happens when profile is None
+def increment(profile, name, value=1):
+    if profile is not None:
+        profile.counters[name] += value
+
+
+class _Span():
+    def __init__(self, profile, name):
+        self.profile = profile
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.time()
+        self.profile.depth += 1
+        return self
+
+    def __exit__(self, *args):
+        self.profile.depth -= 1
+        self.profile.spans.append({"name": self.name, "start": self.start - self.profile.start,
+                                   "time": time.time() - self.start, "depth": self.profile.depth})
+        return False
+
+
+class ImportProfile():
+    def __init__(self, assetId, name, renderer):
+        self.assetId = assetId
+        self.name = name
+        self.renderer = renderer
+        self.start = time.time()
+        self.end = None
+        self.depth = 0
+        self.spans = []
+        self.commands = Counter()
+        self.callers = Counter()
+        # Named counters of the import, e.g. the geometry cache hits and misses
+        self.counters = Counter()
+
+    def span(self, name):
+        return _Span(self, name)
+
+    def count(self, command, caller):
+        self.commands[command] += 1
+        self.callers[(caller, command)] += 1
+
+    def finish(self):
+        self.end = time.time()
+
+    def report(self):
+        callers = {}
+        for (caller, command), count in self.callers.items():
+            callers.setdefault(caller, {})[command] = count
+        return {
+            "id": self.assetId,
+            "name": self.name,
+            "renderer": self.renderer,
+            "time": (self.end or time.time()) - self.start,
+            # Spans are recorded when they end, sort them back into the order they started
+            "spans": sorted(self.spans, key=lambda item: item["start"]),
+            "commands": dict(self.commands),
+            "totalCommands": sum(self.commands.values()),
+            "callers": callers,
+            "counters": dict(self.counters),
+        }
+
+    # Writes the report to directory as <id>_<name>_<time>.json and returns its path
+    def write(self, directory):
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        fileName = "_".join([self.assetId, self.name, time.strftime("%Y%m%d_%H%M%S", time.localtime(self.start))]) + ".json"
+        path = os.path.join(directory, fileName)
+        with open(path, "w") as file_:
+            json.dump(self.report(), file_, indent=2, sort_keys=True)
+        return path
+
+
+# Command backend that counts the calls before handing them to the backend it wraps
+class TracingBackend():
+    def __init__(self, backend, profile):
+        self.backend = backend
+        self.cmds = _TracingCommands(backend.cmds, profile, "")
+        self.mel = _TracingCommands(backend.mel, profile, "mel.")
+
+    @property
+    def isMaya(self):
+        return self.backend.isMaya
+
+    def importer(self):
+        return self.backend.importer()
+
+
+class _TracingCommands():
+    def __init__(self, commands, profile, prefix):
+        self._commands = commands
+        self._profile = profile
+        self._prefix = prefix
+
+    def __getattr__(self, name):
+        command = getattr(self._commands, name)
+        if not callable(command):
+            return command
+        profile = self._profile
+        commandName = self._prefix + name
+
+        def traced(*args, **kwargs):
+            frame = sys._getframe(1)
+            caller = frame.f_globals.get("__name__", "?").split(".")[-1] + "." + frame.f_code.co_name
+            profile.count(commandName, caller)
+            return command(*args, **kwargs)
+        return traced
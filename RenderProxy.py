@@ -0,0 +1,93 @@
+"""
+This Module:
+- Writes the imported geometry of an asset to the proxy format of the active renderer (Redshift proxy,
+  Arnold standin, V-Ray proxy) and places a lightweight proxy node in the scene instead of the meshes
+- Keeps the proxy files on disk by asset ID, LOD and renderer, so a repeated import only creates the proxy node
+
+The Redshift and Arnold proxies are written with the shaders of the meshes, a cached proxy of theirs doesn't need the
+material network to be built again. V-Ray proxies only hold the geometry and the names of its shaders, the material
+network of the asset is built and assigned to the proxy as usual.
+"""
+
+import os
+
+from Megascans.CommandBackend import cmds as mc
+
+
+class RedshiftProxy():
+    extension = "rs"
+    embedsMaterials = True
+
+    def export(self, path, meshes):
+        exportSelected(meshes, lambda: mc.file(path, force=True, exportSelected=True, type="Redshift Proxy", options="exportConnectivity=0;enableCompression=1;"))
+
+    def create(self, name, path):
+        transform_ = mc.createNode("transform", name=name)
+        mesh_ = mc.createNode("mesh", name=transform_ + "Shape", parent=transform_)
+        proxy_ = mc.createNode("RedshiftProxyMesh", name=transform_ + "_rsProxy")
+        mc.setAttr(proxy_ + ".fileName", path, type="string")
+        mc.connectAttr(proxy_ + ".outMesh", mesh_ + ".inMesh")
+        return transform_
+
+
+class ArnoldProxy():
+    extension = "ass"
+    embedsMaterials = True
+
+    def export(self, path, meshes):
+        # Shapes (8) and shaders (16) of the selection, the bounding box is stored for the viewport
+        exportSelected(meshes, lambda: mc.arnoldExportAss(filename=path, selected=True, mask=24, lightLinks=False, shadowLinks=False, boundingBox=True))
+
+    def create(self, name, path):
+        transform_ = mc.createNode("transform", name=name)
+        standin_ = mc.createNode("aiStandIn", name=transform_ + "Shape", parent=transform_)
+        mc.setAttr(standin_ + ".dso", path, type="string")
+        return transform_
+
+
+class VrayProxy():
+    extension = "vrmesh"
+    embedsMaterials = False
+
+    def export(self, path, meshes):
+        exportSelected(meshes, lambda: mc.vrayCreateProxy(dir=os.path.dirname(path), fname=os.path.basename(path), exportType=1,
+                                                          previewFaces=10000, overwrite=True))
+
+    def create(self, name, path):
+        mc.vrayCreateProxy(node=name, dir=path, existing=True, createProxyNode=True)
+        return name
+
+
+# Renderer name set by importerSetup.setRenderEngine -> proxy format, Octane and Maya Software import the geometry as it is
+PROXIES = {
+    "Redshift": RedshiftProxy(),
+    "Arnold": ArnoldProxy(),
+    "Vray": VrayProxy(),
+}
+
+
+def isSupported(renderer):
+    return renderer in PROXIES
+
+
+def getProxy(renderer):
+    return PROXIES[renderer]
+
+
+# Path of the proxy file of an asset LOD for the renderer, one folder per asset in cacheDir
+def proxyPath(cacheDir, assetId, lod, renderer):
+    fileName = assetId + "_" + lod + "_" + renderer + "." + PROXIES[renderer].extension
+    return os.path.join(cacheDir, assetId, fileName).replace("\\", "/")
+
+
+# Selects the meshes for the export call, the selection is restored afterwards
+def exportSelected(meshes, export):
+    selection_ = mc.ls(sl=True)
+    try:
+        mc.select(meshes, replace=True)
+        export()
+    finally:
+        if selection_:
+            mc.select(selection_, replace=True)
+        else:
+            mc.select(clear=True)
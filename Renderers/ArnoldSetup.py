@@ -0,0 +1,185 @@
+"""
+This Module:
+- Handles the Arnold material setup
+- The material networks are described as ShaderGraph rules (see ShaderGraph.py) per shader variant
+"""
+from Megascans.CommandBackend import cmds as mc
+
+from Megascans import Capabilities
+from Megascans.ShaderGraph import MelBatch, AssignmentBatch
+from Megascans.Renderers.Common import PACKED_TEXTURE, buildGraph, materialSteps, runSteps
+
+_ARNOLD_DISPLACEMENT = {
+    "maps": ["displacement"],
+    "nodes": [("dispShader", "displacementShader", "{id}_Displacement_shr", "asTexture"),
+              ("dispOffset", "floatMath", "{id}_displaceOffset", "asUtility"),
+              ("dispMultiply", "floatMath", "{id}_displaceMultiply", "asUtility")],
+    "attrs": [("dispOffset.floatB", -0.5), ("dispMultiply.operation", 2),
+              ("dispShader.aiDisplacementAutoBump", 0), ("dispShader.aiDisplacementZeroValue", 0),
+              ("dispShader.aiDisplacementPadding", 10.0), ("dispShader.scale", 10), ("displacement.alphaIsLuminance", 1)],
+    "connections": [("displacement.outColorR", "dispOffset.floatA"), ("dispOffset.outFloat", "dispMultiply.floatA"),
+                    ("dispMultiply.outFloat", "dispShader.displacement"), ("dispShader.displacement", "sg.displacementShader")],
+}
+
+"""Arnold3_Setup creates a Arnold material setup."""
+
+class Arnold():
+    OPAQUE = [
+        # Set the material and shading group
+        {"nodes": [("mat", "{shader}", "{name}_Mat", "asShader"), ("sg", "shadingEngine", "{name}_SG", None)],
+         "attrs": [("mat.base", 1), ("mat.specular", 1)],
+         "connections": [("mat.outColor", "sg.surfaceShader")]},
+
+        {"maps": ["normal"],
+         "nodes": [("normalMap", "aiNormalMap", "{id}_Normal", "asShader")],
+         "attrs": [("normalMap.strength", 0.25)],
+         "connections": [("normalMap.outValue", "mat.normalCamera"), ("normal.outColor", "normalMap.input")]},
+
+        {"maps": ["albedo"], "connections": [("albedo.outColor", "mat.baseColor")]},
+
+        {"maps": ["roughness"],
+         "attrs": [("roughness.alphaIsLuminance", 1)],
+         "connections": [("roughness.outAlpha", "mat.specularRoughness")]},
+
+        # Roughness and metalness baked into the red and green channels of one texture (see TextureBake)
+        PACKED_TEXTURE,
+        {"packed": ["roughness"], "connections": [("orm.outColorR", "mat.specularRoughness")]},
+        {"packed": ["metalness"], "connections": [("orm.outColorG", "mat.metalness")]},
+
+        # Plants don't get displacement, high poly geometry only for surfaces.
+        dict(_ARNOLD_DISPLACEMENT, highPoly=False, types=["3d", "surface"]),
+        dict(_ARNOLD_DISPLACEMENT, highPoly=True, types=["surface"]),
+        {"maps": ["displacement", "normal"], "types": ["3dplant"], "highPoly": False, "attrs": [("normalMap.strength", 1)]},
+
+        {"maps": ["metalness"],
+         "attrs": [("metalness.alphaIsLuminance", 1)],
+         "connections": [("metalness.outAlpha", "mat.metalness")]},
+
+        {"maps": ["translucency", "albedo"],
+         "attrs": [("mat.subsurface", 0.33), ("mat.thinWalled", 1), ("mat.subsurfaceType", 2)],
+         "connections": [("albedo.outColor", "mat.subsurfaceColor")]},
+        {"maps": ["transmission"], "without": ["translucency"],
+         "attrs": [("transmission.colorGain", (0.25, 0.25, 0.25))],
+         "connections": [("transmission.outColorR", "mat.transmission")]},
+
+        {"maps": ["opacity"],
+         "attrs": [("opacity.alphaIsLuminance", 1), ("mat.thinWalled", 1)],
+         "connections": [("opacity.outColor", "mat.opacity")]},
+    ]
+
+    GLASS = [
+        {"nodes": [("mat", "{shader}", "{name}_Mat", "asShader"), ("sg", "shadingEngine", "{name}_SG", None)],
+         "attrs": [("mat.transmission", 0.85)],
+         "connections": [("mat.outColor", "sg.surfaceShader")]},
+
+        {"maps": ["normal"],
+         "nodes": [("normalMap", "aiNormalMap", "{id}_Normal", "asShader")],
+         "connections": [("normalMap.outValue", "mat.normalCamera"), ("normal.outColor", "normalMap.input")]},
+
+        {"maps": ["roughness"],
+         "nodes": [("roughRange", "aiRange", "{id}_Rough_Range", "asShader")],
+         "shared": ["roughRange"],
+         "attrs": [("roughness.alphaIsLuminance", 1)],
+         "connections": [("roughness.outColor", "roughRange.input"), ("roughRange.outColorR", "mat.specularRoughness")]},
+        {"maps": ["gloss"], "without": ["roughness"],
+         "nodes": [("roughRange", "aiRange", "{id}_Rough_Range", "asShader"), ("invert", "reverse", "invert", "asShader")],
+         "shared": ["roughRange", "invert"],
+         "attrs": [("gloss.alphaIsLuminance", 1)],
+         "connections": [("gloss.outColor", "invert.input"), ("invert.output", "roughRange.input"),
+                         ("roughRange.outColorR", "mat.specularRoughness")]},
+        PACKED_TEXTURE,
+        {"packed": ["roughness"], "connections": [("orm.outColorR", "mat.specularRoughness")]},
+    ]
+
+    # deferred leaves the material steps to the caller (incremental import), they are run right away otherwise
+    def __init__(self, context, deferred=False):
+        self.context = context
+        self.shaderList = context.defaultShaderList
+        self.batch = MelBatch()
+        self.assignments = AssignmentBatch()
+        self.ShaderName = ""
+        self.steps = materialSteps(self)
+        if not deferred:
+            runSteps(self.steps)
+
+    def OpaqueSetup(self, shader):
+        nodes_ = Capabilities.nodeTypes()
+
+        #Standard Surface is not available in 2019 and 2018
+        self.ShaderName = "aiStandardSurface"
+
+        if len(self.context.tex_nodes) >= 1 and self.ShaderName in nodes_:
+
+            nodes_ = buildGraph(self.context, self.OPAQUE, shader, self.batch, shader=self.ShaderName)
+            arn_sg = nodes_["sg"]
+            maps_ = self.context.availableMaps
+
+            if len(self.context.mesh_transforms) >= 1:
+                for mesh_ in self.context.mesh_transforms:
+                    
+                    node_type = mc.nodeType(mesh_)
+                    if node_type in ('mesh'):
+                        self.batch.setAttr(mesh_+".smoothLevel", 1)
+
+                    else:
+                        Specmesh_ = mc.listRelatives(mesh_, children=True)
+
+                        for tempMesh_ in Specmesh_:
+                            mesh_ = tempMesh_
+                            self.batch.setAttr(mesh_+".smoothLevel", 1)
+
+                            if "displacement" in maps_:
+                                if not self.context.isHighPoly:
+                                    self.batch.setAttr(mesh_+".aiSubdivType", keyable=True)
+                                    self.batch.setAttr(mesh_+".aiSubdivIterations", keyable=True)
+                                    self.batch.setAttr(mesh_+".aiDispAutobump", keyable=True)
+                                    self.batch.setAttr(mesh_+".aiSubdivType", 1)
+                                    if self.context.Type in ["3d"]:
+                                        self.batch.setAttr(mesh_+".aiSubdivIterations", 3)
+                                        self.batch.setAttr(mesh_+".aiDispHeight", 1)
+                                        self.batch.setAttr(mesh_+".aiDispZeroValue", 0.0)
+                                        self.batch.setAttr(mesh_+".aiDispPadding", 1.0)
+                                        self.batch.setAttr(mesh_+".useSmoothPreviewForRender", 0)
+                                        self.batch.setAttr(mesh_+".renderSmoothLevel", 0)
+                                    elif self.context.Type in ["3dplant"]:
+                                        self.batch.setAttr(mesh_+".aiSubdivType", 0)
+                                        self.batch.setAttr(mesh_+".aiSubdivIterations", 0)
+                                        self.batch.setAttr(mesh_+".aiDispHeight", 1)
+                                        self.batch.setAttr(mesh_+".aiDispZeroValue", 0.0)
+                                        self.batch.setAttr(mesh_+".aiDispPadding", 1.0)
+                                        self.batch.setAttr(mesh_+".useSmoothPreviewForRender", 0)
+                                        self.batch.setAttr(mesh_+".renderSmoothLevel", 0)
+                                    else:
+                                        self.batch.setAttr(mesh_+".aiDispHeight", 1)
+                                        self.batch.setAttr(mesh_+".aiDispZeroValue", 0)
+                                        self.batch.setAttr(mesh_+".aiDispPadding", 0.0)
+                                
+                                if self.context.Type in ["surface"]:
+                                        self.batch.setAttr(mesh_+".aiSubdivType", keyable=True)
+                                        self.batch.setAttr(mesh_+".aiSubdivIterations", keyable=True)
+                                        self.batch.setAttr(mesh_+".aiDispAutobump", keyable=True)
+                                        self.batch.setAttr(mesh_+".aiSubdivType", 1)
+                                        self.batch.setAttr(mesh_+".aiSubdivIterations", 3)
+
+                            if "opacity" in maps_:
+                                self.batch.setAttr(mesh_+".aiOpaque", 0)
+
+                            if "normal" not in maps_ and not self.context.isHighPoly:
+                                self.batch.setAttr(mesh_+".aiDispAutobump", 1)
+                            
+                            self.assignments.add(arn_sg, mesh_)
+        else:
+            print("Please make sure you have the latest version of Arnold installed. Go to SolidAngle.com to get it.")
+
+    def GlassSetup(self, shader):
+        nodes_ = Capabilities.nodeTypes()
+
+        if "standardSurface" in nodes_:
+            self.ShaderName = "standardSurface"
+        else:
+            self.ShaderName = "aiStandardSurface"
+
+        if len(self.context.tex_nodes) >= 1 and self.ShaderName in nodes_:
+            buildGraph(self.context, self.GLASS, shader, self.batch, shader=self.ShaderName)
+        else:
+            print("Please make sure you have the latest version of Arnold installed. Go to SolidAngle.com to get it.")
@@ -0,0 +1,87 @@
+"""
+This Module:
+- Holds what the material setups of all renderers share: building the shader graph rules of the
+  current asset and flushing the batched attribute writes and material assignments
+"""
+from Megascans import Profiler
+from Megascans.ShaderGraph import ShaderGraph
+
+# The packed roughness/metalness/AO texture of the texture bake holds data, not colours
+PACKED_TEXTURE = {"maps": ["orm"], "attrs": [("orm.colorSpace", "Raw"), ("orm.ignoreColorSpaceFileRules", 1)]}
+
+# Builds the given graph rules for the asset of the import context and returns the key -> node name mapping.
+# sg is the shading group created by the importer for multi material assets (None otherwise).
+# existing maps additional graph keys to scene nodes (e.g. the place2dTexture node).
+# The attribute writes and connections are added to batch, graphContext is used to format the node names.
+# If the importer found the asset's network in the material cache that network is returned instead.
+def buildGraph(context, rules, sg, batch, existing=None, **graphContext):
+    if context.cachedMaterial is not None:
+        nodes_ = dict(context.cachedMaterial)
+        context.shadingGroups.append(nodes_["sg"])
+        context.materialNodes = nodes_
+        return nodes_
+
+    graphContext["name"] = context.Name
+    graphContext["id"] = context.ID
+
+    existing = dict(existing or {})
+    for mapType in context.tex_index:
+        existing[mapType] = context.getTexNode(mapType)
+    existing["sg"] = sg
+
+    # The rules are selected by the maps the asset comes with, the ones wiring a map without a file node are skipped
+    graph = ShaderGraph(rules, context.availableMaps, context.Type, context.isHighPoly, graphContext, context.floatMaps, context.packedMaps,
+                        list(context.tex_index.keys()))
+    nodes_ = graph.build(existing, batch, context.sharedNodes)
+    context.createdSharedNodes += [nodes_[key] for key in graph.created]
+    context.reusedNodes += [nodes_[key] for key in graph.reused]
+    Profiler.increment(context.profile, "reusedNodes", len(graph.reused))
+    context.shadingGroups.append(nodes_["sg"])
+    context.materialNodes = nodes_
+    return nodes_
+
+# Runs a material setup (OpaqueSetup, GlassSetup) for the shading group sg, timed when the import is profiled
+def runSetup(context, setup, sg):
+    with Profiler.span(context.profile, setup.__name__):
+        setup(sg)
+
+# Material setup steps of a renderer setup: one step per material, then the attribute writes and the assignments
+# (see flushSteps). The setups run them in one go unless they are created for an incremental import.
+def materialSteps(setup):
+    context = setup.context
+    if context.isMultiMat:
+        for index,shader in enumerate(setup.shaderList):
+            if context.MultiMaterial[index].lower() == 'glass':
+                runSetup(context, setup.GlassSetup, shader)
+            else:
+                runSetup(context, setup.OpaqueSetup, shader)
+            yield "material " + shader
+    else:
+        runSetup(context, setup.OpaqueSetup, None)
+        yield "material " + context.Name
+    for step in flushSteps(context, setup.batch, setup.assignments):
+        yield step
+
+# Runs the given steps to the end
+def runSteps(steps):
+    for step in steps:
+        pass
+
+# Runs the attribute writes collected for the asset in one go and reports the saved calls,
+# then assigns the meshes to their shading groups.
+def flushBatch(context, batch, assignments):
+    runSteps(flushSteps(context, batch, assignments))
+
+# Steps of flushBatch. The attribute writes are run in chunks of context.attrBatchSize statements,
+# all in one MEL call if it isn't set. The statements keep their order so the result is the same.
+def flushSteps(context, batch, assignments):
+    with Profiler.span(context.profile, "flushBatch"):
+        while batch.statements:
+            batch.flush(context.attrBatchSize)
+            yield "attributes " + str(batch.issued)
+        if context.sharedNodes is not None:
+            context.sharedNodes.flushed()
+        context.attrBatchReport = batch.report()
+        print("Applied " + str(batch.issued) + " attribute writes and connections in " + str(batch.evals) + " MEL call(s), saved " + str(batch.saved()) + " calls")
+        assignments.flush(context.bulkAssign)
+        yield "assignments"
@@ -0,0 +1,104 @@
+"""
+This Module:
+- Handles the OctaneRender material setup
+- The material networks are described as ShaderGraph rules (see ShaderGraph.py) per shader variant
+"""
+from Megascans import Capabilities
+from Megascans.ShaderGraph import MelBatch, AssignmentBatch
+from Megascans.Renderers.Common import buildGraph, materialSteps, runSteps
+
+# This section is written by Denes Dankhazi
+
+# Every Octane map goes through an octaneImageTexture that reads the file node's path and uses the shared UV transform
+def _octaneImage(mapType, key, name, gamma, destination):
+    attrs = []
+    if gamma is not None:
+        attrs.append((key + ".Gamma", gamma))
+    return {"maps": [mapType],
+            "nodes": [(key, "octaneImageTexture", name, "asTexture")],
+            "attrs": attrs,
+            "connections": [(mapType + ".fileTextureName", key + ".File"), ("uvTransform.outTransform", key + ".Transform"),
+                            (key + ".outTex", destination)]}
+
+_OCTANE_DISPLACEMENT = {
+    "maps": ["displacement"],
+    "nodes": [("dispShader", "octaneVertexDisplacementNode", "{id}_Displacement_shr", "asTexture")],
+    "attrs": [("dispShader.MidLevel", 0.5), ("dispShader.SubdLevel", 3), ("dispShader.AutoBumpMap", 1), ("dispShader.Height", 10)],
+    "connections": [("dispShader.outDisp", "mat.Displacement")],
+}
+
+"""OctaneRender Studio 2021.1.6 - 20.23 Material Creation."""
+
+class OctaneRender():
+    OPAQUE = [
+        # Set the material, the shared UV transform and the shading group
+        {"nodes": [("mat", "{shader}", "{name}_Mat", "asShader"),
+                   ("uvTransform", "octaneTransform2D", "UVTransform", "asTexture"),
+                   ("uvScale", "multiplyDivide", "UVScaleConverter", "asTexture"),
+                   ("sg", "shadingEngine", "{name}_SG", None)],
+         "shared": ["uvTransform", "uvScale"],
+         "attrs": [("mat.BsdfModel", 6), ("uvScale.input1X", 1), ("uvScale.input1Y", 1), ("uvScale.operation", 2)],
+         "connections": [("uv.rotateUV", "uvTransform.RotationX"), ("uv.offsetU", "uvTransform.TranslationX"),
+                         ("uv.offsetV", "uvTransform.TranslationY"), ("uv.repeatU", "uvScale.input2X"),
+                         ("uv.repeatV", "uvScale.input2Y"), ("uvScale.outputX", "uvTransform.ScaleX"),
+                         ("uvScale.outputY", "uvTransform.ScaleY"), ("mat.outColor", "sg.surfaceShader")]},
+
+        _octaneImage("normal", "normalTex", "normalMap", 1, "mat.Normal"),
+        _octaneImage("albedo", "albedoTex", "albedoMap", None, "mat.Albedo"),
+        _octaneImage("roughness", "roughnessTex", "roughnessMap", 1, "mat.Roughness"),
+
+        # Plants don't get displacement, high poly geometry only for surfaces.
+        dict(_OCTANE_DISPLACEMENT, highPoly=False, types=["3d", "surface"]),
+        dict(_OCTANE_DISPLACEMENT, highPoly=True, types=["surface"]),
+        dict(_octaneImage("displacement", "displacementTex", "displaceMap", 1, "dispShader.Texture"), highPoly=False, types=["3d", "surface"]),
+        dict(_octaneImage("displacement", "displacementTex", "displaceMap", 1, "dispShader.Texture"), highPoly=True, types=["surface"]),
+
+        _octaneImage("metalness", "metalnessTex", "metalnessMap", 1, "mat.Metallic"),
+
+        _octaneImage("translucency", "translucencyTex", "translucencyMap", 2.2, "mat.Transmission"),
+        {"maps": ["translucency"],
+         "nodes": [("translPower", "octaneFloatTexture", "translPower", "asTexture")],
+         "shared": ["translPower"],
+         "attrs": [("mat.TransmissionType", 3), ("translPower.Value", 0.05)],
+         "connections": [("translPower.outTex", "translucencyTex.Power")]},
+
+        _octaneImage("opacity", "opacityTex", "opacityMap", 1, "mat.Opacity"),
+    ]
+
+    # deferred leaves the material steps to the caller (incremental import), they are run right away otherwise
+    def __init__(self, context, deferred=False):
+        self.context = context
+        self.shaderList = context.defaultShaderList
+        self.batch = MelBatch()
+        self.assignments = AssignmentBatch()
+        self.ShaderName = ""
+        self.steps = materialSteps(self)
+        if not deferred:
+            runSteps(self.steps)
+
+
+    def OpaqueSetup(self, shader):
+        nodes_ = Capabilities.nodeTypes()
+
+        #Standard Surface is not available in 2019 and 2018
+        self.ShaderName = "octaneUniversalMaterial"
+
+        if len(self.context.tex_nodes) >= 1 and self.ShaderName in nodes_:
+
+            nodes_ = buildGraph(self.context, self.OPAQUE, shader, self.batch, {"uv": self.context.coord_2d}, shader=self.ShaderName)
+            arn_sg = nodes_["sg"]
+
+            if len(self.context.mesh_transforms) >= 1:
+                for mesh_ in self.context.mesh_transforms:
+                    self.batch.setAttr(mesh_+".smoothLevel", 1)
+                    self.assignments.add(arn_sg, mesh_)
+        else:
+            print("Please make sure you have the latest version of Arnold installed. Go to SolidAngle.com to get it.")
+
+    # There is no dedicated glass network for Octane yet, glass materials get the opaque network on their
+    # shading group. Like the glass setups of the other renderers it doesn't touch or assign the meshes.
+    def GlassSetup(self, shader):
+        self.ShaderName = "octaneUniversalMaterial"
+
+        if len(self.context.tex_nodes) >= 1 and self.ShaderName in Capabilities.nodeTypes():
+            buildGraph(self.context, self.OPAQUE, shader, self.batch, {"uv": self.context.coord_2d}, shader=self.ShaderName)
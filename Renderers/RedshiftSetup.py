@@ -0,0 +1,201 @@
+"""
+This Module:
+- Handles the Redshift material setup
+- The material networks are described as ShaderGraph rules (see ShaderGraph.py) per shader variant
+"""
+from Megascans.ShaderGraph import MelBatch, AssignmentBatch
+from Megascans.Renderers.Common import PACKED_TEXTURE, buildGraph, materialSteps, runSteps
+
+#MATERIAL SETUP FUNCTIONS
+
+_RS_DISPLACEMENT = {
+    "maps": ["displacement"],
+    "nodes": [("dispShader", "displacementShader", "{id}_Displacement", "asShader")],
+    "attrs": [("displacement.alphaIsLuminance", 1), ("displacement.alphaOffset", -0.5), ("dispShader.scale", 1)],
+    "connections": [("dispShader.displacement", "sg.displacementShader"), ("displacement.outAlpha", "dispShader.displacement")],
+}
+
+# Float EXR displacement maps already hold the height around 0, they don't get the mid level offset of the
+# 8/16 bit maps. The displacementShader has no range attributes, the offset is set on the file node.
+_RS_FLOAT_DISPLACEMENT = {
+    "maps": ["displacement"],
+    "float": ["displacement"],
+    "attrs": [("displacement.alphaOffset", 0)],
+}
+
+"""Redshift25_Setup creates a Redshift material setup. """
+class Redshift():
+    OPAQUE = [
+        # Create the material and shading group.
+        {"nodes": [("mat", "RedshiftMaterial", "{name}_Mat", "asShader"), ("sg", "shadingEngine", "{name}_SG", None)],
+         "attrs": [("mat.refl_brdf", 1), ("mat.refl_fresnel_mode", 2)],
+         "connections": [("mat.outColor", "sg.surfaceShader")]},
+
+        # Create the normal map setup for Redshift.
+        {"maps": ["normal"],
+         "nodes": [("normalMap", "RedshiftBumpMap", "{id}_Normal", "asShader")],
+         "attrs": [("normalMap.inputType", 1), ("normalMap.scale", 1)],
+         "connections": [("normal.outColor", "normalMap.input"), ("normalMap.out", "mat.bump_input")]},
+        {"maps": ["normal"], "highPoly": True, "attrs": [("normalMap.scale", 0.5)]},
+        {"maps": ["normal"], "types": ["3dplant"], "attrs": [("normalMap.scale", 1)]},
+
+        # If no normal map was found in our texture list we try to find a bump map instead.
+        {"maps": ["bump"], "without": ["normal"],
+         "nodes": [("bumpMap", "RedshiftBumpMap", "{id}_BumpNormal", "asShader")],
+         "attrs": [("bump.alphaIsLuminance", 1), ("bumpMap.scale", 0.05), ("bumpMap.factorInObjScale", 0)],
+         "connections": [("bumpMap.out", "mat.bump_input"), ("bump.outAlpha", "bumpMap.input")]},
+
+        # Create the albedo setup. AO and specular maps are not used by the Redshift setup.
+        {"maps": ["albedo"], "connections": [("albedo.outColor", "mat.diffuse_color")]},
+
+        {"maps": ["metalness"],
+         "attrs": [("metalness.alphaIsLuminance", 1)],
+         "connections": [("metalness.outAlpha", "mat.refl_metalness")]},
+
+        # Create the roughness setup, the gloss map is inverted if there is no roughness map.
+        {"maps": ["roughness"],
+         "attrs": [("roughness.alphaIsLuminance", 1)],
+         "connections": [("roughness.outAlpha", "mat.refl_roughness")]},
+        {"maps": ["gloss"], "without": ["roughness"],
+         "nodes": [("invert", "reverse", "invert", "asShader")],
+         "shared": ["invert"],
+         "attrs": [("gloss.alphaIsLuminance", 1)],
+         "connections": [("gloss.outColor", "invert.input"), ("invert.outputX", "mat.refl_roughness")]},
+
+        # Roughness and metalness baked into the red and green channels of one texture (see TextureBake)
+        PACKED_TEXTURE,
+        {"packed": ["roughness"], "connections": [("orm.outColorR", "mat.refl_roughness")]},
+        {"packed": ["metalness"], "connections": [("orm.outColorG", "mat.refl_metalness")]},
+
+        # Create the displacement setup. High poly geometry only gets displacement for surfaces and plants.
+        dict(_RS_DISPLACEMENT, highPoly=False),
+        dict(_RS_DISPLACEMENT, highPoly=True, types=["surface", "3dplant"]),
+        {"maps": ["displacement"], "types": ["3dplant"], "attrs": [("dispShader.scale", 0)]},
+        {"maps": ["displacement"], "types": ["3d"], "highPoly": False, "attrs": [("dispShader.scale", 10)]},
+        dict(_RS_FLOAT_DISPLACEMENT, highPoly=False),
+        dict(_RS_FLOAT_DISPLACEMENT, highPoly=True, types=["surface", "3dplant"]),
+
+        # Create the translucency setup, or the transmission setup if there is no translucency map.
+        {"maps": ["translucency", "albedo"],
+         "attrs": [("mat.transl_weight", 0.5)],
+         "connections": [("albedo.outColor", "mat.transl_color")]},
+        {"maps": ["transmission"], "without": ["translucency"],
+         "attrs": [("mat.ss_amount", 1), ("mat.ss_scatter_coeff", (0.4, 0.4, 0.4))],
+         "connections": [("transmission.outColor", "mat.refr_transmittance")]},
+
+        # Create the opacity setup
+        {"maps": ["opacity"],
+         "nodes": [("sprite", "RedshiftSprite", "{id}_Sprite", "asShader")],
+         "attrs": [("opacity.alphaIsLuminance", 1)],
+         "connections": [("mat.outColor", "sprite.input"), ("opacity.fileTextureName", "sprite.tex0"), ("sprite.outColor", "sg.surfaceShader")]},
+    ]
+
+    GLASS = [
+        {"nodes": [("mat", "RedshiftMaterial", "{name}_Mat", "asShader"), ("sg", "shadingEngine", "{name}_SG", None)],
+         "attrs": [("mat.refl_brdf", 1), ("mat.refl_fresnel_mode", 2), ("mat.refr_weight", 0.85)],
+         "connections": [("mat.outColor", "sg.surfaceShader")]},
+
+        {"maps": ["normal"],
+         "nodes": [("normalMap", "RedshiftBumpMap", "{id}_Normal", "asShader")],
+         "attrs": [("normalMap.inputType", 1), ("normalMap.scale", 1)],
+         "connections": [("normal.outColor", "normalMap.input"), ("normalMap.out", "mat.bump_input")]},
+        {"maps": ["bump"], "without": ["normal"],
+         "nodes": [("bumpMap", "RedshiftBumpMap", "{id}_BumpNormal", "asShader")],
+         "attrs": [("bumpMap.scale", 0.05), ("bumpMap.factorInObjScale", 0)],
+         "connections": [("bumpMap.out", "mat.bump_input")]},
+
+        {"maps": ["roughness"],
+         "attrs": [("roughness.alphaIsLuminance", 1)],
+         "connections": [("roughness.outAlpha", "mat.refl_roughness")]},
+        {"maps": ["gloss"], "without": ["roughness"],
+         "nodes": [("invert", "reverse", "invert", "asShader")],
+         "shared": ["invert"],
+         "attrs": [("gloss.alphaIsLuminance", 1)],
+         "connections": [("gloss.outColor", "invert.input"), ("invert.outputX", "mat.refl_roughness")]},
+        PACKED_TEXTURE,
+        {"packed": ["roughness"], "connections": [("orm.outColorR", "mat.refl_roughness")]},
+    ]
+
+    # deferred leaves the material steps to the caller (incremental import), they are run right away otherwise
+    def __init__(self, context, deferred=False):
+        self.context = context
+        self.shaderList = context.defaultShaderList
+        self.batch = MelBatch()
+        self.assignments = AssignmentBatch()
+        self.steps = materialSteps(self)
+        if not deferred:
+            runSteps(self.steps)
+
+    def OpaqueSetup(self,shader):
+        if len(self.context.tex_nodes) >= 1:
+
+            nodes_ = buildGraph(self.context, self.OPAQUE, shader, self.batch)
+            rs_sg = nodes_["sg"]
+            maps_ = self.context.availableMaps
+
+            # Go through the list of meshes imported/saved and apply the displacement properties
+            # of Redshift on them, then apply the material itinstance.
+            if len(self.context.mesh_transforms) >= 1:
+                for mesh_ in self.context.mesh_transforms:
+
+
+                    if self.context.Type in ["3dplant"]:
+                        self.batch.setAttr(mesh_+".rsEnableSubdivision", 0)
+                        self.batch.setAttr(mesh_+".rsEnableDisplacement", 0)
+                        self.batch.setAttr(mesh_+".rsDisplacementScale", 0)
+                        self.batch.setAttr(mesh_+".rsMaxDisplacement", 1)
+                        self.batch.setAttr(mesh_+".rsAutoBumpMap", 0)
+                        self.batch.setAttr(mesh_+".smoothLevel", 1)
+                        self.batch.setAttr(mesh_+".useSmoothPreviewForRender", 0)
+                        self.batch.setAttr(mesh_+".renderSmoothLevel", 0)
+                    
+                    elif self.context.Type in ["surface"]:
+                        self.batch.setAttr(mesh_+".rsEnableSubdivision", 1)
+                        self.batch.setAttr(mesh_+".rsEnableDisplacement", 1)
+                        self.batch.setAttr(mesh_+".rsScreenSpaceAdaptive", 0)
+                        self.batch.setAttr(mesh_+".rsMinTessellationLength", 0)
+                        self.batch.setAttr(mesh_+".rsMaxTessellationSubdivs", 4)
+                        self.batch.setAttr(mesh_+".rsOutOfFrustumTessellationFactor", 2)
+                        self.batch.setAttr(mesh_+".rsDisplacementScale", 1)
+                        self.batch.setAttr(mesh_+".rsMaxDisplacement", 1)
+                        self.batch.setAttr(mesh_+".rsAutoBumpMap", 1)
+                        self.batch.setAttr(mesh_+".smoothLevel", 1)
+                        self.batch.setAttr(mesh_+".useSmoothPreviewForRender", 0)
+                        self.batch.setAttr(mesh_+".renderSmoothLevel", 0)
+
+                    elif self.context.Type in ["3d"] and not self.context.isHighPoly:
+                        self.batch.setAttr(mesh_+".rsEnableSubdivision", 1)
+                        self.batch.setAttr(mesh_+".rsEnableDisplacement", 1)
+                        self.batch.setAttr(mesh_+".rsScreenSpaceAdaptive", 0)
+                        self.batch.setAttr(mesh_+".rsMinTessellationLength", 0)
+                        self.batch.setAttr(mesh_+".rsMaxTessellationSubdivs", 4)
+                        self.batch.setAttr(mesh_+".rsOutOfFrustumTessellationFactor", 2)
+                        self.batch.setAttr(mesh_+".rsDisplacementScale", 1)
+                        self.batch.setAttr(mesh_+".rsMaxDisplacement", 1)
+                        self.batch.setAttr(mesh_+".rsAutoBumpMap", 1)
+                        self.batch.setAttr(mesh_+".smoothLevel", 1)
+                        self.batch.setAttr(mesh_+".useSmoothPreviewForRender", 0)
+                        self.batch.setAttr(mesh_+".renderSmoothLevel", 0)
+
+                    else:
+                        self.batch.setAttr(mesh_+".rsEnableSubdivision", 0)
+                        self.batch.setAttr(mesh_+".rsScreenSpaceAdaptive", 0)
+                        self.batch.setAttr(mesh_+".rsEnableDisplacement", 0)
+                        self.batch.setAttr(mesh_+".rsMinTessellationLength", 0)
+                        self.batch.setAttr(mesh_+".rsMaxTessellationSubdivs", 0)
+                        self.batch.setAttr(mesh_+".rsOutOfFrustumTessellationFactor", 2)
+                        self.batch.setAttr(mesh_+".rsDisplacementScale", 0)
+                        self.batch.setAttr(mesh_+".rsMaxDisplacement", 1)
+                        self.batch.setAttr(mesh_+".rsAutoBumpMap",0)
+                        self.batch.setAttr(mesh_+".smoothLevel", 1)
+                        self.batch.setAttr(mesh_+".useSmoothPreviewForRender", 0)
+                        self.batch.setAttr(mesh_+".renderSmoothLevel", 0)
+
+                    if "normal" not in maps_:
+                        self.batch.setAttr(mesh_+".rsAutoBumpMap", 1)
+
+                    self.assignments.add(rs_sg, mesh_)
+
+    def GlassSetup(self,shader):
+        if len(self.context.tex_nodes) >= 1:
+            buildGraph(self.context, self.GLASS, shader, self.batch)
@@ -0,0 +1,226 @@
+"""
+This Module:
+- Handles the V-Ray material setup
+- The material networks are described as ShaderGraph rules (see ShaderGraph.py) per shader variant
+"""
+from Megascans.CommandBackend import cmds as mc
+
+from Megascans.ShaderGraph import MelBatch, AssignmentBatch
+from Megascans.Renderers.Common import PACKED_TEXTURE, buildGraph, materialSteps, runSteps
+
+_VRAY_DISPLACEMENT = {
+    "maps": ["displacement"],
+    "nodes": [("dispShader", "displacementShader", "{id}_Displacement_shr", "asTexture")],
+    "groups": [("displacement", "vray_file_allow_neg_colors")],
+    "attrs": [("dispShader.scale", 10.0), ("displacement.alphaIsLuminance", 1), ("displacement.alphaOffset", -0.5)],
+    "connections": [("displacement.outAlpha", "dispShader.displacement"), ("dispShader.displacement", "sg.displacementShader")],
+}
+
+_VRAY_PACKED_ROUGHNESS = {
+    "packed": ["roughness"],
+    "groups": [("orm", "vray_file_gamma")],
+    "attrs": [("mat.reflectionColorAmount", 1), ("mat.useRoughness", 1), ("mat.reflectionColor", (1.0, 1.0, 1.0))],
+    "connections": [("orm.outColorR", "mat.reflectionGlossiness")],
+}
+
+"""Vray36_Setup creates a V-ray material setup. """
+
+class Vray():
+    OPAQUE = [
+        # Set the material and shading group
+        {"nodes": [("mat", "VRayMtl", "{name}_Mat", "asShader"), ("sg", "shadingEngine", "{name}_SG", None)],
+         "connections": [("mat.outColor", "sg.surfaceShader")]},
+
+        {"maps": ["normal"],
+         "attrs": [("mat.bumpMapType", 1), ("mat.bumpMult", 1), ("mat.refractionIOR", 1.52)],
+         "connections": [("normal.outColor", "mat.bumpMap")]},
+
+        {"maps": ["albedo"],
+         "groups": [("albedo", "vray_file_gamma")],
+         "connections": [("albedo.outColor", "mat.color")]},
+
+        {"maps": ["roughness"],
+         "groups": [("roughness", "vray_file_gamma")],
+         "attrs": [("roughness.alphaIsLuminance", 1), ("mat.reflectionColorAmount", 1), ("mat.useRoughness", 1),
+                   ("mat.reflectionColor", (1.0, 1.0, 1.0))],
+         "connections": [("roughness.outAlpha", "mat.reflectionGlossiness")]},
+
+        {"maps": ["metalness"],
+         "attrs": [("metalness.alphaIsLuminance", 1)],
+         "connections": [("metalness.outAlpha", "mat.metalness")]},
+
+        # Roughness and metalness baked into the red and green channels of one texture (see TextureBake)
+        PACKED_TEXTURE,
+        _VRAY_PACKED_ROUGHNESS,
+        {"packed": ["metalness"], "connections": [("orm.outColorG", "mat.metalness")]},
+
+        # High poly geometry only gets displacement for surfaces.
+        dict(_VRAY_DISPLACEMENT, highPoly=False),
+        dict(_VRAY_DISPLACEMENT, highPoly=True, types=["surface"]),
+
+        {"maps": ["translucency"],
+         "nodes": [("twoSided", "VRayMtl2Sided", "{id}_2Sided", "asTexture")],
+         "connections": [("mat.outColor", "twoSided.backMaterial"), ("mat.outColor", "twoSided.frontMaterial"),
+                         ("twoSided.outColor", "sg.surfaceShader")]},
+
+        {"maps": ["opacity"],
+         "attrs": [("mat.opacityMode", 1), ("mat.doubleSided", 1)],
+         "connections": [("opacity.outColor", "mat.opacityMap")]},
+    ]
+
+    GLASS = [
+        {"nodes": [("mat", "VRayMtl", "{name}_Mat", "asShader"), ("sg", "shadingEngine", "{name}_SG", None)],
+         "attrs": [("mat.refractionColor", (0.9, 0.9, 0.9))],
+         "connections": [("mat.outColor", "sg.surfaceShader")]},
+
+        {"maps": ["normal"],
+         "attrs": [("mat.bumpMapType", 1)],
+         "connections": [("normal.outColor", "mat.bumpMap")]},
+
+        {"maps": ["roughness"],
+         "groups": [("roughness", "vray_file_gamma")],
+         "attrs": [("roughness.alphaIsLuminance", 1), ("mat.reflectionColorAmount", 1), ("mat.useRoughness", 1),
+                   ("mat.reflectionColor", (1.0, 1.0, 1.0))],
+         "connections": [("roughness.outColorR", "mat.reflectionGlossiness")]},
+        {"maps": ["gloss"], "without": ["roughness"],
+         "groups": [("gloss", "vray_file_gamma")],
+         "attrs": [("gloss.alphaIsLuminance", 1), ("mat.reflectionColorAmount", 1), ("mat.reflectionColor", (1.0, 1.0, 1.0))],
+         "connections": [("gloss.outColorR", "mat.reflectionGlossiness")]},
+        PACKED_TEXTURE,
+        _VRAY_PACKED_ROUGHNESS,
+    ]
+
+    # deferred leaves the material steps to the caller (incremental import), they are run right away otherwise
+    def __init__(self, context, deferred=False):
+        self.context = context
+        self.shaderList = context.defaultShaderList
+        self.batch = MelBatch()
+        self.assignments = AssignmentBatch()
+        self.steps = materialSteps(self)
+        if not deferred:
+            runSteps(self.steps)
+
+    def OpaqueSetup(self,shader):
+        if len(self.context.tex_nodes) >= 1:
+
+            nodes_ = buildGraph(self.context, self.OPAQUE, shader, self.batch)
+            mtl_sg = nodes_["sg"]
+            vray_disp_shr = nodes_.get("dispShader")
+
+            if len(self.context.mesh_transforms) >= 1:
+                # mesh_ = self.context.mesh_transforms[0]
+                for mesh_ in self.context.mesh_transforms:
+
+                    shapeNode = mc.ls(mesh_, dag=True, lf=True, o=True, fl=True)
+
+                    self.batch.setAttr(mesh_+".smoothLevel", 1)
+
+                    if len(shapeNode) == 1:
+                        shape = shapeNode[0]
+
+                        if not self.context.isHighPoly:
+                            
+                            self.batch.addAttributesFromGroup(shape, "vray_displacement")
+                            self.batch.addAttributesFromGroup(shape, "vray_subdivision")
+                            self.batch.addAttributesFromGroup(shape, "vray_subquality")
+                            self.batch.setAttr(mesh_+".vrayDisplacementAmount", keyable=True)
+                            self.batch.setAttr(mesh_+".vrayOverrideGlobalSubQual", keyable=True)
+                            self.batch.setAttr(mesh_+".vraySubdivEnable", keyable=True)
+                            self.batch.setAttr(mesh_+".vrayMaxSubdivs", keyable=True)
+                            self.batch.setAttr(mesh_+".vrayEdgeLength", keyable=True)
+                            self.batch.setAttr(mesh_+".vrayDisplacementNone", keyable=True)
+                            self.batch.setAttr(mesh_+".vrayViewDep", keyable=True)
+                            self.batch.setAttr(mesh_+".vrayDisplacementNone", 0)
+                            self.batch.setAttr(mesh_+".vrayMaxSubdivs", 6)
+
+                        if self.context.Type in ["3d"] and not self.context.isHighPoly:
+                            if vray_disp_shr is not None:
+                                self.batch.connectAttr(shape + ".vrayDisplacementAmount", vray_disp_shr + ".scale")
+                            self.batch.setAttr(shape + ".vrayDisplacementAmount", 10)
+                            self.batch.setAttr(shape + ".vrayDisplacementShift", 0.0)
+                            
+                        elif self.context.Type in ["3dplant"] and not self.context.isHighPoly:
+                            self.batch.setAttr(shape + ".vrayDisplacementAmount", 0)
+                            #self.batch.setAttr(shape + ".vrayOverrideGlobalSubQual", 0)
+                            self.batch.setAttr(shape + ".vraySubdivEnable", 0)
+                            #self.batch.setAttr(mesh_+".vrayMaxSubdivs", 0)
+                            self.batch.setAttr(mesh_+".vrayDisplacementNone", 1)
+                        else:
+                            if not self.context.isHighPoly and vray_disp_shr is not None:
+                                self.batch.connectAttr(shape + ".vrayDisplacementAmount", vray_disp_shr + ".scale")
+                                self.batch.setAttr(shape + ".vrayDisplacementAmount", 1)
+                                self.batch.setAttr(shape + ".vrayDisplacementShift", 0)
+                        if not self.context.isHighPoly:
+                            self.batch.setAttr(shape + ".vrayDisplacementKeepContinuity", 1)
+                        
+                        if self.context.Type in ["surface"]:
+                            self.batch.addAttributesFromGroup(shape, "vray_displacement")
+                            self.batch.addAttributesFromGroup(shape, "vray_subdivision")
+                            self.batch.addAttributesFromGroup(shape, "vray_subquality")
+                            self.batch.setAttr(mesh_+".vrayDisplacementAmount", keyable=True)
+                            self.batch.setAttr(mesh_+".vrayOverrideGlobalSubQual", keyable=True)
+                            self.batch.setAttr(mesh_+".vraySubdivEnable", keyable=True)
+                            self.batch.setAttr(mesh_+".vrayMaxSubdivs", keyable=True)
+                            self.batch.setAttr(mesh_+".vrayEdgeLength", keyable=True)
+                            self.batch.setAttr(mesh_+".vrayDisplacementNone", keyable=True)
+                            self.batch.setAttr(mesh_+".vrayViewDep", keyable=True)
+                            self.batch.setAttr(mesh_+".vrayDisplacementNone", 0)
+                            self.batch.setAttr(mesh_+".vrayMaxSubdivs", 6)
+
+                    
+                    self.assignments.add(mtl_sg, mesh_)
+
+                    if len(shapeNode) > 1:
+                        shape = shapeNode[0]
+
+                        if not self.context.isHighPoly:
+                            self.batch.addAttributesFromGroup(shape, "vray_displacement")
+                            self.batch.addAttributesFromGroup(shape, "vray_subdivision")
+                            self.batch.addAttributesFromGroup(shape, "vray_subquality")
+                            #self.batch.setAttr(mesh_+".vrayDisplacementAmount", keyable=True)
+                            self.batch.setAttr(mesh_+".vrayOverrideGlobalSubQual", keyable=True)
+                            self.batch.setAttr(mesh_+".vraySubdivEnable", keyable=True)
+                            self.batch.setAttr(mesh_+".vrayMaxSubdivs", keyable=True)
+                            self.batch.setAttr(mesh_+".vrayEdgeLength", keyable=True)
+                            self.batch.setAttr(mesh_+".vrayDisplacementNone", keyable=True)
+                            self.batch.setAttr(mesh_+".vrayViewDep", keyable=True)
+                            self.batch.setAttr(mesh_+".vrayDisplacementNone", 0)
+                            self.batch.setAttr(mesh_+".vrayMaxSubdivs", 6)
+
+                        if self.context.Type in ["3d"] and not self.context.isHighPoly:
+                            self.batch.setAttr(shape + ".vrayDisplacementAmount", 10)
+                            self.batch.setAttr(shape + ".vrayDisplacementShift", 0.0)
+                        
+                        elif self.context.Type in ["3dplant"] and not self.context.isHighPoly:
+                            self.batch.setAttr(shape + ".vrayDisplacementAmount", 0)
+                            self.batch.setAttr(shape + ".vrayOverrideGlobalSubQual", 0)
+                            self.batch.setAttr(shape + ".vraySubdivEnable", 0)
+                            self.batch.setAttr(mesh_+".vrayMaxSubdivs", 0)
+                            self.batch.setAttr(mesh_+".vrayDisplacementNone", 1)
+                        else:
+                            if not self.context.isHighPoly:
+                                self.batch.setAttr(shape + ".vrayDisplacementAmount", 1)
+                                self.batch.setAttr(shape + ".vrayDisplacementShift", 0)
+
+                        if not self.context.isHighPoly:
+                            self.batch.setAttr(shape + ".vrayDisplacementKeepContinuity", 1)
+                        
+                        if self.context.Type in ["surface"]:
+                            self.batch.addAttributesFromGroup(shape, "vray_displacement")
+                            self.batch.addAttributesFromGroup(shape, "vray_subdivision")
+                            self.batch.addAttributesFromGroup(shape, "vray_subquality")
+                            self.batch.setAttr(mesh_+".vrayDisplacementAmount", keyable=True)
+                            self.batch.setAttr(mesh_+".vrayOverrideGlobalSubQual", keyable=True)
+                            self.batch.setAttr(mesh_+".vraySubdivEnable", keyable=True)
+                            self.batch.setAttr(mesh_+".vrayMaxSubdivs", keyable=True)
+                            self.batch.setAttr(mesh_+".vrayEdgeLength", keyable=True)
+                            self.batch.setAttr(mesh_+".vrayDisplacementNone", keyable=True)
+                            self.batch.setAttr(mesh_+".vrayViewDep", keyable=True)
+                            self.batch.setAttr(mesh_+".vrayDisplacementNone", 0)
+                            self.batch.setAttr(mesh_+".vrayMaxSubdivs", 6)
+
+                    self.assignments.add(mtl_sg, mesh_)
+
+    def GlassSetup(self,shader):
+        if len(self.context.tex_nodes) >= 1:
+            buildGraph(self.context, self.GLASS, shader, self.batch)
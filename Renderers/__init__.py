@@ -0,0 +1,74 @@
+"""
+This Module:
+- Handles the material setup for each renderer (Redshift, Vray, Arnold, Octane)
+- Every renderer lives in its own module that is only imported when its renderer is used for the first time
+"""
+import importlib
+import time
+
+# Renderer name set by importerSetup.setRenderEngine -> (module, class, plugin that has to be loaded)
+BACKENDS = {
+    "Redshift": ("RedshiftSetup", "Redshift", "redshift4maya"),
+    "Vray": ("VraySetup", "Vray", "vrayformaya"),
+    "Arnold": ("ArnoldSetup", "Arnold", "mtoa"),
+    "OctaneRender": ("OctaneSetup", "OctaneRender", "octaneplugin"),
+    # Maya Software gets the Arnold materials
+    "MayaSoftware": ("ArnoldSetup", "Arnold", None),
+}
+
+_loaded = {}
+# Seconds it took to import each loaded renderer module
+loadTimes = {}
+
+
+# Returns the material setup class of the renderer, its module is imported on the first call
+def getRenderer(renderer):
+    if renderer not in _loaded:
+        moduleName, className, plugin = BACKENDS[renderer]
+        start = time.time()
+        module = importlib.import_module(__name__ + "." + moduleName)
+        loadTimes[renderer] = time.time() - start
+        _loaded[renderer] = getattr(module, className)
+        print("Loaded the " + renderer + " material setup in %.3fs" % loadTimes[renderer])
+    return _loaded[renderer]
+
+
+# Checks that the renderer has a material setup and that its plugin is in the list of loaded plugins
+def isAvailable(renderer, plugins_):
+    if renderer not in BACKENDS:
+        return False
+    plugin = BACKENDS[renderer][2]
+    return plugin is None or plugin in plugins_
+
+
+# Map types the material setup of renderer consumes for the shader variants ("opaque", "glass") of an asset
+# that comes with maps_. The OPAQUE and GLASS rules of the setup class declare what each variant wires,
+# a setup without GLASS rules builds its glass materials from the OPAQUE ones.
+def usedChannels(renderer, variants, maps_, assetType, isHighPoly):
+    from Megascans.ShaderGraph import usedMaps
+    setup = getRenderer(renderer)
+    used_ = []
+    for variant in variants:
+        rules = getattr(setup, variant.upper(), setup.OPAQUE)
+        used_ += [mapType for mapType in usedMaps(rules, maps_, assetType, isHighPoly) if mapType not in used_]
+    return used_
+
+
+# Map types the material setup of renderer can read from a packed texture, for every shader variant of the asset.
+# A setup whose texture nodes read whole files (Octane) declares none of them.
+def packableChannels(renderer, variants):
+    from Megascans.ShaderGraph import packableMaps
+    setup = getRenderer(renderer)
+    packable_ = None
+    for variant in variants:
+        maps_ = packableMaps(getattr(setup, variant.upper(), setup.OPAQUE))
+        packable_ = maps_ if packable_ is None else [mapType for mapType in packable_ if mapType in maps_]
+    return packable_ or []
+
+
+# Keeps Renderers.Redshift(), Renderers.Vray()... working, the class is loaded on first access
+def __getattr__(name):
+    for renderer, (moduleName, className, plugin) in BACKENDS.items():
+        if className == name:
+            return getRenderer(renderer)
+    raise AttributeError("module " + __name__ + " has no attribute " + name)
@@ -0,0 +1,80 @@
+"""
+This Module:
+- Keeps the variation meshes of scatter assets as prototypes in a hidden group, every placed copy of the
+  asset is a group of Maya instances of the prototypes
+- Finds the prototypes of a repeated import (same asset ID, renderer, LOD, textures and meshes) so the
+  geometry, the textures and the material aren't imported again
+
+The instances share the shapes of the prototypes and with them their shading group assignment. Like the material
+cache, the key and the prototypes are stored as string attributes on the prototype group so reopened scenes are found again.
+"""
+
+import hashlib
+import json
+
+from Megascans.CommandBackend import cmds as mc
+from Megascans import MaterialCache
+
+KEY_ATTR = "msScatterKey"
+PROTOTYPES_ATTR = "msScatterPrototypes"
+
+
+# Builds the key of a scatter asset from its material key and the set of mesh files it uses
+def scatterKey(materialKey, geometryList):
+    paths_ = sorted([MaterialCache.normalizePath(path) for format_, path in geometryList])
+    digest = hashlib.md5("\n".join(paths_).encode("utf-8")).hexdigest()
+    return materialKey + "|" + digest
+
+
+# Returns the prototype transforms registered with key, None if there are none or some of them were deleted
+def findPrototypes(key):
+    plugs_ = mc.ls("*." + KEY_ATTR, recursive=True) or []
+    for plug in plugs_:
+        if mc.getAttr(plug) != key:
+            continue
+        group_ = plug.split(".")[0]
+        try:
+            prototypes_ = json.loads(mc.getAttr(group_ + "." + PROTOTYPES_ATTR))
+        except (ValueError, TypeError):
+            continue
+        if prototypes_ and all([mc.objExists(node_) for node_ in prototypes_]):
+            return prototypes_
+    return None
+
+
+# Moves the meshes into a new hidden prototype group and registers them with key
+def createPrototypes(key, name, meshes):
+    group_ = mc.group( em=True, name=name + "_prototypes")
+    mc.setAttr(group_ + ".visibility", 0)
+    parentNodes(meshes, group_)
+
+    for attr in [KEY_ATTR, PROTOTYPES_ATTR]:
+        mc.addAttr(group_, longName=attr, dataType="string")
+    mc.setAttr(group_ + "." + KEY_ATTR, key, type="string")
+    mc.setAttr(group_ + "." + PROTOTYPES_ATTR, json.dumps(list(meshes)), type="string")
+    return group_
+
+
+# Places one instance of every prototype under group and returns the instance transforms
+def placeInstances(prototypes, group):
+    instances_ = [mc.instance(prototype, name=prototype + "_inst")[0] for prototype in prototypes]
+    parentNodes(instances_, group)
+    return instances_
+
+
+# Parents the nodes to group with one parent call. If Maya refuses the bulk call the nodes are parented
+# one by one and the ones it can't parent are skipped.
+def parentNodes(nodes, group):
+    if not nodes:
+        return []
+    try:
+        return mc.parent(nodes, group)
+    except RuntimeError:
+        print("Bulk parenting to " + group + " failed, parenting the nodes one by one")
+    parented_ = []
+    for node_ in nodes:
+        try:
+            parented_ += mc.parent(node_, group)
+        except RuntimeError:
+            pass
+    return parented_
@@ -0,0 +1,404 @@
+"""
+This Module:
+- Describes the material networks of the renderers as data (nodes, attribute values and connections)
+- Selects the parts of a description that apply to the imported maps and asset type
+- Validates the resulting graph and builds it with as few Python -> Maya round trips as possible
+
+A graph description is a list of rules. Every rule is a dict with the following optional keys:
+- maps        map types that all have to be imported for the rule to apply
+- without     map types that must not be imported (used for the "elif" cases)
+- types       asset types (3d, 3dplant, surface) the rule applies to, all of them if missing
+- highPoly    True/False to limit the rule to the high or low poly LODs
+- float       map types whose images have to hold floating point pixels (e.g. EXR displacement), the rule
+              only applies if the texture preflight (TextureInfo) found them to be floating point
+- packed      map types that have to be packed into the channels of the "orm" texture by the texture bake
+              (TextureBake). The "maps" of a rule are missing while they are packed, its "without" still see them.
+A graph built with the map types that got a file node (loadedMaps) skips the rules that write to or connect
+a map of the asset without one, e.g. a texture that failed to load or wasn't loaded because of channel filtering.
+- nodes       (key, nodeType, name, kind) tuples, kind is asShader, asTexture or asUtility
+- attrs       (plug, value) tuples, a tuple value sets a compound attribute
+- connections (source plug, destination plug) tuples
+- groups      (key, group) tuples passed to "vray addAttributesFromGroup"
+- shared      keys of declared nodes that only compute from their attributes and inputs (UV transforms, inverts...).
+              A graph built with a SharedNodes registry connects to an earlier node with the same type, attribute
+              values and input connections instead of creating another one (see SharedNodes)
+
+Plugs are written as "key.attribute". The keys of the imported file nodes are their map types and
+node names/types are formatted with the context given to the graph (name, id, shader...).
+Later rules override the attribute values and destination connections of earlier rules.
+"""
+
+from collections import OrderedDict
+
+from Megascans.CommandBackend import cmds as mc
+from Megascans.CommandBackend import mel as melc
+
+# Difference up to which an attribute value read back from the scene counts as the value of a shared node
+VALUE_TOLERANCE = 1e-5
+
+# Collects attribute writes and connections and runs them as a single MEL script.
+# Keeps count of the statements it issued so the saved Python -> Maya round trips can be reported.
+class MelBatch():
+    def __init__(self):
+        self.statements = []
+        self.issued = 0
+        self.evals = 0
+
+    def setAttr(self, plug, value=None, keyable=None):
+        if keyable is not None:
+            self.statements.append('setAttr -k ' + ('on' if keyable else 'off') + ' "' + plug + '";')
+        if value is None:
+            return
+        if isinstance(value, (tuple, list)):
+            value = " ".join([formatValue(item) for item in value])
+        else:
+            value = formatValue(value)
+        self.statements.append('setAttr "' + plug + '" ' + value + ';')
+
+    def connectAttr(self, source, destination):
+        self.statements.append('connectAttr -f "' + source + '" "' + destination + '";')
+
+    def addAttributesFromGroup(self, node, group):
+        self.statements.append('vray addAttributesFromGroup "' + node + '" "' + group + '" 1;')
+
+    # Runs the collected statements, or the first limit of them, and returns how many were issued
+    def flush(self, limit=None):
+        statements_ = self.statements if limit is None else self.statements[:limit]
+        count = len(statements_)
+        if count >= 1:
+            melc.eval("\n".join(statements_))
+            self.issued += count
+            self.evals += 1
+        self.statements = self.statements[count:]
+        return count
+
+    # Number of Maya calls saved by batching, one call per statement would have been made otherwise
+    def saved(self):
+        return self.issued - self.evals
+
+    def report(self):
+        return {"statements": self.issued, "calls": self.evals, "saved": self.saved()}
+
+
+# Collects the meshes of every shading group and assigns them with one sets call per shading group
+# without touching the selection. If Maya refuses the bulk assignment of a shading group (e.g. a mix
+# of shapes and transforms it can't resolve) its meshes are assigned one by one through the selection.
+class AssignmentBatch():
+    def __init__(self):
+        self.members = OrderedDict()
+
+    def add(self, sg, mesh_):
+        members = self.members.setdefault(sg, [])
+        if mesh_ not in members:
+            members.append(mesh_)
+
+    # Assigns the collected meshes and returns the number of sets calls it took
+    def flush(self, bulk=True):
+        calls = 0
+        for sg, meshes in self.members.items():
+            if bulk:
+                try:
+                    mc.sets(meshes, e=True, forceElement=sg)
+                    calls += 1
+                    continue
+                except RuntimeError:
+                    print("Bulk assignment to " + sg + " failed, assigning the meshes one by one")
+            calls += assignPerMesh(sg, meshes)
+        self.members = OrderedDict()
+        return calls
+
+
+# Remembers the shared nodes of the built graphs by what they compute: their type, attribute values and the nodes
+# their inputs are connected to. Nodes fed by the file nodes or the place2dTexture of an asset are shared by the
+# materials of that asset, nodes without inputs by every asset that sets the same values.
+# The nodes belong to the scene, the importer clears the registry when a scene is created or opened.
+class SharedNodes():
+    def __init__(self):
+        self.nodes = {}
+        # Nodes added since the attribute writes were last flushed, their inputs aren't connected yet
+        self.unflushed = set()
+
+    # The node registered with identity, None if there is none or it doesn't compute the same anymore
+    def find(self, identity):
+        node_ = self.nodes.get(identity)
+        if node_ is not None and not self.matches(node_, identity):
+            del self.nodes[identity]
+            return None
+        return node_
+
+    def add(self, identity, node_):
+        self.nodes[identity] = node_
+        self.unflushed.add(node_)
+
+    # Called once the batched connections of the added nodes are made
+    def flushed(self):
+        self.unflushed = set()
+
+    def clear(self):
+        self.nodes = {}
+        self.unflushed = set()
+
+    # The node exists, has the node type of identity, still has the attribute values it was created with and its
+    # inputs are connected to the same plugs. The groups are only part of the identity, their attributes aren't queried.
+    def matches(self, node_, identity):
+        nodeType, attrs, groups, inputs = identity
+        if not mc.objExists(node_) or mc.nodeType(node_) != nodeType:
+            return False
+        if node_ in self.unflushed:
+            return True
+        for attr, value in attrs:
+            if not sameValue(mc.getAttr(node_ + "." + attr), value):
+                return False
+        for source, attr in inputs:
+            if (mc.listConnections(node_ + "." + attr, source=True, destination=False, plugs=True) or []) != [source]:
+                return False
+        return True
+
+
+# An attribute value read back with getAttr is the value that was set, numbers within VALUE_TOLERANCE.
+# getAttr returns compound values as a list with a tuple, they are compared item by item.
+def sameValue(current, value):
+    if isinstance(value, (list, tuple)):
+        items_ = []
+        for item in current if isinstance(current, (list, tuple)) else [current]:
+            items_ += list(item) if isinstance(item, (list, tuple)) else [item]
+        return len(items_) == len(value) and all([sameValue(item, expected) for item, expected in zip(items_, value)])
+    if isinstance(value, str) or isinstance(current, str):
+        return current == value
+    try:
+        return abs(float(current) - float(value)) <= VALUE_TOLERANCE
+    except (TypeError, ValueError):
+        return False
+
+
+# Assigns the meshes one by one through the selection, the selection is restored afterwards
+def assignPerMesh(sg, meshes):
+    selection_ = mc.ls(sl=True)
+    try:
+        for mesh_ in meshes:
+            mc.select(mesh_)
+            melc.eval('sets -e -forceElement ' + sg)
+    finally:
+        if selection_:
+            mc.select(selection_, replace=True)
+        else:
+            mc.select(clear=True)
+    return len(meshes)
+
+
+# Map types the rules can read from the channels of a packed texture, in rule order
+def packableMaps(rules):
+    maps_ = []
+    for rule in rules:
+        maps_ += [mapType for mapType in rule.get("packed", []) if mapType not in maps_]
+    return maps_
+
+
+# Map types (file node keys) that the rules applying to an asset with maps_ write to or connect, in rule order.
+# These are the channels a material setup consumes, the other maps of the asset don't have to be loaded.
+def usedMaps(rules, maps_, assetType, isHighPoly):
+    plugs_ = OrderedDict()
+    connections = {}
+    for rule in rules:
+        if not ShaderGraph.ruleApplies(rule, maps_, assetType, isHighPoly):
+            continue
+        for plug, value in rule.get("attrs", []):
+            plugs_[plug] = True
+        for key, group in rule.get("groups", []):
+            plugs_[key + "."] = True
+        for source, destination in rule.get("connections", []):
+            connections[destination] = source
+
+    for destination, source in connections.items():
+        plugs_[source] = True
+        plugs_[destination] = True
+
+    used_ = []
+    for plug in plugs_:
+        key = plug.split(".")[0]
+        if key in maps_ and key not in used_:
+            used_.append(key)
+    return used_
+
+
+# Map types (file node keys) the plugs of rule write to or connect, maps_ are the map types of the asset
+def ruleMaps(rule, maps_):
+    plugs_ = [plug for plug, value in rule.get("attrs", [])] + [key + "." for key, group in rule.get("groups", [])]
+    for source, destination in rule.get("connections", []):
+        plugs_ += [source, destination]
+    keys_ = []
+    for plug in plugs_:
+        key = plug.split(".")[0]
+        if key in maps_ and key not in keys_:
+            keys_.append(key)
+    return keys_
+
+
+# Value of a setAttr in MEL, strings are quoted with their backslashes and quotes escaped (e.g. Windows paths)
+def formatValue(value):
+    if isinstance(value, bool):
+        return str(int(value))
+    if isinstance(value, str):
+        return '-type "string" "' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+    return repr(value)
+
+
+class ShaderGraph():
+    def __init__(self, rules, maps_, assetType, isHighPoly, context, floatMaps=None, packedMaps=None, loadedMaps=None):
+        self.context = context
+        self.nodes = []
+        self.nodeTypes = {}
+        self.attrs = []
+        self.connections = []
+        self.groups = []
+        self.shared = []
+        # Keys of the shared nodes the last build reused or created
+        self.reused = []
+        self.created = []
+
+        attrs = {}
+        connections = {}
+        for rule in rules:
+            if not self.ruleApplies(rule, maps_, assetType, isHighPoly, floatMaps, packedMaps):
+                continue
+            if loadedMaps is not None and [key for key in ruleMaps(rule, maps_) if key not in loadedMaps]:
+                continue
+
+            for key, nodeType, name, kind in rule.get("nodes", []):
+                nodeType = nodeType.format(**context)
+                if key in self.nodeTypes:
+                    if self.nodeTypes[key] != nodeType:
+                        raise ValueError("Node " + key + " is declared as " + self.nodeTypes[key] + " and " + nodeType)
+                    continue
+                self.nodeTypes[key] = nodeType
+                self.nodes.append((key, nodeType, name.format(**context), kind))
+
+            for plug, value in rule.get("attrs", []):
+                attrs[plug] = value
+                if plug not in self.attrs:
+                    self.attrs.append(plug)
+
+            # A destination only has one source so a later connection replaces the earlier one
+            for source, destination in rule.get("connections", []):
+                if destination not in connections:
+                    self.connections.append(destination)
+                connections[destination] = source
+
+            for group in rule.get("groups", []):
+                if group not in self.groups:
+                    self.groups.append(group)
+
+            self.shared += [key for key in rule.get("shared", []) if key not in self.shared]
+
+        self.attrs = [(plug, attrs[plug]) for plug in self.attrs]
+        self.connections = [(connections[destination], destination) for destination in self.connections]
+
+    # floatMaps are the map types with floating point images, None if they weren't probed.
+    # packedMaps are the map types packed into the "orm" texture, None if nothing was packed.
+    @staticmethod
+    def ruleApplies(rule, maps_, assetType, isHighPoly, floatMaps=None, packedMaps=None):
+        if [item for item in rule.get("maps", []) if item not in maps_ or item in (packedMaps or [])]:
+            return False
+        if [item for item in rule.get("packed", []) if item not in (packedMaps or [])]:
+            return False
+        if [item for item in rule.get("without", []) if item in maps_]:
+            return False
+        if "types" in rule and assetType not in rule["types"]:
+            return False
+        if "highPoly" in rule and rule["highPoly"] != isHighPoly:
+            return False
+        if [item for item in rule.get("float", []) if item not in (floatMaps or [])]:
+            return False
+        return True
+
+    # Checks that every plug of the graph belongs to a declared or an existing node
+    def validate(self, existing):
+        known_ = set(self.nodeTypes.keys()) | set([key for key in existing.keys() if existing[key] is not None])
+        plugs_ = [plug for plug, value in self.attrs]
+        for source, destination in self.connections:
+            plugs_.append(source)
+            plugs_.append(destination)
+        plugs_ += [key + "." for key, group in self.groups]
+
+        missing_ = sorted(set([plug.split(".")[0] for plug in plugs_ if plug.split(".")[0] not in known_]))
+        if missing_:
+            raise ValueError("The shader graph references undeclared nodes: " + ", ".join(missing_))
+
+    # What the shared node key computes, None while one of its inputs has no node yet
+    def identity(self, key, names):
+        inputs_ = []
+        for source, destination in self.connections:
+            if destination.split(".")[0] == key:
+                if source.split(".")[0] not in names:
+                    return None
+                sourceKey, attr = source.split(".", 1)
+                inputs_.append((names[sourceKey] + "." + attr, destination.split(".", 1)[1]))
+        attrs_ = [(plug.split(".", 1)[1], value) for plug, value in self.attrs if plug.split(".")[0] == key]
+        groups_ = [group for groupKey, group in self.groups if groupKey == key]
+        attrs_ = [(attr, tuple(value) if isinstance(value, list) else value) for attr, value in attrs_]
+        return (self.nodeTypes[key], tuple(sorted(attrs_)), tuple(sorted(groups_)), tuple(sorted(inputs_)))
+
+    # Takes the shared nodes of the graph from sharedNodes, in input order so a shared node fed by another shared
+    # node can be found too. The ones that weren't found are created by build.
+    def findShared(self, names, sharedNodes):
+        pending_ = [key for key in self.shared if key in self.nodeTypes and key not in names]
+        found = True
+        while found:
+            found = False
+            for key in list(pending_):
+                identity = self.identity(key, names)
+                if identity is None:
+                    continue
+                pending_.remove(key)
+                node_ = sharedNodes.find(identity)
+                if node_ is not None:
+                    names[key] = node_
+                    self.reused.append(key)
+                    found = True
+
+    # Creates the graph. existing maps keys to nodes that are already in the scene (file nodes, shading group),
+    # they take the place of the declared nodes with the same key. Returns the key -> node name mapping.
+    # The attribute writes and connections are added to batch if one is given, it is up to the caller to flush it.
+    # With sharedNodes the shared nodes of earlier graphs are reused, their attributes and inputs are already set.
+    def build(self, existing, batch=None, sharedNodes=None):
+        self.validate(existing)
+
+        names = dict([(key, node_) for key, node_ in existing.items() if node_ is not None])
+        self.reused = []
+        self.created = []
+        if sharedNodes is not None:
+            self.findShared(names, sharedNodes)
+        for key, nodeType, name, kind in self.nodes:
+            if key in names:
+                continue
+            if nodeType == "shadingEngine":
+                names[key] = mc.sets(renderable=True, noSurfaceShader=True, empty=True, name=name)
+            else:
+                flags = {kind: True}
+                names[key] = mc.shadingNode(nodeType, name=name, **flags)
+            if key in self.shared:
+                self.created.append(key)
+        if sharedNodes is not None:
+            for key in self.created:
+                sharedNodes.add(self.identity(key, names), names[key])
+
+        def resolve(plug):
+            key, attr = plug.split(".", 1)
+            return names[key] + "." + attr
+
+        flush = batch is None
+        if flush:
+            batch = MelBatch()
+        for key, group in self.groups:
+            if key not in self.reused:
+                batch.addAttributesFromGroup(names[key], group)
+        for plug, value in self.attrs:
+            if plug.split(".")[0] not in self.reused:
+                batch.setAttr(resolve(plug), value)
+        for source, destination in self.connections:
+            if destination.split(".")[0] not in self.reused:
+                batch.connectAttr(resolve(source), resolve(destination))
+        if flush:
+            batch.flush()
+
+        return names
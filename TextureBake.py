@@ -0,0 +1,109 @@
+"""
+This Module:
+- Bakes the texture math of the material setups into precomputed textures with NumPy, the images are read and
+  written with Pillow
+- Inverts gloss maps into roughness maps, so the materials don't need an invert (reverse) node
+- Packs the roughness, metalness and AO maps into the red, green and blue channels of one "orm" texture, so the
+  renderer opens one file instead of one per map. Only the maps the material setup reads from the packed channels
+  ("packed" rules, see ShaderGraph) are packed.
+
+The baked textures are kept in a folder keyed by the source paths, their size and modification time, a bake whose
+file exists is reused. NumPy and Pillow are optional, without them the textures are imported as they are.
+"""
+
+import hashlib
+import json
+import os
+
+from Megascans.TexturePreview import imagePixels
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# Map types in the order of the channels (red, green, blue) of the packed texture
+PACKED_CHANNELS = ["roughness", "metalness", "ao"]
+
+# Bumped when the way the textures are baked changes, the files baked before aren't used anymore
+BAKE_VERSION = 1
+
+
+def isAvailable():
+    return numpy is not None and Image is not None
+
+
+class TextureBake():
+    def __init__(self, directory):
+        self.directory = directory
+        self.baked = 0
+        self.reused = 0
+
+    # Cache key of a bake of the source files, None if one of them doesn't exist
+    def key(self, operation, paths):
+        data_ = [operation, str(BAKE_VERSION)]
+        for path in paths:
+            try:
+                stat_ = os.stat(path)
+            except OSError:
+                return None
+            data_ += [os.path.normcase(os.path.normpath(path)).replace("\\", "/"), str(stat_.st_size), repr(stat_.st_mtime)]
+        return hashlib.md5(json.dumps(data_).encode("utf-8")).hexdigest()
+
+    def bakePath(self, key):
+        return os.path.join(self.directory, key + ".png").replace("\\", "/")
+
+    # Roughness map baked from the gloss map, None if it can't be read
+    def invertGloss(self, path):
+        return self.bake("invertGloss", [path], lambda channels: 255 - channels[0])
+
+    # Texture with the given map type -> path files packed into the channels of PACKED_CHANNELS, the missing
+    # channels are black. None if one of the files can't be read.
+    def pack(self, paths):
+        types_ = [mapType for mapType in PACKED_CHANNELS if mapType in paths]
+        def packChannels(channels):
+            byType = dict(zip(types_, channels))
+            black = numpy.zeros_like(channels[0])
+            return numpy.dstack([byType.get(mapType, black) for mapType in PACKED_CHANNELS])
+        return self.bake("pack", [paths[mapType] for mapType in types_], packChannels)
+
+    # Runs function on the gray 8 bit pixels of the source files and writes the result, the smaller sources are
+    # scaled to the size of the first one
+    def bake(self, operation, paths, function):
+        key = self.key(operation, paths)
+        if key is None:
+            return None
+        output = self.bakePath(key)
+        if os.path.isfile(output):
+            self.reused += 1
+            return output
+
+        try:
+            channels_ = []
+            for path in paths:
+                image = Image.open(path)
+                if image.mode not in ["I", "I;16", "I;16B", "I;16L", "L"]:
+                    image = image.convert("L")
+                if channels_ and image.size != (channels_[0].shape[1], channels_[0].shape[0]):
+                    image = image.resize((channels_[0].shape[1], channels_[0].shape[0]), Image.BILINEAR)
+                channels_.append(imagePixels(image))
+            pixels_ = function(channels_)
+
+            if not os.path.isdir(self.directory):
+                os.makedirs(self.directory)
+            # Written under a temporary name first so a bake is never read half written
+            temp_ = output + ".tmp"
+            Image.fromarray(pixels_.astype(numpy.uint8)).save(temp_, format="PNG")
+            os.replace(temp_, output)
+        except (IOError, OSError, ValueError, Image.DecompressionBombError) as error:
+            print("Failed to bake " + ", ".join(paths) + ": " + str(error))
+            return None
+        self.baked += 1
+        return output
+
+    def report(self):
+        return {"baked": self.baked, "reused": self.reused}
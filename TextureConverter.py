@@ -0,0 +1,128 @@
+"""
+This Module:
+- Converts the textures of an asset into tiled, mip mapped render-ready files with an external converter
+  (maketx for Arnold, img2tiledexr for V-Ray or any command set in the preferences)
+- Runs the conversions in parallel, every worker thread waits on its own converter process
+- Skips the textures whose converted file is newer than the source
+
+The converted files are written next to the source textures, or into a shared folder (one subfolder per asset folder).
+Their names keep the extension of the source, so rock_albedo.jpg and rock_albedo.png don't convert to the same file.
+A texture that fails to convert is reported and keeps its source file.
+"""
+
+import hashlib
+import os
+import shlex
+import subprocess
+import threading
+
+from multiprocessing.pool import ThreadPool
+
+from Megascans import MaterialCache
+
+# Number of converter processes running at the same time
+WORKERS = 4
+
+# Renderer name -> (command, extension) of its converter. {source} and {output} are replaced by the paths.
+CONVERTERS = {
+    "Arnold": ('maketx -v -u --oiio "{source}" -o "{output}"', ".tx"),
+    "Vray": ('img2tiledexr "{source}" "{output}"', "_tiled.exr"),
+}
+
+
+# The converter of the renderer, or the given command and extension if set. None if the renderer has no converter.
+def getConverter(renderer, command="", extension="", outputDir=""):
+    if not command:
+        if renderer not in CONVERTERS:
+            return None
+        command, defaultExtension = CONVERTERS[renderer]
+        extension = extension or defaultExtension
+    return TextureConverter(command, extension or ".tx", outputDir)
+
+
+class TextureConverter():
+    def __init__(self, command, extension, outputDir=""):
+        self.command = command
+        # Appended to the source file name, see outputPath
+        self.extension = extension
+        self.outputDir = outputDir
+        self.lock = threading.Lock()
+        self.converted = 0
+        self.upToDate = 0
+        self.failed = []
+
+    # rock_albedo.jpg -> rock_albedo_jpg.tx. In the shared folder the subfolder of an asset folder also gets a hash of
+    # its full path, asset folders with the same name don't share it.
+    def outputPath(self, source):
+        folder, fileName = os.path.split(source)
+        stem, sourceExtension = os.path.splitext(fileName)
+        fileName = stem + ("_" + sourceExtension[1:] if sourceExtension else "") + self.extension
+        if self.outputDir:
+            digest = hashlib.md5(MaterialCache.normalizePath(folder).encode("utf-8")).hexdigest()[:8]
+            folder = os.path.join(self.outputDir, os.path.basename(folder) + "_" + digest)
+        return os.path.join(folder, fileName).replace("\\", "/")
+
+    def isUpToDate(self, source, output):
+        return os.path.isfile(output) and os.path.getmtime(output) >= os.path.getmtime(source)
+
+    # Converts the source files that exist and returns source -> converted path for the ones that are
+    # converted or were up to date
+    def convert(self, sources):
+        sources_ = [source for source in dict.fromkeys(sources) if os.path.isfile(source)]
+        pending_ = []
+        results_ = {}
+        for source in sources_:
+            output = self.outputPath(source)
+            if self.isUpToDate(source, output):
+                results_[source] = output
+                self.upToDate += 1
+            else:
+                pending_.append((source, output))
+
+        if pending_:
+            pool = ThreadPool(min(WORKERS, len(pending_)))
+            try:
+                converted_ = pool.map(self.convertOne, pending_)
+            finally:
+                pool.close()
+                pool.join()
+            for (source, output), success in zip(pending_, converted_):
+                if success:
+                    results_[source] = output
+        return results_
+
+    # Runs the converter process of one texture, returns True if it wrote the output
+    def convertOne(self, item):
+        source, output = item
+        folder = os.path.dirname(output)
+        try:
+            if not os.path.isdir(folder):
+                os.makedirs(folder)
+        except OSError:
+            # Another worker created the folder meanwhile
+            pass
+
+        # The template is split before the paths go in, so paths with spaces stay one argument
+        args_ = [token.format(source=source, output=output) for token in shlex.split(self.command)]
+        try:
+            process = subprocess.Popen(args_, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+            log_ = process.communicate()[0]
+            success = process.returncode == 0 and os.path.isfile(output)
+        except OSError as error:
+            log_ = str(error)
+            success = False
+
+        with self.lock:
+            if success:
+                self.converted += 1
+            else:
+                self.failed.append(source)
+        if not success:
+            print("Failed to convert " + source + ":")
+            print(log_.decode("utf-8", "replace") if isinstance(log_, bytes) else log_)
+            if os.path.isfile(output):
+                os.remove(output)
+        return success
+
+    def report(self):
+        return {"converted": self.converted, "upToDate": self.upToDate, "failed": list(self.failed)}
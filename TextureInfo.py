@@ -0,0 +1,190 @@
+"""
+This Module:
+- Reads the headers of the texture files (EXR, JPG, PNG, TIF) without decoding the images: resolution,
+  channel count, bit depth and whether the pixels are floating point
+- Probes many files at once on a thread pool, the headers are kept by path, size and modification time
+- Estimates the memory the textures take once the renderer loaded them with their mip maps
+- Finds the lower resolution exports of a Megascans texture (e.g. _4K_ -> _2K_) next to it
+
+readHeader returns None for files it can't read, they are left out of the estimates.
+"""
+
+import os
+import re
+import struct
+import threading
+
+from multiprocessing.pool import ThreadPool
+
+# Number of threads reading the headers
+WORKERS = 8
+# Megascans resolutions from the highest to the lowest, the K token of the texture file names
+RESOLUTIONS = [16, 8, 4, 2, 1]
+
+_headers = {}
+_lock = threading.Lock()
+
+
+# Header of the image file at path: {"width", "height", "channels", "bitDepth", "isFloat", "format"}
+def readHeader(path):
+    extension = os.path.splitext(path)[1].lower()
+    readers = {".exr": readExr, ".png": readPng, ".jpg": readJpeg, ".jpeg": readJpeg, ".tif": readTiff, ".tiff": readTiff}
+    if extension not in readers:
+        return None
+    try:
+        with open(path, "rb") as file_:
+            return readers[extension](file_)
+    except (IOError, OSError, struct.error, ValueError, IndexError):
+        return None
+
+
+# Headers of the given files by path, read on a thread pool. Headers that were read before are reused
+# as long as the size and the modification time of their file didn't change.
+def probe(paths):
+    paths_ = [path for path in dict.fromkeys(paths)]
+    if not paths_:
+        return {}
+    pool = ThreadPool(min(WORKERS, len(paths_)))
+    try:
+        headers_ = pool.map(cachedHeader, paths_)
+    finally:
+        pool.close()
+        pool.join()
+    return dict(zip(paths_, headers_))
+
+
+def cachedHeader(path):
+    try:
+        stat_ = os.stat(path)
+    except OSError:
+        return None
+    key = (path, stat_.st_size, stat_.st_mtime)
+    with _lock:
+        if key in _headers:
+            return _headers[key]
+    header = readHeader(path)
+    with _lock:
+        _headers[key] = header
+    return header
+
+
+# Bytes the texture takes in memory uncompressed, with a full mip chain (+1/3)
+def estimateMemory(header):
+    if header is None:
+        return 0
+    return int(header["width"] * header["height"] * header["channels"] * header["bitDepth"] / 8.0 * 4 / 3)
+
+
+# Path of the next lower resolution export of a Megascans texture that exists on disk, None if there is none
+def lowerResolution(path):
+    folder, fileName = os.path.split(path)
+    match = re.search(r"_(\d+)K_", fileName, re.IGNORECASE)
+    if match is None:
+        return None
+    current = int(match.group(1))
+    for resolution in [item for item in RESOLUTIONS if item < current]:
+        candidate = os.path.join(folder, fileName[:match.start()] + "_" + str(resolution) + "K_" + fileName[match.end():]).replace("\\", "/")
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+# OpenEXR: magic number, version and a list of attributes (name, type, size, value) that ends with an empty name
+def readExr(file_):
+    if struct.unpack("<I", file_.read(4))[0] != 20000630:
+        return None
+    file_.read(4)
+    header = {"format": "exr", "channels": 0, "bitDepth": 16, "isFloat": False}
+    while True:
+        name = readString(file_)
+        if not name:
+            break
+        attrType = readString(file_)
+        size = struct.unpack("<i", file_.read(4))[0]
+        value = file_.read(size)
+        if name == "dataWindow" and attrType == "box2i":
+            xMin, yMin, xMax, yMax = struct.unpack("<4i", value[:16])
+            header["width"] = xMax - xMin + 1
+            header["height"] = yMax - yMin + 1
+        elif name == "channels" and attrType == "chlist":
+            # Channel name, pixel type (0 uint, 1 half, 2 float), pLinear, 3 reserved bytes, x/y sampling
+            offset = 0
+            pixelTypes = []
+            while value[offset:offset + 1] not in [b"\x00", b""]:
+                offset = value.index(b"\x00", offset) + 1
+                pixelTypes.append(struct.unpack("<i", value[offset:offset + 4])[0])
+                offset += 16
+            header["channels"] = len(pixelTypes)
+            header["bitDepth"] = 16 if pixelTypes and max(pixelTypes) == 1 else 32
+            header["isFloat"] = bool(pixelTypes) and 0 not in pixelTypes
+    if "width" not in header:
+        return None
+    return header
+
+
+# PNG: the IHDR chunk follows the signature
+def readPng(file_):
+    if file_.read(8) != b"\x89PNG\r\n\x1a\n":
+        return None
+    length, chunkType = struct.unpack(">I4s", file_.read(8))
+    if chunkType != b"IHDR":
+        return None
+    width, height, bitDepth, colorType = struct.unpack(">IIBB", file_.read(10))
+    # Gray, -, RGB, palette (read as RGB), gray + alpha, -, RGBA
+    channels = {0: 1, 2: 3, 3: 3, 4: 2, 6: 4}.get(colorType, 4)
+    return {"format": "png", "width": width, "height": height, "channels": channels,
+            "bitDepth": 8 if colorType == 3 else bitDepth, "isFloat": False}
+
+
+# JPEG: the size is in the first start of frame segment
+def readJpeg(file_):
+    if file_.read(2) != b"\xff\xd8":
+        return None
+    while True:
+        marker = file_.read(2)
+        if len(marker) < 2 or marker[0:1] != b"\xff":
+            return None
+        code = ord(marker[1:2])
+        length = struct.unpack(">H", file_.read(2))[0]
+        if 0xc0 <= code <= 0xcf and code not in [0xc4, 0xc8, 0xcc]:
+            precision, height, width, channels = struct.unpack(">BHHB", file_.read(6))
+            return {"format": "jpg", "width": width, "height": height, "channels": channels, "bitDepth": precision, "isFloat": False}
+        file_.seek(length - 2, 1)
+
+
+# TIFF: the tags of the first image file directory
+def readTiff(file_):
+    order = file_.read(2)
+    if order not in [b"II", b"MM"]:
+        return None
+    endian = "<" if order == b"II" else ">"
+    if struct.unpack(endian + "H", file_.read(2))[0] != 42:
+        return None
+    file_.seek(struct.unpack(endian + "I", file_.read(4))[0])
+    tags = {}
+    for index in range(struct.unpack(endian + "H", file_.read(2))[0]):
+        tag, fieldType, count, value = struct.unpack(endian + "HHI4s", file_.read(12))
+        # SHORT values are in the first two bytes of the value field, LONG values take all four
+        if fieldType == 3:
+            tags[tag] = struct.unpack(endian + "H", value[:2])[0]
+        elif fieldType == 4:
+            tags[tag] = struct.unpack(endian + "I", value)[0]
+        if tag == 258 and count > 2 and fieldType == 3:
+            # Bits per sample of every channel are stored elsewhere, they are the same for Megascans textures
+            position = file_.tell()
+            file_.seek(struct.unpack(endian + "I", value)[0])
+            tags[tag] = struct.unpack(endian + "H", file_.read(2))[0]
+            file_.seek(position)
+    if 256 not in tags or 257 not in tags:
+        return None
+    return {"format": "tif", "width": tags[256], "height": tags[257], "channels": tags.get(277, 1),
+            "bitDepth": tags.get(258, 8), "isFloat": tags.get(339) == 3}
+
+
+def readString(file_):
+    chars = []
+    while True:
+        char = file_.read(1)
+        if char in [b"\x00", b""]:
+            return b"".join(chars).decode("latin-1")
+        chars.append(char)
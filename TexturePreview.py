@@ -0,0 +1,230 @@
+"""
+This Module:
+- Creates low resolution copies (1K by default) of the colour, normal and opacity maps of an asset for the viewport
+- Resamples the images with NumPy (box filter) on a thread pool, the images are read and written with Pillow
+- Keeps the previews in a cache folder keyed by source path, modification time and resolution, the least recently
+  used previews are deleted when the folder is over its size limit
+- Shows the previews in the viewport through a viewport material, the file nodes of the render material keep the
+  full resolution textures so the renders never see a preview
+
+Viewport 2.0 draws the material connected to the surfaceShader of a shading group. Arnold and Redshift render the
+material of their own shading group input (aiSurfaceShader, rsSurfaceShader) instead if it is connected, so the render
+material is moved there and a lambert reading the previews takes its place. V-Ray, Octane and Maya Software render the
+surfaceShader itself, their assets don't get previews.
+The preview nodes have an msPreviewOf attribute that holds the node they stand in for.
+NumPy and Pillow are optional, without them the viewport shows the full resolution textures.
+"""
+
+import hashlib
+import os
+import threading
+
+from multiprocessing.pool import ThreadPool
+
+from Megascans.CommandBackend import cmds as mc
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+PREVIEW_ATTR = "msPreviewOf"
+# Map types that get previews, the ones the viewport material reads
+MAP_TYPES = ["albedo", "normal", "opacity"]
+# Shading group input each renderer renders from instead of the surfaceShader the viewport draws
+RENDER_SHADER_ATTRS = {"Arnold": "aiSurfaceShader", "Redshift": "rsSurfaceShader"}
+# Number of threads resampling the images, NumPy and Pillow release the GIL while they work on the pixels
+WORKERS = 4
+
+def isAvailable():
+    return numpy is not None and Image is not None
+
+
+class PreviewCache():
+    def __init__(self, directory, resolution=1024, maxSize=0):
+        self.directory = directory
+        # Longest side of the previews in pixels
+        self.resolution = resolution
+        # Size limit of the cache folder in bytes, 0 keeps all the files
+        self.maxSize = maxSize
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.created = 0
+        self.skipped = 0
+
+    # Cache key of a source texture, None if the file doesn't exist
+    def key(self, path):
+        try:
+            stat_ = os.stat(path)
+        except OSError:
+            return None
+        data_ = "\n".join([os.path.normcase(os.path.normpath(path)).replace("\\", "/"), str(stat_.st_size), repr(stat_.st_mtime), str(self.resolution)])
+        return hashlib.md5(data_.encode("utf-8")).hexdigest()
+
+    # JPEG sources get JPEG previews, everything else is written as PNG to keep the alpha and the gray maps lossless
+    def previewPath(self, path, key):
+        extension = ".jpg" if os.path.splitext(path)[1].lower() in [".jpg", ".jpeg"] else ".png"
+        return os.path.join(self.directory, key + extension).replace("\\", "/")
+
+    # Returns source -> preview path for the sources that have a preview. Sources that can't be read or are
+    # already at the preview resolution are left out.
+    def create(self, paths):
+        pending_ = []
+        previews_ = {}
+        for path in dict.fromkeys(paths):
+            key = self.key(path)
+            if key is None:
+                continue
+            preview_ = self.previewPath(path, key)
+            if os.path.isfile(preview_):
+                os.utime(preview_, None)
+                previews_[path] = preview_
+                self.hits += 1
+            else:
+                pending_.append((path, preview_))
+
+        if pending_:
+            if not os.path.isdir(self.directory):
+                os.makedirs(self.directory)
+            pool = ThreadPool(min(WORKERS, len(pending_)))
+            try:
+                created_ = pool.map(self.createOne, pending_)
+            finally:
+                pool.close()
+                pool.join()
+            for (path, preview_), success in zip(pending_, created_):
+                if success:
+                    previews_[path] = preview_
+            self.evict()
+        return previews_
+
+    # Writes the preview of one texture, returns True if it was written
+    def createOne(self, item):
+        path, preview_ = item
+        try:
+            image = Image.open(path)
+            if max(image.size) <= self.resolution:
+                success = False
+            else:
+                pixels_ = downscale(imagePixels(image), self.resolution)
+                # Written under a temporary name first so a preview is never read half written
+                temp_ = preview_ + ".tmp"
+                Image.fromarray(pixels_).save(temp_, format="JPEG" if preview_.endswith(".jpg") else "PNG", quality=90)
+                os.replace(temp_, preview_)
+                success = True
+        except (IOError, OSError, ValueError, Image.DecompressionBombError) as error:
+            print("Failed to create the preview of " + path + ": " + str(error))
+            success = False
+
+        with self.lock:
+            if success:
+                self.created += 1
+            else:
+                self.skipped += 1
+        return success
+
+    # Deletes the least recently used previews until the cache folder fits in maxSize, returns the deleted files
+    def evict(self):
+        if not self.maxSize or not os.path.isdir(self.directory):
+            return []
+        entries_ = []
+        for fileName in os.listdir(self.directory):
+            if os.path.splitext(fileName)[1] in [".jpg", ".png"]:
+                path = os.path.join(self.directory, fileName)
+                entries_.append((os.path.getmtime(path), os.path.getsize(path), path))
+
+        total_ = sum([size for used, size, path in entries_])
+        deleted_ = []
+        for used, size, path in sorted(entries_):
+            if total_ <= self.maxSize:
+                break
+            os.remove(path)
+            total_ -= size
+            deleted_.append(path)
+        return deleted_
+
+    def report(self):
+        return {"hits": self.hits, "created": self.created, "skipped": self.skipped}
+
+
+# 8 bit pixels of the image as an array (height, width[, channels]), 16 bit gray images are scaled down to 8 bit
+def imagePixels(image):
+    if image.mode in ["I", "I;16", "I;16B", "I;16L"]:
+        return (numpy.asarray(image, dtype=numpy.float32) / 257.0).clip(0, 255).astype(numpy.uint8)
+    if image.mode not in ["L", "LA", "RGB", "RGBA"]:
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+    return numpy.asarray(image)
+
+
+# Box filter: every output pixel is the mean of a factor x factor block, the edge pixels that don't fill a block are dropped
+def downscale(pixels, resolution):
+    height, width = pixels.shape[:2]
+    factor = -(-max(height, width) // resolution)
+    height, width = height // factor, width // factor
+    blocks_ = pixels[:height * factor, :width * factor].astype(numpy.float32)
+    blocks_ = blocks_.reshape((height, factor, width, factor) + pixels.shape[2:])
+    return (blocks_.mean(axis=(1, 3)) + 0.5).astype(numpy.uint8)
+
+
+# True for the viewport-only nodes of the previews, the renderers don't read them
+def isPreviewNode(node):
+    return bool(mc.attributeQuery(PREVIEW_ATTR, node=node, exists=True))
+
+
+# Creates a viewport-only node named name that stands in for node_
+def createPreviewNode(nodeType, name, node_, batch, **kind):
+    preview_ = mc.shadingNode(nodeType, name=name, **kind)
+    mc.addAttr(preview_, longName=PREVIEW_ATTR, dataType="string")
+    batch.setAttr(preview_ + "." + PREVIEW_ATTR, node_)
+    return preview_
+
+
+# Creates a file node for the file nodes (node, map type) that have a preview of their map type and a viewport material
+# reading them for every shading group. The render material of a shading group is moved to its renderAttr input
+# (see RENDER_SHADER_ATTRS) and the viewport material is connected to its surfaceShader.
+# place2d is the placement node of the file nodes. Returns the created nodes.
+def applyPreviews(texNodes, previews, shadingGroups, place2d, renderAttr, batch):
+    created_ = []
+    files_ = {}
+    for node_, mapType in texNodes:
+        if mapType not in previews or mapType in files_ or not mc.objExists(node_):
+            continue
+        preview_ = createPreviewNode("file", node_ + "_Preview", node_, batch, asTexture=True)
+        batch.setAttr(preview_ + ".fileTextureName", previews[mapType])
+        if mapType != "albedo":
+            batch.setAttr(preview_ + ".colorSpace", "Raw")
+            batch.setAttr(preview_ + ".ignoreColorSpaceFileRules", 1)
+        # The lambert takes transparency, the inverted opacity
+        if mapType == "opacity":
+            batch.setAttr(preview_ + ".invert", 1)
+        if place2d:
+            batch.connectAttr(place2d + ".outUV", preview_ + ".uvCoord")
+        files_[mapType] = preview_
+        created_.append(preview_)
+    if not files_:
+        return created_
+
+    for sg in shadingGroups:
+        material_ = (mc.listConnections(sg + ".surfaceShader", source=True, destination=False, plugs=True) or [None])[0]
+        if material_ is None:
+            continue
+        viewport_ = createPreviewNode("lambert", sg + "_Viewport", material_.split(".")[0], batch, asShader=True)
+        created_.append(viewport_)
+        if "albedo" in files_:
+            batch.connectAttr(files_["albedo"] + ".outColor", viewport_ + ".color")
+        # Tangent space normal map
+        if "normal" in files_:
+            bump_ = createPreviewNode("bump2d", sg + "_ViewportNormal", material_.split(".")[0], batch, asUtility=True)
+            batch.setAttr(bump_ + ".bumpInterp", 1)
+            batch.connectAttr(files_["normal"] + ".outAlpha", bump_ + ".bumpValue")
+            batch.connectAttr(bump_ + ".outNormal", viewport_ + ".normalCamera")
+            created_.append(bump_)
+        if "opacity" in files_:
+            batch.connectAttr(files_["opacity"] + ".outColor", viewport_ + ".transparency")
+        batch.connectAttr(material_, sg + "." + renderAttr)
+        batch.connectAttr(viewport_ + ".outColor", sg + ".surfaceShader")
+    return created_
@@ -0,0 +1,110 @@
+"""
+Writes the shader graph snapshots of tests/snapshots from the material setups of the baseline commit: the Renderers.py
+the renderer setups were ported from is taken from the git history and run, instead of the current setups, on the
+payloads of every benchmark scenario against the recording backend. Geometry, textures and the rest of the import
+run through the current importer so only the material setups differ.
+
+    python tests/baseline_snapshots.py
+
+A scenario the baseline setup fails on is written up to the failure, with the error. test_shader_graph_snapshots.py
+compares the current setups with these snapshots and lists the differences that are intended.
+"""
+
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import traceback
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SNAPSHOT_DIR = os.path.join(ROOT, "tests", "snapshots")
+# The commit that still has the material setups of every renderer in Renderers.py
+BASELINE = "66c5fb6"
+
+if "Megascans" not in sys.modules:
+    package = types.ModuleType("Megascans")
+    package.__path__ = [ROOT]
+    sys.modules["Megascans"] = package
+
+from Megascans import Benchmark, CommandBackend, MaterialCache, Renderers
+from Megascans.ImporterSetup import importerSetup
+
+SCENARIOS = Benchmark.defaultScenarios(scatterSizes=(4,))
+# Bookkeeping of the material cache, the key hashes the paths in the case of the platform
+IGNORED_ATTRS = [MaterialCache.KEY_ATTR, MaterialCache.NODES_ATTR]
+
+
+# Scene of the recording backend as plain JSON data, so it compares equal to a snapshot read back from disk
+def sceneState(backend):
+    state = {
+        "nodes": dict(backend.nodes),
+        "attrs": dict([(plug, value) for plug, value in backend.attrs.items() if plug.split(".")[-1] not in IGNORED_ATTRS]),
+        "connections": dict(backend.connections),
+        "members": dict([(sg, sorted(members)) for sg, members in backend.members.items()]),
+        "parents": dict(backend.parents),
+    }
+    return json.loads(json.dumps(state, sort_keys=True))
+
+
+# Material setup that runs the class of the baseline Renderers.py, which works on the importer instance directly
+class BaselineSetup():
+    def __init__(self, code, className):
+        self.steps = self.run(code, className)
+
+    def run(self, code, className):
+        namespace = {"__name__": "BaselineRenderers"}
+        exec(code, namespace)
+        namespace[className]()
+        yield "material"
+
+
+# Routes maya.cmds/maya.mel of the baseline module to the recording backend and the renderer setups of the importer
+# to the baseline classes. The rules of the current setups are kept for the channel queries of the importer.
+def useBaseline():
+    source = subprocess.check_output(["git", "-C", ROOT, "show", BASELINE + ":Renderers.py"])
+    code = compile(source, "Renderers.py", "exec")
+
+    maya = types.ModuleType("maya")
+    maya.cmds = CommandBackend.cmds
+    maya.mel = CommandBackend.mel
+    sys.modules.update({"maya": maya, "maya.cmds": CommandBackend.cmds, "maya.mel": CommandBackend.mel})
+
+    getRenderer = Renderers.getRenderer
+
+    def baselineRenderer(renderer):
+        setup = getRenderer(renderer)
+        className = Renderers.BACKENDS[renderer][1]
+        factory = lambda context, deferred=False: BaselineSetup(code, className)
+        for rules in ["OPAQUE", "GLASS"]:
+            if hasattr(setup, rules):
+                setattr(factory, rules, getattr(setup, rules))
+        return factory
+    Renderers.getRenderer = baselineRenderer
+
+
+def main():
+    useBaseline()
+    for renderer, rendererValue in Benchmark.RENDERERS:
+        for scenario, payload in SCENARIOS:
+            backend = CommandBackend.useRecording()
+            backend.renderer = rendererValue
+            importerSetup.Instance = None
+            error = None
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    importerSetup.getInstance().set_Asset_Data(payload)
+            except Exception:
+                error = traceback.format_exc().strip().splitlines()[-1]
+                print(renderer + " " + scenario + ": " + error)
+            state = sceneState(backend)
+            if error is not None:
+                state["error"] = error
+            with open(os.path.join(SNAPSHOT_DIR, renderer + "_" + scenario + ".json"), "w") as file_:
+                json.dump(state, file_, indent=1, sort_keys=True)
+
+
+if __name__ == "__main__":
+    main()
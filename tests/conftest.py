@@ -0,0 +1,26 @@
+"""
+Makes the repository importable as the Megascans package and runs every test against a fresh recording command
+backend (see CommandBackend.RecordingBackend), no Maya needed.
+"""
+
+import os
+import sys
+import types
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if "Megascans" not in sys.modules:
+    package = types.ModuleType("Megascans")
+    package.__path__ = [ROOT]
+    sys.modules["Megascans"] = package
+
+from Megascans import CommandBackend
+
+
+@pytest.fixture(autouse=True)
+def backend():
+    previous = CommandBackend._backend
+    yield CommandBackend.useRecording()
+    CommandBackend.setBackend(previous)
@@ -0,0 +1,46 @@
+"""
+Cached meshes (see GeometryCache) get back the names they were cached with, whatever order the file import returns
+them in and whether their names clash with the scene.
+"""
+
+from Megascans import CommandBackend
+from Megascans.GeometryCache import GeometryCache
+
+
+def createMesh(backend, name):
+    transform = backend.createNode("transform", name)
+    backend.createNode("mesh", name + "Shape", parent=transform)
+    return transform
+
+
+def cacheVariations(backend, tmp_path):
+    source = tmp_path / "rock_lod0.fbx"
+    source.write_text("fbx")
+    cache = GeometryCache(str(tmp_path / "cache"))
+    cache.store(str(source), {}, [createMesh(backend, "rock_Var1"), createMesh(backend, "rock_Var2")])
+    backend.reset()
+    return cache, str(source)
+
+
+def shapeOf(backend, transform):
+    return backend.children(transform)[0]
+
+
+def test_cached_names_are_matched_by_name_not_position(backend, tmp_path, monkeypatch):
+    cache, source = cacheVariations(backend, tmp_path)
+    ls = CommandBackend._RecordingCommands._ls
+    monkeypatch.setattr(CommandBackend._RecordingCommands, "_ls", lambda self, *args, **kwargs: list(reversed(ls(self, *args, **kwargs))))
+
+    transforms = cache.load(source, {})
+    assert transforms == ["rock_Var1", "rock_Var2"]
+    assert [shapeOf(backend, transform) for transform in transforms] == ["rock_Var1Shape", "rock_Var2Shape"]
+
+
+def test_clashing_names_are_matched_without_the_prefix(backend, tmp_path):
+    cache, source = cacheVariations(backend, tmp_path)
+    backend.createNode("transform", "rock_Var2")
+
+    transforms = cache.load(source, {})
+    assert len(transforms) == 2
+    assert shapeOf(backend, transforms[0]) == "rock_Var1Shape"
+    assert shapeOf(backend, transforms[1]) == "rock_Var2Shape"
@@ -0,0 +1,49 @@
+"""
+Incremental imports (see IncrementalImport): the slices of an asset share its scene state and undo chunk.
+"""
+
+import contextlib
+import io
+
+from Megascans import Benchmark
+from Megascans.ImporterSetup import importerSetup
+
+
+def startImport(backend, payload):
+    importerSetup.Instance = None
+    instance = importerSetup.getInstance()
+    instance.updateIncrementalOptions(True, 0)
+    with contextlib.redirect_stdout(io.StringIO()):
+        instance.set_Asset_Data(payload)
+    return instance.getIncrementalImports()[0]
+
+
+def test_asset_is_one_undo_chunk(backend):
+    incremental = startImport(backend, Benchmark.syntheticPayload("3d", meshes=3))
+    states = []
+    while backend.deferred:
+        function, args = backend.deferred.popleft()
+        with contextlib.redirect_stdout(io.StringIO()):
+            function(*args)
+        states.append((backend.undoChunks, backend.unit, backend.refreshSuspended))
+
+    assert incremental.error is None and incremental.slices > 1
+    assert len([call for call in backend.calls if call[0] == "undoInfo" and call[2].get("openChunk")]) == 1
+    # The chunk stays open between the slices, the viewport refresh doesn't
+    assert [state[0] for state in states[:-1]] == [1] * (len(states) - 1)
+    assert [state[2] for state in states] == [False] * len(states)
+    assert states[-1][:2] == (0, "cm")
+
+
+def test_cancelled_asset_closes_its_undo_chunk(backend):
+    backend.unit = "m"
+    incremental = startImport(backend, Benchmark.syntheticPayload("3d", meshes=3))
+    with contextlib.redirect_stdout(io.StringIO()):
+        function, args = backend.deferred.popleft()
+        function(*args)
+        assert (backend.undoChunks, backend.unit) == (1, "cm")
+        incremental.cancel()
+        backend.runDeferred()
+
+    assert incremental.finished
+    assert (backend.undoChunks, backend.unit) == (0, "m")
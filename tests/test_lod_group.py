@@ -0,0 +1,41 @@
+"""
+LOD imports (see importerSetup.createLodGroup): the viewport shows the lowest LOD, the renders always use the active
+LOD.
+"""
+
+import contextlib
+import io
+
+from Megascans import Benchmark
+from Megascans.ImporterSetup import importerSetup
+
+RENDER_STATS = ["primaryVisibility", "castsShadows", "visibleInReflections", "visibleInRefractions"]
+
+
+def importLods(backend, payload):
+    importerSetup.Instance = None
+    instance = importerSetup.getInstance()
+    instance.importLods = True
+    with contextlib.redirect_stdout(io.StringIO()):
+        instance.set_Asset_Data(payload)
+    lodGroup = backend.nodesOfType("lodGroup")[0]
+    return lodGroup, backend.children(lodGroup)
+
+
+def test_active_lod_is_pinned_for_rendering(backend):
+    lodGroup, levels = importLods(backend, Benchmark.syntheticPayload("3d", activeLOD="lod2", meshes=2))
+    assert len(levels) == 4
+
+    active = levels[0]
+    assert active.endswith("_lod2")
+    assert active + ".lodVisibility" not in backend.connections
+    assert backend.attrs[active + ".overrideLevelOfDetail"] == 1
+    for shape in [shape for mesh in backend.children(active) for shape in backend.shapes(mesh)]:
+        assert [shape + "." + attr for attr in RENDER_STATS if shape + "." + attr in backend.attrs] == []
+
+    for index, level in enumerate(levels[1:]):
+        assert backend.connections[level + ".lodVisibility"] == lodGroup + ".output[" + str(index) + "]"
+        assert backend.attrs[lodGroup + ".displayLevel[" + str(index) + "]"] == (1 if level == levels[-1] else 2)
+        for shape in [shape for mesh in backend.children(level) for shape in backend.shapes(mesh)]:
+            assert [backend.attrs[shape + "." + attr] for attr in RENDER_STATS] == [0, 0, 0, 0]
+    assert sorted([plug for plug in backend.attrs if ".threshold[" in plug]) == [lodGroup + ".threshold[0]", lodGroup + ".threshold[1]"]
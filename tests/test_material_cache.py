@@ -0,0 +1,56 @@
+"""
+Repeated imports of an asset reuse its material network (see MaterialCache) unless QxlReuseMaterials turns it off.
+"""
+
+import contextlib
+import io
+
+from Megascans import Benchmark
+from Megascans.ImporterSetup import importerSetup
+
+
+def importAssets(payloads):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return importerSetup.getInstance().importBatch(payloads)
+
+
+def setup_function(function):
+    importerSetup.Instance = None
+
+
+def test_repeated_import_reuses_the_material(backend):
+    payload = Benchmark.syntheticPayload("3d")
+    importAssets([payload, payload])
+    assert len(backend.nodesOfType("RedshiftMaterial")) == 1
+    assert len(backend.members[backend.nodesOfType("shadingEngine")[0]]) == 2
+
+
+def test_reuse_materials_option_is_read(backend):
+    backend.optionVars["QxlReuseMaterials"] = 2
+    payload = Benchmark.syntheticPayload("3d")
+    importAssets([payload, payload])
+    assert importerSetup.getInstance().reuseMaterials is False
+    assert len(backend.nodesOfType("RedshiftMaterial")) == 2
+
+
+# After a scene change the remembered shading group name can belong to the network of another LOD
+def test_same_named_shading_group_of_another_lod_is_not_reused(backend):
+    importAssets([Benchmark.syntheticPayload("3d", activeLOD="lod0")])
+    backend.reset()
+    importAssets([Benchmark.syntheticPayload("3d", activeLOD="lod1")])
+    importAssets([Benchmark.syntheticPayload("3d", activeLOD="lod0")])
+    assert len(backend.nodesOfType("RedshiftMaterial")) == 2
+
+
+def test_texture_preferences_are_part_of_the_key(backend):
+    payload = Benchmark.syntheticPayload("3d")
+    importAssets([payload])
+    importerSetup.getInstance().textureBudget = 100000
+    importAssets([payload])
+    assert len(backend.nodesOfType("RedshiftMaterial")) == 2
+
+
+def test_reused_material_is_reported(backend):
+    payload = Benchmark.syntheticPayload("3d")
+    reports = importAssets([payload, payload])
+    assert [report["shadingGroups"] for report in reports] == [["Benchmark_3d_SG"], ["Benchmark_3d_SG"]]
@@ -0,0 +1,46 @@
+"""
+The recording backend accepts any attribute, these tests check the attributes the shader graphs write against the
+attributes the Maya node types have.
+"""
+
+from Megascans.Renderers.RedshiftSetup import Redshift
+from Megascans.ShaderGraph import ShaderGraph
+
+# Attributes of the Maya node types (not complete, the ones the material setups may write)
+NODE_ATTRIBUTES = {
+    "displacementShader": ["displacement", "scale", "vectorDisplacement", "vectorEncoding", "vectorSpace", "yIsUp", "tangent"],
+    "file": ["fileTextureName", "alphaIsLuminance", "alphaOffset", "alphaGain", "colorSpace", "ignoreColorSpaceFileRules",
+             "uvTilingMode", "filterType", "uvCoord"],
+}
+
+
+# Builds the Redshift opaque graph of an asset with an albedo and a displacement map, returns the recorded attributes
+def buildRedshift(backend, floatMaps):
+    existing = dict([(mapType, backend.createNode("file", "tex_" + mapType)) for mapType in ["albedo", "displacement"]])
+    graph = ShaderGraph(Redshift.OPAQUE, ["albedo", "displacement"], "3d", False, {"name": "rock", "id": "rock01"}, floatMaps)
+    graph.build(existing)
+    return dict(backend.attrs)
+
+
+def unknownAttributes(backend, attrs):
+    unknown_ = []
+    for plug in list(attrs) + list(backend.connections):
+        node_, attr = plug.split(".", 1)
+        nodeType = backend.nodes.get(node_)
+        if nodeType in NODE_ATTRIBUTES and attr not in NODE_ATTRIBUTES[nodeType]:
+            unknown_.append(plug)
+    return unknown_
+
+
+def test_redshift_displacement_attributes_exist(backend):
+    for floatMaps in [None, ["displacement"]]:
+        backend.reset()
+        attrs = buildRedshift(backend, floatMaps)
+        assert backend.nodesOfType("displacementShader")
+        assert unknownAttributes(backend, attrs) == []
+
+
+def test_redshift_float_displacement_has_no_offset(backend):
+    assert buildRedshift(backend, None)["tex_displacement.alphaOffset"] == -0.5
+    backend.reset()
+    assert buildRedshift(backend, ["displacement"])["tex_displacement.alphaOffset"] == 0
@@ -0,0 +1,44 @@
+"""
+High poly imports placed as render proxies (see RenderProxy): proxies that hold their shaders don't leave the
+material network of the export behind.
+"""
+
+import contextlib
+import io
+
+from Megascans import Benchmark, RenderProxy
+from Megascans.ImporterSetup import importerSetup
+
+
+def importProxy(backend, renderer, tmp_path, materials=None):
+    backend.renderer = renderer
+    importerSetup.Instance = None
+    instance = importerSetup.getInstance()
+    instance.renderProxy = True
+    instance.proxyDir = str(tmp_path)
+    payload = Benchmark.syntheticPayload("3d", activeLOD="high", meshes=2, materials=materials)
+    with contextlib.redirect_stdout(io.StringIO()):
+        instance.set_Asset_Data(payload)
+    return instance
+
+
+def test_embedded_materials_leave_no_network(backend, tmp_path):
+    instance = importProxy(backend, "arnold", tmp_path)
+    assert backend.nodesOfType("aiStandIn")
+    for nodeType in ["file", "place2dTexture", "shadingEngine", "aiStandardSurface"]:
+        assert backend.nodesOfType(nodeType) == []
+    assert instance.materialCache.entries == {}
+
+
+def test_proxy_without_materials_keeps_the_network(backend, tmp_path):
+    importProxy(backend, "vray", tmp_path)
+    assert backend.nodesOfType("VRayMesh")
+    sg = backend.nodesOfType("shadingEngine")[0]
+    assert backend.members[sg] == ["Benchmark_3d_bnch01_proxyShape"]
+
+
+def test_multi_material_asset_without_embedded_materials_is_imported_as_meshes(backend, tmp_path):
+    importProxy(backend, "vray", tmp_path, materials=["opaque", "glass"])
+    assert not RenderProxy.getProxy("Vray").embedsMaterials
+    assert backend.nodesOfType("VRayMesh") == []
+    assert len([name for name, args, kwargs in backend.calls if name == "warning" and "multi material" in args[0]]) == 1
@@ -0,0 +1,49 @@
+"""
+Every renderer setup module is imported on its own (see Renderers.getRenderer). Each test imports an asset with one
+renderer in a new interpreter, so the measured time is the time of that backend alone.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from Megascans import Renderers
+from Megascans.Benchmark import RENDERERS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Imports the repository as the Megascans package, imports one asset against the recording backend and prints
+# the loaded renderer modules and the times as JSON
+SCRIPT = """
+import contextlib, io, json, sys, time, types
+package = types.ModuleType("Megascans")
+package.__path__ = [sys.argv[1]]
+sys.modules["Megascans"] = package
+
+from Megascans import Benchmark, CommandBackend, Renderers
+from Megascans.ImporterSetup import importerSetup
+
+CommandBackend.useRecording(renderer=sys.argv[2])
+start = time.time()
+with contextlib.redirect_stdout(io.StringIO()):
+    importerSetup.getInstance().set_Asset_Data(Benchmark.syntheticPayload("3d"))
+importTime = time.time() - start
+modules = sorted([name for name in sys.modules if name.startswith("Megascans.Renderers.") and name != "Megascans.Renderers.Common"])
+print(json.dumps({"modules": modules, "loadTimes": Renderers.loadTimes, "importTime": importTime}))
+"""
+
+def importAlone(rendererValue):
+    output = subprocess.check_output([sys.executable, "-c", SCRIPT, ROOT, rendererValue], cwd=ROOT)
+    return json.loads(output.decode("utf-8").strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize("renderer,rendererValue", RENDERERS)
+def test_import_loads_only_its_backend(renderer, rendererValue):
+    result = importAlone(rendererValue)
+    print("%-13s module %.2fms, import %.2fms" % (renderer, result["loadTimes"][renderer] * 1000.0, result["importTime"] * 1000.0))
+    assert result["modules"] == ["Megascans.Renderers." + Renderers.BACKENDS[renderer][0]]
+    assert list(result["loadTimes"]) == [renderer]
+    assert 0 <= result["loadTimes"][renderer] <= result["importTime"]
@@ -0,0 +1,35 @@
+"""
+Rule selection and MEL generation of ShaderGraph.
+"""
+
+from Megascans.ShaderGraph import ShaderGraph
+
+RULES = [
+    {"nodes": [("mat", "lambert", "{name}_Mat", "asShader"), ("sg", "shadingEngine", "{name}_SG", None)],
+     "connections": [("mat.outColor", "sg.surfaceShader")]},
+    {"maps": ["albedo"],
+     "connections": [("albedo.outColor", "mat.color")]},
+    {"maps": ["roughness"],
+     "attrs": [("roughness.alphaIsLuminance", 1)],
+     "connections": [("roughness.outAlpha", "mat.diffuse")]},
+]
+
+
+# A map of the asset that didn't get a file node only drops the rules wiring it
+def test_rules_of_maps_without_a_file_node_are_skipped(backend):
+    graph = ShaderGraph(RULES, ["albedo", "roughness"], "3d", False, {"name": "Test"}, loadedMaps=["albedo"])
+    backend.createNode("file", "Test_albedo")
+    nodes_ = graph.build({"albedo": "Test_albedo", "sg": None})
+
+    assert backend.connections[nodes_["mat"] + ".color"] == "Test_albedo.outColor"
+    assert nodes_["mat"] + ".diffuse" not in backend.connections
+
+
+# Backslashes and quotes of string values stay in the attribute, MEL would read "\a" as an escape otherwise
+def test_string_values_are_escaped(backend):
+    path = 'C:\\Assets\\"rock"\\albedo.jpg;'
+    rules = RULES[:1] + [{"attrs": [("mat.notes", path), ("mat.diffuse", 0.5)]}]
+    nodes_ = ShaderGraph(rules, [], "3d", False, {"name": "Test"}).build({"sg": None})
+
+    assert backend.attrs[nodes_["mat"] + ".notes"] == path
+    assert backend.attrs[nodes_["mat"] + ".diffuse"] == 0.5
@@ -0,0 +1,78 @@
+"""
+Regression tests of the shader graphs every renderer builds: the nodes, attributes, connections and shading group
+members the recording backend ends up with for each benchmark scenario are compared with the snapshots in
+tests/snapshots. The snapshots come from the material setups of the baseline Renderers.py (see baseline_snapshots.py),
+every difference to them has to be listed with its reason in expected_differences.json.
+"""
+
+import contextlib
+import io
+import json
+import os
+
+import pytest
+
+from baseline_snapshots import SCENARIOS, SNAPSHOT_DIR, sceneState
+from Megascans import Benchmark
+from Megascans.ImporterSetup import importerSetup
+
+SECTIONS = ["nodes", "attrs", "connections", "members", "parents"]
+EXPECTED_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "expected_differences.json")
+MISSING = object()
+
+
+def loadExpected():
+    with open(EXPECTED_PATH) as file_:
+        return json.load(file_)
+
+
+# The entries of state that differ from snapshot, section -> key -> {"baseline": value, "current": value}.
+# A side is left out if the key is missing there.
+def differences(snapshot, state):
+    result = {}
+    for section in SECTIONS:
+        before, after = snapshot[section], state[section]
+        entries = {}
+        for key in set(before) | set(after):
+            if before.get(key, MISSING) != after.get(key, MISSING):
+                entries[key] = dict([(side, values[key]) for side, values in [("baseline", before), ("current", after)] if key in values])
+        if entries:
+            result[section] = entries
+    return result
+
+
+# The expected differences and baseline error of a case, merged from every reason that lists it
+def expectedFor(case):
+    result = {}
+    error = None
+    for item in loadExpected():
+        for section, entries in item["differences"].get(case, {}).items():
+            merged = result.setdefault(section, {})
+            for key, entry in entries.items():
+                assert key not in merged, case + " " + key + " is listed for more than one reason"
+                merged[key] = entry
+        error = item.get("errors", {}).get(case, error)
+    return result, error
+
+
+def test_every_difference_has_a_reason():
+    for item in loadExpected():
+        assert item["reason"].strip()
+        assert item["differences"]
+
+
+@pytest.mark.parametrize("renderer,rendererValue", Benchmark.RENDERERS)
+@pytest.mark.parametrize("scenario,payload", SCENARIOS, ids=[scenario for scenario, payload in SCENARIOS])
+def test_shader_graph_matches_baseline(backend, renderer, rendererValue, scenario, payload):
+    backend.renderer = rendererValue
+    importerSetup.Instance = None
+    with contextlib.redirect_stdout(io.StringIO()):
+        importerSetup.getInstance().set_Asset_Data(payload)
+
+    case = renderer + "_" + scenario
+    with open(os.path.join(SNAPSHOT_DIR, case + ".json")) as file_:
+        snapshot = json.load(file_)
+    expected, error = expectedFor(case)
+
+    assert snapshot.get("error") == error
+    assert differences(snapshot, sceneState(backend)) == expected
@@ -0,0 +1,87 @@
+"""
+Shared utility nodes (see ShaderGraph.SharedNodes) are only reused while they still compute the same thing.
+"""
+
+import contextlib
+import io
+
+from Megascans import Benchmark, Capabilities
+from Megascans.ImporterSetup import importerSetup
+
+OCTANE_MAPS = ["albedo", "normal", "translucency"]
+
+
+def importAssets(payloads, shareNodes=True):
+    instance = importerSetup.getInstance()
+    instance.reuseMaterials = False
+    instance.shareNodes = shareNodes
+    with contextlib.redirect_stdout(io.StringIO()):
+        return instance.importBatch(payloads)
+
+
+def setup_function(function):
+    importerSetup.Instance = None
+
+
+def test_materials_of_an_asset_share_the_uv_nodes(backend):
+    backend.renderer = "octanerender"
+    payload = Benchmark.syntheticPayload("3d", maps_=OCTANE_MAPS)
+    reports = importAssets([payload, payload])
+    assert [report["reusedNodes"] for report in reports] == [0, 1]
+    assert len(backend.nodesOfType("octaneTransform2D")) == 2
+    assert len(backend.nodesOfType("octaneFloatTexture")) == 1
+
+
+def test_scene_change_clears_the_registry(backend):
+    backend.renderer = "octanerender"
+    importAssets([Benchmark.syntheticPayload("3d", maps_=OCTANE_MAPS)])
+    assert importerSetup.getInstance().sharedNodeRegistry.nodes
+    Capabilities._sceneChanged()
+    assert importerSetup.getInstance().sharedNodeRegistry.nodes == {}
+
+
+# A node of the new scene with the name of a registered node isn't reused unless its type and inputs match
+def test_unrelated_node_with_the_same_name_is_not_reused(backend):
+    backend.renderer = "octanerender"
+    payload = Benchmark.syntheticPayload("3d", maps_=OCTANE_MAPS)
+    importAssets([payload])
+    registered_ = dict(importerSetup.getInstance().sharedNodeRegistry.nodes)
+
+    backend.reset()
+    backend.createNode("octaneTransform2D", "UVTransform")
+    backend.createNode("multiplyDivide", "UVScaleConverter")
+    backend.createNode("reverse", "translPower")
+    importerSetup.getInstance().sharedNodeRegistry.nodes = registered_
+    reports = importAssets([payload])
+
+    assert reports[0]["reusedNodes"] == 0
+    assert "UVTransform.outTransform" not in backend.connections.values()
+    assert backend.nodes["translPower"] == "reverse"
+
+
+def test_share_nodes_option_is_read(backend):
+    backend.renderer = "octanerender"
+    backend.optionVars["QxlShareNodes"] = 2
+    payload = Benchmark.syntheticPayload("3d", maps_=OCTANE_MAPS)
+    instance = importerSetup.getInstance()
+    instance.reuseMaterials = False
+    with contextlib.redirect_stdout(io.StringIO()):
+        reports = instance.importBatch([payload, payload])
+    assert instance.shareNodes is False
+    assert [report["reusedNodes"] for report in reports] == [0, 0]
+
+
+
+# A registered node whose attribute values were changed in the scene computes something else now, a value that was only
+# rounded by the scene still matches
+def test_node_with_changed_values_is_not_reused(backend):
+    backend.renderer = "octanerender"
+    payload = Benchmark.syntheticPayload("3d", maps_=OCTANE_MAPS)
+    importAssets([payload])
+    backend.attrs["translPower.Value"] = 0.05000001
+    assert importAssets([payload])[0]["reusedNodes"] == 1
+
+    backend.attrs["translPower.Value"] = 0.5
+    assert importAssets([payload])[0]["reusedNodes"] == 0
+    assert len(backend.nodesOfType("octaneFloatTexture")) == 2
+    assert backend.attrs["translPower.Value"] == 0.5
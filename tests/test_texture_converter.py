@@ -0,0 +1,24 @@
+"""
+Output names of TextureConverter: sources that only differ in their extension or asset folder don't share a file.
+"""
+
+import os
+
+from Megascans.TextureConverter import TextureConverter
+
+
+def test_output_keeps_the_source_extension():
+    converter = TextureConverter("maketx {source} {output}", ".tx")
+    outputs = [converter.outputPath("/assets/rock/rock_albedo" + extension) for extension in [".jpg", ".png", ""]]
+
+    assert outputs == ["/assets/rock/rock_albedo_jpg.tx", "/assets/rock/rock_albedo_png.tx", "/assets/rock/rock_albedo.tx"]
+
+
+def test_asset_folders_with_the_same_name_get_their_own_output_folder(tmp_path):
+    converter = TextureConverter("maketx {source} {output}", ".tx", str(tmp_path))
+    first = converter.outputPath("/library/a/rock/rock_albedo.jpg")
+    second = converter.outputPath("/library/b/rock/rock_albedo.jpg")
+
+    assert first != second
+    assert os.path.basename(os.path.dirname(first)).startswith("rock_")
+    assert first == converter.outputPath("/library/a/rock/rock_albedo.jpg")
@@ -0,0 +1,91 @@
+"""
+The viewport previews must never reach the renderers: the file nodes of the material keep the full resolution
+textures, the renderers render the material of their own shading group input and the render globals are left alone.
+"""
+
+import contextlib
+import io
+
+import pytest
+
+numpy = pytest.importorskip("numpy")
+Image = pytest.importorskip("PIL.Image")
+
+from Megascans import Benchmark, TexturePreview
+from Megascans.ImporterSetup import importerSetup
+from Megascans.ShaderGraph import MelBatch
+
+
+def writeTexture(path, size):
+    Image.fromarray((numpy.random.rand(size, size, 3) * 255).astype(numpy.uint8)).save(path)
+    return path
+
+
+def importWithPreviews(backend, tmp_path, renderer, maps_):
+    payload = Benchmark.syntheticPayload("3d", maps_=maps_)
+    for component in payload["components"]:
+        component["path"] = writeTexture(str(tmp_path / (component["type"] + ".jpg")), 2048)
+
+    backend.renderer = renderer
+    importerSetup.Instance = None
+    instance = importerSetup.getInstance()
+    instance.viewportPreviews = True
+    instance.previewCacheDir = str(tmp_path / "previews")
+    with contextlib.redirect_stdout(io.StringIO()):
+        instance.set_Asset_Data(payload)
+    return payload
+
+
+def test_file_nodes_keep_the_full_resolution_textures(backend, tmp_path):
+    payload = importWithPreviews(backend, tmp_path, "redshift", ["albedo", "normal"])
+
+    previews_ = [node_ for node_ in backend.nodesOfType("file") if TexturePreview.isPreviewNode(node_)]
+    assert len(previews_) == 2
+    for preview_ in previews_:
+        assert backend.attrs[preview_ + ".fileTextureName"].startswith(str(tmp_path / "previews"))
+    albedo_ = backend.attrs["bnch01_albedo_Preview." + TexturePreview.PREVIEW_ATTR]
+    assert backend.attrs[albedo_ + ".fileTextureName"] == payload["components"][0]["path"]
+    paths_ = [value for plug, value in backend.attrs.items() if plug.endswith(".fileTextureName") and plug.split(".")[0] not in previews_]
+    assert sorted(paths_) == sorted([component["path"] for component in payload["components"]])
+    assert [plug for plug in backend.attrs if plug.startswith("defaultRenderGlobals.")] == []
+
+
+# The renderer renders the material moved to its own input, the viewport draws the lambert reading the previews
+def test_viewport_material_takes_the_surface_shader(backend, tmp_path):
+    importWithPreviews(backend, tmp_path, "arnold", ["albedo", "normal", "opacity", "roughness"])
+
+    assert backend.connections["Benchmark_3d_SG.aiSurfaceShader"] == "Benchmark_3d_Mat.outColor"
+    assert backend.connections["Benchmark_3d_SG.surfaceShader"] == "Benchmark_3d_SG_Viewport.outColor"
+    assert backend.connections["Benchmark_3d_SG_Viewport.color"] == "bnch01_albedo_Preview.outColor"
+    assert backend.connections["Benchmark_3d_SG_ViewportNormal.bumpValue"] == "bnch01_normal_Preview.outAlpha"
+    assert backend.connections["Benchmark_3d_SG_Viewport.normalCamera"] == "Benchmark_3d_SG_ViewportNormal.outNormal"
+    assert backend.connections["Benchmark_3d_SG_Viewport.transparency"] == "bnch01_opacity_Preview.outColor"
+    assert backend.attrs["bnch01_opacity_Preview.invert"] == 1
+    assert "bnch01_roughness_Preview" not in backend.nodes
+
+
+# V-Ray renders the surfaceShader, a viewport material there would be rendered
+def test_renderer_without_a_render_input_gets_no_previews(backend, tmp_path):
+    importWithPreviews(backend, tmp_path, "vray", ["albedo", "normal"])
+
+    assert [node_ for node_ in backend.nodes if TexturePreview.isPreviewNode(node_)] == []
+    assert backend.connections["Benchmark_3d_SG.surfaceShader"] == "Benchmark_3d_Mat.outColor"
+
+
+def test_preview_nodes_are_the_viewport_material(backend):
+    sg = backend.createNode("shadingEngine", "rock_SG")
+    backend.createNode("aiStandardSurface", "rock_Mat")
+    backend.connectAttr("rock_Mat.outColor", sg + ".surfaceShader")
+    albedo = backend.createNode("file", "rock_albedo")
+
+    batch = MelBatch()
+    created_ = TexturePreview.applyPreviews([(albedo, "albedo")], {"albedo": "/previews/albedo.jpg"}, [sg], "rock_place2dTexture",
+                                            "aiSurfaceShader", batch)
+    backend.createNode("place2dTexture", "rock_place2dTexture")
+    batch.flush()
+
+    assert created_ == ["rock_albedo_Preview", "rock_SG_Viewport"]
+    assert backend.connections["rock_SG.surfaceShader"] == "rock_SG_Viewport.outColor"
+    assert backend.connections["rock_SG.aiSurfaceShader"] == "rock_Mat.outColor"
+    assert backend.attrs["rock_albedo_Preview.fileTextureName"] == "/previews/albedo.jpg"
+    assert "rock_albedo.fileTextureName" not in backend.attrs